@@ -3,12 +3,7 @@ from flask import Flask, request, jsonify
 from app.database import db, migrate
 from app.config import Config
 # Import models to ensure they're registered with SQLAlchemy for migrations
-from app.models import Plants, PhotoHistory, Note  # noqa: F401
-from app.routes.plants import plants_bp
-from app.routes.photo_histories import photo_histories_bp
-from app.routes.notes import notes_bp
-from app.routes.static import static_bp
-from app.routes.controls import controls_bp
+from app.models import Plants, PhotoHistory, RecurringTask, Note, PumpRun, WateringRule, SensorReading, SensorReadingRollup, Sensor  # noqa: F401
 from flask_cors import CORS
 
 # Configure logging
@@ -29,12 +24,32 @@ def create_app(config_class=Config):
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # Route modules create their services (the pump among them) when imported,
+    # so they are only imported for an app that serves them
+    from app.routes.plants import plants_bp
+    from app.routes.photo_histories import photo_histories_bp
+    from app.routes.notes import notes_bp
+    from app.routes.recurring_tasks import recurring_tasks_bp
+    from app.routes.static import static_bp
+    from app.routes.controls import controls_bp
+    from app.routes.actuators import actuators_bp
+    from app.routes.watering import watering_bp
+    from app.routes.sensor_data import sensor_data_bp
+    from app.routes.sensors import sensors_bp
+    from app.routes.stream import stream_bp
+
     # Register Blueprints
     # Register photo_histories first so more specific routes are matched before generic plant routes
     app.register_blueprint(photo_histories_bp, url_prefix="/api/plants")
     app.register_blueprint(plants_bp, url_prefix="/api/plants")
     app.register_blueprint(notes_bp, url_prefix="/api")
+    app.register_blueprint(recurring_tasks_bp, url_prefix="/api")
+    app.register_blueprint(watering_bp, url_prefix="/api")
+    app.register_blueprint(sensor_data_bp, url_prefix="/api")
+    app.register_blueprint(sensors_bp, url_prefix="/api")
+    app.register_blueprint(stream_bp, url_prefix="/api")
     app.register_blueprint(controls_bp, url_prefix="/api/pumps")
+    app.register_blueprint(actuators_bp, url_prefix="/api/actuators")
     app.register_blueprint(static_bp, url_prefix="/")
 
     @app.before_request
@@ -63,5 +78,26 @@ def create_app(config_class=Config):
     return app
 
 
-# Create app instance for backward compatibility
-app = create_app()
\ No newline at end of file
+def create_db_app(config_class=Config):
+    """A database-only app for the background processes (pump daemon, ingest listener).
+
+    No route modules are imported: they would create an in-process
+    ``PumpService`` that sets up the GPIO pins and starts its own scheduler.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    db.init_app(app)
+    return app
+
+
+def __getattr__(name):
+    """Create the app instance on first use (``from app import app``), for backward compatibility.
+
+    Importing a submodule such as ``app.config`` therefore no longer builds
+    the app, which lets the pump daemon import the services without also
+    starting the routes' in-process pump.
+    """
+    if name == "app":
+        instance = globals()["app"] = create_app()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
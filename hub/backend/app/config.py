@@ -9,6 +9,34 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
+    # "rpi" drives real pins; "simulated" keeps pin state in memory
+    GPIO_BACKEND = os.getenv("GPIO_BACKEND", "simulated")
+    PUMP_DURATION_SECONDS = float(os.getenv("PUMP_DURATION_SECONDS", "5"))
+    PUMP_ID = os.getenv("PUMP_ID", "main")
+    # Measured pump output; water-usage stats are only reported when set
+    PUMP_FLOW_ML_PER_SECOND = (
+        float(os.environ["PUMP_FLOW_ML_PER_SECOND"]) if os.getenv("PUMP_FLOW_ML_PER_SECOND") else None
+    )
+    # Relay pins for the grow light and fan; unset means no such device
+    LIGHT_PIN = int(os.environ["LIGHT_PIN"]) if os.getenv("LIGHT_PIN") else None
+    FAN_PIN = int(os.environ["FAN_PIN"]) if os.getenv("FAN_PIN") else None
+    # Raw analogRead values of the moisture sensor in dry air and in water
+    MOISTURE_RAW_DRY = float(os.getenv("MOISTURE_RAW_DRY", "950"))
+    MOISTURE_RAW_WET = float(os.getenv("MOISTURE_RAW_WET", "200"))
+    # A sensor silent for this long is reported stale (see /api/sensors/health);
+    # keep it well above the longest report interval the server hands out (300 s)
+    SENSOR_STALE_SECONDS = float(os.getenv("SENSOR_STALE_SECONDS", "900"))
+    # Whole months of sensor readings to keep besides the current one; 0 keeps everything
+    SENSOR_READING_RETENTION_MONTHS = int(os.getenv("SENSOR_READING_RETENTION_MONTHS", "12"))
+    # Standalone ingestion listener (python -m app.ingest_listener)
+    INGEST_UDP_HOST = os.getenv("INGEST_UDP_HOST", "0.0.0.0")
+    INGEST_UDP_PORT = int(os.getenv("INGEST_UDP_PORT", "5005"))
+    # MQTT ingestion is enabled by setting the broker host; needs aiomqtt
+    MQTT_HOST = os.getenv("MQTT_HOST")
+    MQTT_PORT = int(os.getenv("MQTT_PORT", "1883"))
+    MQTT_TOPIC_PREFIX = os.getenv("MQTT_TOPIC_PREFIX", "growery")
+    # When set, web workers send pump commands to the pump daemon on this socket
+    PUMP_SOCKET = os.getenv("PUMP_SOCKET")
 
 
 class DevelopmentConfig(Config):
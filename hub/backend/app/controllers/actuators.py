@@ -0,0 +1,52 @@
+"""Actuator abstraction shared by pumps, lights and fans."""
+import logging
+from abc import ABC, abstractmethod
+
+from app.controllers.gpio import GPIOBackend, HIGH, LOW
+
+logger = logging.getLogger(__name__)
+
+
+class Actuator(ABC):
+    """A device that can be switched on and off without blocking.
+
+    Timing (how long a device stays on) is the scheduler's job; an actuator
+    only flips its outputs.
+    """
+
+    kind = "actuator"
+
+    @abstractmethod
+    def turn_on(self) -> None:
+        ...
+
+    @abstractmethod
+    def turn_off(self) -> None:
+        ...
+
+
+class RelayActuator(Actuator):
+    """Device behind a single relay pin, e.g. a grow light or a fan."""
+
+    def __init__(self, gpio: GPIOBackend, pin: int, kind: str = "relay", active_high: bool = True) -> None:
+        """Initialize the relay and switch it off.
+
+        Args:
+            gpio: GPIO backend owning the pin.
+            pin: BCM pin number of the relay input.
+            kind: Device kind reported by the scheduler, e.g. "light" or "fan".
+            active_high: False for relay boards that switch on a LOW input.
+        """
+        self.gpio = gpio
+        self.pin = pin
+        self.kind = kind
+        self._on_level = HIGH if active_high else LOW
+        self._off_level = LOW if active_high else HIGH
+        self.gpio.setup_output(self.pin)
+        self.gpio.output(self.pin, self._off_level)
+
+    def turn_on(self) -> None:
+        self.gpio.output(self.pin, self._on_level)
+
+    def turn_off(self) -> None:
+        self.gpio.output(self.pin, self._off_level)
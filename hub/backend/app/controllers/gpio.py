@@ -0,0 +1,112 @@
+"""GPIO backends for actuator controllers.
+
+``RPiGPIO`` drives real pins through RPi.GPIO on the Pi. ``SimulatedGPIO``
+keeps pin levels in memory so the whole actuator path can run (and be
+load-tested) on any Linux box.
+"""
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+LOW = 0
+HIGH = 1
+
+
+class GPIOBackend(ABC):
+    """Minimal output-pin interface used by the controllers."""
+
+    name = "base"
+
+    @abstractmethod
+    def setup_output(self, pin: int) -> None:
+        ...
+
+    @abstractmethod
+    def output(self, pin: int, value: int) -> None:
+        ...
+
+    @abstractmethod
+    def read(self, pin: int) -> int:
+        ...
+
+    def cleanup(self) -> None:
+        pass
+
+
+class SimulatedGPIO(GPIOBackend):
+    """In-memory GPIO. Listeners are called with (pin, value) on every change."""
+
+    name = "simulated"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pins: Dict[int, int] = {}
+        self._listeners: List[Callable[[int, int], None]] = []
+
+    def add_listener(self, listener: Callable[[int, int], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def setup_output(self, pin: int) -> None:
+        with self._lock:
+            self._pins.setdefault(pin, LOW)
+
+    def output(self, pin: int, value: int) -> None:
+        with self._lock:
+            if pin not in self._pins:
+                raise RuntimeError(f"GPIO pin {pin} is not set up as an output")
+            changed = self._pins[pin] != value
+            self._pins[pin] = value
+            listeners = list(self._listeners) if changed else []
+        logger.debug(f"Simulated GPIO pin {pin} -> {value}")
+        for listener in listeners:
+            listener(pin, value)
+
+    def read(self, pin: int) -> int:
+        with self._lock:
+            return self._pins.get(pin, LOW)
+
+
+class RPiGPIO(GPIOBackend):
+    """RPi.GPIO wrapper using BCM pin numbering."""
+
+    name = "rpi"
+
+    def __init__(self) -> None:
+        try:
+            import RPi.GPIO as GPIO
+        except ImportError as e:
+            raise RuntimeError("RPi.GPIO is not installed; use GPIO_BACKEND=simulated") from e
+        self._gpio = GPIO
+        self._gpio.setmode(GPIO.BCM)
+
+    def setup_output(self, pin: int) -> None:
+        self._gpio.setup(pin, self._gpio.OUT)
+
+    def output(self, pin: int, value: int) -> None:
+        self._gpio.output(pin, self._gpio.HIGH if value else self._gpio.LOW)
+
+    def read(self, pin: int) -> int:
+        return int(self._gpio.input(pin))
+
+    def cleanup(self) -> None:
+        self._gpio.cleanup()
+
+
+_BACKENDS = {
+    SimulatedGPIO.name: SimulatedGPIO,
+    RPiGPIO.name: RPiGPIO,
+}
+
+
+def get_gpio_backend(name: Optional[str] = None) -> GPIOBackend:
+    """Create the GPIO backend named by ``name`` or ``Config.GPIO_BACKEND``."""
+    backend_name = (name or Config.GPIO_BACKEND).lower()
+    if backend_name not in _BACKENDS:
+        raise ValueError(f"Unknown GPIO backend {backend_name!r}, expected one of {sorted(_BACKENDS)}")
+    return _BACKENDS[backend_name]()
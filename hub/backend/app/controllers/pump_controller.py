@@ -1,26 +1,53 @@
-# import RPi.GPIO as GPIO
+import logging
 import time
+from typing import Optional
+
+from app.config import Config
+from app.controllers.actuators import Actuator
+from app.controllers.gpio import GPIOBackend, HIGH, LOW, get_gpio_backend
+
+logger = logging.getLogger(__name__)
 
 _MOTOR_FI = 17  # Forward Input pin
 _MOTOR_BI = 27  # Backward Input pin
 
-_PUMP_DURATION_SECONDS = 5
-
-class PumpController():
-    def __init__(self):
-        print("PumpController initialized")
-        # GPIO.setmode(GPIO.BCM)
-        # GPIO.setup(_MOTOR_FI, GPIO.OUT)
-        # GPIO.setup(_MOTOR_BI, GPIO.OUT)
-
-        # GPIO.output(_MOTOR_BI, GPIO.LOW)
-        # GPIO.output(_MOTOR_FI, GPIO.LOW)
-
-    def on(self):
-        """Activate the pump. Currently a stub implementation."""
-        # GPIO.output(_MOTOR_BI, GPIO.HIGH)
-        # GPIO.output(_MOTOR_FI, GPIO.LOW)
-        # time.sleep(_PUMP_DURATION_SECONDS)
-        # GPIO.output(_MOTOR_BI, GPIO.LOW)
-        # GPIO.output(_MOTOR_FI, GPIO.LOW)
-        pass
\ No newline at end of file
+class PumpController(Actuator):
+    kind = "pump"
+
+    def __init__(
+        self,
+        gpio: Optional[GPIOBackend] = None,
+        duration_seconds: Optional[float] = None,
+        forward_pin: int = _MOTOR_FI,
+        backward_pin: int = _MOTOR_BI,
+    ) -> None:
+        self.gpio = gpio or get_gpio_backend()
+        self.duration_seconds = (
+            Config.PUMP_DURATION_SECONDS if duration_seconds is None else duration_seconds
+        )
+        self.forward_pin = forward_pin
+        self.backward_pin = backward_pin
+
+        self.gpio.setup_output(self.forward_pin)
+        self.gpio.setup_output(self.backward_pin)
+
+        self.gpio.output(self.backward_pin, LOW)
+        self.gpio.output(self.forward_pin, LOW)
+        logger.info(f"PumpController initialized ({self.gpio.name} GPIO)")
+
+    def turn_on(self) -> None:
+        """Start the pump without waiting; see ``ActuatorScheduler`` for timed runs."""
+        self.gpio.output(self.backward_pin, HIGH)
+        self.gpio.output(self.forward_pin, LOW)
+
+    def turn_off(self) -> None:
+        self.gpio.output(self.backward_pin, LOW)
+        self.gpio.output(self.forward_pin, LOW)
+
+    def on(self) -> None:
+        """Run the pump for ``duration_seconds``. Blocks for the whole run."""
+        try:
+            self.turn_on()
+            time.sleep(self.duration_seconds)
+        finally:
+            self.turn_off()
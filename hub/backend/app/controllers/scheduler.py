@@ -0,0 +1,388 @@
+"""One-thread scheduler for timed actuator runs.
+
+Every timed on/off event for every device lives in a single hashed timing
+wheel, so inserting and cancelling a timer are O(1) and thousands of
+schedules share one thread instead of sleeping one thread each. A device is
+held by at most one run at a time; runs that come due while it is busy wait
+in a per-device FIFO and start as soon as it is released.
+"""
+import itertools
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.controllers.actuators import Actuator
+
+logger = logging.getLogger(__name__)
+
+# Called with a snapshot of the run (``ScheduledRun.to_dict``) taken when the
+# callback was queued, so a repeating run re-armed in the meantime is not seen
+RunCallback = Callable[[Dict[str, Any]], None]
+# Timer actions run under the scheduler lock and append the user callbacks
+# they trigger to a list that is invoked once the lock is released.
+TimerAction = Callable[[List[Callable[[], None]]], None]
+
+
+class RunState:
+    """States of a scheduled run: scheduled -> waiting? -> running -> done/failed/cancelled."""
+
+    SCHEDULED = "scheduled"
+    WAITING = "waiting"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class _Timer:
+    __slots__ = ("id", "tick", "callback")
+
+    def __init__(self, timer_id: int, tick: int, callback: Any) -> None:
+        self.id = timer_id
+        self.tick = tick
+        self.callback = callback
+
+
+class TimingWheel:
+    """Hashed timing wheel (Varghese & Lauck, scheme 6).
+
+    Timers are hashed into ``slots`` buckets by their expiry tick; a timer
+    further out than one revolution simply stays in its bucket until the
+    wheel comes round to its tick. Not thread-safe; ``ActuatorScheduler``
+    serializes access.
+    """
+
+    def __init__(self, tick_seconds: float = 0.1, slots: int = 512, clock: Callable[[], float] = time.monotonic) -> None:
+        self.tick_seconds = tick_seconds
+        self.clock = clock
+        self._slots: List[Dict[int, _Timer]] = [{} for _ in range(slots)]
+        self._origin = clock()
+        self._current_tick = 0
+        self._ids = itertools.count(1)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, delay_seconds: float, callback: Any) -> _Timer:
+        """Schedule ``callback`` no earlier than ``delay_seconds`` from now. O(1)."""
+        due = self.clock() - self._origin + max(delay_seconds, 0.0)
+        tick = max(math.ceil(due / self.tick_seconds), self._current_tick + 1)
+        timer = _Timer(next(self._ids), tick, callback)
+        self._slots[tick % len(self._slots)][timer.id] = timer
+        self._size += 1
+        return timer
+
+    def cancel(self, timer: _Timer) -> bool:
+        """Remove a pending timer. O(1). Returns False if it already fired."""
+        if self._slots[timer.tick % len(self._slots)].pop(timer.id, None) is None:
+            return False
+        self._size -= 1
+        return True
+
+    def advance(self) -> List[_Timer]:
+        """Move the wheel up to the current time and return the expired timers in expiry order."""
+        target = math.floor((self.clock() - self._origin) / self.tick_seconds)
+        expired: List[_Timer] = []
+        while self._current_tick < target:
+            self._current_tick += 1
+            bucket = self._slots[self._current_tick % len(self._slots)]
+            if not bucket:
+                continue
+            due = [timer for timer in bucket.values() if timer.tick <= self._current_tick]
+            for timer in due:
+                del bucket[timer.id]
+            expired.extend(due)
+        self._size -= len(expired)
+        return expired
+
+
+class ScheduledRun:
+    """One timed activation of one device, optionally repeating."""
+
+    def __init__(
+        self,
+        device: str,
+        duration_seconds: float,
+        repeat_every_seconds: Optional[float],
+        on_start: Optional[RunCallback],
+        on_finish: Optional[RunCallback],
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.device = device
+        self.duration_seconds = duration_seconds
+        self.repeat_every_seconds = repeat_every_seconds
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.state = RunState.SCHEDULED
+        self.due_at: Optional[datetime] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self._timer: Optional[_Timer] = None
+        self._due_monotonic = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "device": self.device,
+            "duration_seconds": self.duration_seconds,
+            "repeat_every_seconds": self.repeat_every_seconds,
+            "state": self.state,
+            "due_at": self.due_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class ActuatorScheduler:
+    """Drives a set of named actuators from a single timing-wheel thread.
+
+    Actuator calls and run callbacks execute on the scheduler thread, so
+    they must not block; callbacks are invoked without the scheduler lock
+    held and may schedule or cancel runs themselves.
+    """
+
+    def __init__(
+        self,
+        actuators: Optional[Dict[str, Actuator]] = None,
+        tick_seconds: float = 0.1,
+        slots: int = 512,
+    ) -> None:
+        """Initialize the scheduler. Call ``start`` to begin firing timers.
+
+        Args:
+            actuators: Devices by name; more can be added with ``add_actuator``.
+            tick_seconds: Timer resolution.
+            slots: Wheel size; one revolution covers ``tick_seconds * slots``.
+        """
+        self._actuators: Dict[str, Actuator] = dict(actuators or {})
+        self._wheel = TimingWheel(tick_seconds, slots)
+        self._lock = threading.RLock()
+        self._runs: Dict[str, ScheduledRun] = {}
+        self._holders: Dict[str, ScheduledRun] = {}
+        self._waiting: Dict[str, "OrderedDict[str, ScheduledRun]"] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_actuator(self, name: str, actuator: Actuator) -> None:
+        with self._lock:
+            self._actuators[name] = actuator
+
+    @property
+    def actuators(self) -> Dict[str, Actuator]:
+        return dict(self._actuators)
+
+    def start(self) -> None:
+        """Start the scheduler thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="actuator-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread, switch off every device that is still on and cancel its run."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        callbacks: List[Callable[[], None]] = []
+        with self._lock:
+            for device, run in list(self._holders.items()):
+                if run._timer is not None:
+                    self._wheel.cancel(run._timer)
+                    run._timer = None
+                run.repeat_every_seconds = None
+                self._turn_off(device)
+                del self._holders[device]
+                self._finish(run, RunState.CANCELLED, "scheduler stopped", callbacks)
+        self._invoke(callbacks)
+
+    def schedule_run(
+        self,
+        device: str,
+        duration_seconds: float,
+        delay_seconds: float = 0.0,
+        repeat_every_seconds: Optional[float] = None,
+        on_start: Optional[RunCallback] = None,
+        on_finish: Optional[RunCallback] = None,
+    ) -> ScheduledRun:
+        """Switch ``device`` on after ``delay_seconds`` and off ``duration_seconds`` later.
+
+        Args:
+            device: Name of a registered actuator.
+            duration_seconds: How long the device stays on per run.
+            delay_seconds: Time until the (first) run is due.
+            repeat_every_seconds: Period between run starts for a repeating schedule.
+            on_start: Called on the scheduler thread once the device is on.
+            on_finish: Called on the scheduler thread once the run finished,
+                for every repeat of a repeating run.
+
+        Returns:
+            ScheduledRun: Handle whose ``id`` can be passed to ``cancel``.
+
+        Raises:
+            KeyError: If ``device`` is not registered.
+            ValueError: If a duration or period is not positive.
+        """
+        if device not in self._actuators:
+            raise KeyError(f"unknown actuator {device!r}")
+        if duration_seconds <= 0:
+            raise ValueError("duration_seconds must be positive")
+        if repeat_every_seconds is not None and repeat_every_seconds < duration_seconds:
+            raise ValueError("repeat_every_seconds must not be shorter than duration_seconds")
+
+        run = ScheduledRun(device, duration_seconds, repeat_every_seconds, on_start, on_finish)
+        with self._lock:
+            self._runs[run.id] = run
+            self._arm(run, time.monotonic() + max(delay_seconds, 0.0))
+        return run
+
+    def cancel(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a run; a running device is switched off immediately.
+
+        Returns:
+            dict: The cancelled run, or None if the id is unknown or already finished.
+        """
+        callbacks: List[Callable[[], None]] = []
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None or run.state in RunState.FINISHED:
+                return None
+            if run._timer is not None:
+                self._wheel.cancel(run._timer)
+                run._timer = None
+            if run.state == RunState.WAITING:
+                self._waiting[run.device].pop(run.id, None)
+            run.repeat_every_seconds = None
+            if run.state == RunState.RUNNING:
+                self._release(run, RunState.CANCELLED, None, callbacks)
+            else:
+                self._finish(run, RunState.CANCELLED, None, callbacks)
+            cancelled = run.to_dict()
+        self._invoke(callbacks)
+        return cancelled
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            run = self._runs.get(run_id)
+            return run.to_dict() if run else None
+
+    def list_runs(self, device: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Scheduled, waiting and running runs, optionally for one device."""
+        with self._lock:
+            return [run.to_dict() for run in self._runs.values() if device is None or run.device == device]
+
+    def tick(self) -> int:
+        """Fire every expired timer. Returns the number fired."""
+        callbacks: List[Callable[[], None]] = []
+        with self._lock:
+            expired = self._wheel.advance()
+            for timer in expired:
+                timer.callback(callbacks)
+        self._invoke(callbacks)
+        return len(expired)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._wheel.tick_seconds):
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Error in actuator scheduler: {e}", exc_info=True)
+
+    # Everything below runs with self._lock held.
+
+    def _arm(self, run: ScheduledRun, due_monotonic: float) -> None:
+        run.state = RunState.SCHEDULED
+        run._due_monotonic = due_monotonic
+        delay_seconds = due_monotonic - time.monotonic()
+        run.due_at = datetime.now(timezone.utc) + timedelta(seconds=max(delay_seconds, 0.0))
+        action: TimerAction = lambda pending: self._begin(run, pending)
+        run._timer = self._wheel.add(delay_seconds, action)
+
+    def _begin(self, run: ScheduledRun, pending: List[Callable[[], None]]) -> None:
+        run._timer = None
+        if run.device in self._holders:
+            run.state = RunState.WAITING
+            self._waiting.setdefault(run.device, OrderedDict())[run.id] = run
+            return
+        self._start(run, pending)
+
+    def _start(self, run: ScheduledRun, pending: List[Callable[[], None]]) -> bool:
+        """Switch the device on for ``run``. Returns False if that failed and the run finished as failed."""
+        try:
+            self._actuators[run.device].turn_on()
+        except Exception as e:
+            logger.error(f"Error switching on {run.device}: {e}", exc_info=True)
+            self._turn_off(run.device)
+            self._finish(run, RunState.FAILED, str(e), pending)
+            return False
+        self._holders[run.device] = run
+        run.state = RunState.RUNNING
+        run.started_at = datetime.now(timezone.utc)
+        action: TimerAction = lambda later: self._release(run, RunState.DONE, None, later)
+        run._timer = self._wheel.add(run.duration_seconds, action)
+        if run.on_start is not None:
+            started = run.to_dict()
+            pending.append(lambda: run.on_start(started))
+        return True
+
+    def _release(self, run: ScheduledRun, state: str, error: Optional[str], pending: List[Callable[[], None]]) -> None:
+        run._timer = None
+        if not self._turn_off(run.device) and state == RunState.DONE:
+            state, error = RunState.FAILED, f"could not switch off {run.device}"
+        self._holders.pop(run.device, None)
+        self._finish(run, state, error, pending)
+
+        # A waiter that fails to start leaves the device free for the next one
+        waiting = self._waiting.get(run.device)
+        while waiting:
+            _, next_run = waiting.popitem(last=False)
+            if self._start(next_run, pending):
+                break
+
+    def _finish(self, run: ScheduledRun, state: str, error: Optional[str], pending: List[Callable[[], None]]) -> None:
+        run.state = state
+        run.error = error
+        run.finished_at = datetime.now(timezone.utc)
+        if run.on_finish is not None:
+            finished = run.to_dict()
+            pending.append(lambda: run.on_finish(finished))
+
+        if run.repeat_every_seconds is not None and state != RunState.CANCELLED:
+            # Next start is anchored to the previous due time, so a repeating
+            # schedule does not drift by the time spent waiting for the device.
+            next_due = run._due_monotonic + run.repeat_every_seconds
+            while next_due <= time.monotonic():
+                next_due += run.repeat_every_seconds
+            run.started_at = run.finished_at = None
+            run.error = None
+            self._arm(run, next_due)
+        else:
+            del self._runs[run.id]
+
+    def _turn_off(self, device: str) -> bool:
+        try:
+            self._actuators[device].turn_off()
+            return True
+        except Exception as e:
+            logger.error(f"Error switching off {device}: {e}", exc_info=True)
+            return False
+
+    @staticmethod
+    def _invoke(callbacks: List[Callable[[], None]]) -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in actuator run callback: {e}", exc_info=True)
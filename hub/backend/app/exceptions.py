@@ -20,3 +20,7 @@ class ValidationError(Exception):
     """Raised when input validation fails."""
     pass
 
+
+class PumpDaemonError(Exception):
+    """Raised when the pump daemon cannot be reached or rejects a command."""
+    pass
@@ -0,0 +1,247 @@
+"""Ingestion listener: sensor readings over UDP and MQTT, outside Flask.
+
+A fleet of microcontrollers posting over HTTP keeps the web workers busy
+with sensor traffic. This process accepts the same readings over lighter
+transports and feeds them to the same batching writer as ``/api/data``,
+which announces them to the web app once written (see
+``services/reading_notification_service.py``)::
+
+    python -m app.ingest_listener
+
+UDP (``INGEST_UDP_PORT``, default 5005): one datagram per message, either
+JSON (``{"sensor": ..., "value": ...}`` or a batch) or the packed binary
+batch format of ``services/sensor_reading_service.py``. Sequence-numbered
+readings that were already received are dropped, as over HTTP.
+
+MQTT (enabled by ``MQTT_HOST``, requires ``aiomqtt``): a plain number
+published to ``<prefix>/sensors/<sensor>``, or a JSON/binary batch published
+to ``<prefix>/batch``.
+"""
+import asyncio
+import json
+import logging
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app import create_db_app
+from app.config import Config
+from app.services.pump_client import PumpClient, WateringClient
+from app.services.reading_sequence_service import ReadingSequenceTracker
+from app.services.sensor_reading_service import SensorReadingService, SensorReadingWriter
+
+logger = logging.getLogger(__name__)
+
+Rows = List[Dict[str, Any]]
+
+
+def decode_payload(payload: bytes, received_at: datetime, sensor: Optional[str] = None) -> Tuple[Optional[Rows], Optional[str]]:
+    """Decode one UDP datagram or MQTT message into reading rows.
+
+    Args:
+        payload: Raw message body.
+        received_at: Receive time, used for readings without a timestamp.
+        sensor: Sensor name taken from the MQTT topic, for bare-number payloads.
+
+    Returns:
+        tuple: (rows, error_message)
+    """
+    if sensor is not None:
+        try:
+            value: Any = float(payload.decode("ascii"))
+        except (UnicodeDecodeError, ValueError):
+            return None, "payload must be a number"
+        error = SensorReadingService.validate_reading(sensor, value)
+        return (None, error) if error else ([{"sensor": sensor.strip(), "value": value, "recorded_at": received_at}], None)
+
+    if payload[:1] in (b"{", b"["):
+        try:
+            data = json.loads(payload)
+        except (UnicodeDecodeError, ValueError):
+            return None, "invalid JSON"
+        if isinstance(data, dict) and "readings" not in data:
+            error = SensorReadingService.validate_reading(data.get("sensor"), data.get("value"))
+            if error:
+                return None, error
+            sensor = data["sensor"].strip()
+            sequence, error = SensorReadingService.parse_sequence(data, sensor)
+            if error:
+                return None, error
+            return [{"sensor": sensor, "value": data["value"], "recorded_at": received_at, **(sequence or {})}], None
+        return SensorReadingService.parse_json_batch(data, received_at)
+    return SensorReadingService.parse_binary_batch(payload, received_at)
+
+
+class IngestMetrics:
+    """Message and reading counters, reported as rates per interval."""
+
+    def __init__(self) -> None:
+        self.totals = {"messages": 0, "readings": 0, "rejected": 0, "duplicates": 0}
+        self._last = dict(self.totals)
+        self._last_at = time.monotonic()
+
+    def report(self, writer_stats: Dict[str, int]) -> Dict[str, Any]:
+        """Rates since the previous report, plus totals and the writer's counters."""
+        now = time.monotonic()
+        elapsed = max(now - self._last_at, 1e-9)
+        rates = {f"{name}_per_second": round((self.totals[name] - self._last[name]) / elapsed, 2) for name in self.totals}
+        self._last, self._last_at = dict(self.totals), now
+        return {
+            **rates,
+            **self.totals,
+            "writer_dropped": writer_stats["dropped"],
+            "writer_buffered": writer_stats["buffered"],
+        }
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, listener: "IngestListener") -> None:
+        self.listener = listener
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.listener.handle_payload(data, "udp")
+
+
+class IngestListener:
+    """Decodes readings from UDP and MQTT and hands them to a ``SensorReadingWriter``."""
+
+    METRICS_INTERVAL_SECONDS = 60.0
+    # Absorbs bursts while the loop is busy; the kernel drops datagrams past it
+    UDP_RECEIVE_BUFFER_BYTES = 4 * 1024 * 1024
+    MQTT_RECONNECT_SECONDS = 5.0
+
+    def __init__(
+        self,
+        writer: SensorReadingWriter,
+        watering_controller: Optional[WateringClient] = None,
+    ) -> None:
+        """Initialize the listener.
+
+        Args:
+            writer: Buffered writer the decoded readings go to.
+            watering_controller: Forwards fresh readings to the pump daemon's
+                controller when given; its blocking calls run on a worker
+                thread, never on the event loop.
+        """
+        self.writer = writer
+        self.watering_controller = watering_controller
+        self.metrics = IngestMetrics()
+        self.sequence_tracker = ReadingSequenceTracker()
+        self._watering_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-watering")
+
+    def handle_payload(self, payload: bytes, source: str, sensor: Optional[str] = None) -> None:
+        """Decode and queue one message. Runs on the event loop, so it never blocks."""
+        received_at = datetime.now(timezone.utc)
+        self.metrics.totals["messages"] += 1
+        rows, error = decode_payload(payload, received_at, sensor)
+        if error:
+            self.metrics.totals["rejected"] += 1
+            logger.debug(f"Rejected {source} message: {error}")
+            return
+
+        rows, duplicates = self.sequence_tracker.filter_new(rows)
+        self.metrics.totals["duplicates"] += duplicates
+        if not rows:
+            return
+        self.metrics.totals["readings"] += len(rows)
+        self.writer.add_many(rows)
+        if self.watering_controller is not None:
+            for fresh_sensor, value in SensorReadingService.fresh_latest(rows, received_at):
+                self._watering_executor.submit(self._observe, fresh_sensor, value)
+
+    def _observe(self, sensor: str, value: float) -> None:
+        try:
+            self.watering_controller.observe(sensor, value)
+        except Exception as e:
+            logger.error(f"Error feeding watering controller for {sensor}: {e}", exc_info=True)
+
+    async def serve_udp(self, host: str, port: int) -> None:
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(lambda: _UDPProtocol(self), local_addr=(host, port))
+        try:
+            transport.get_extra_info("socket").setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, self.UDP_RECEIVE_BUFFER_BYTES
+            )
+        except OSError as e:
+            logger.warning(f"Could not enlarge the UDP receive buffer: {e}")
+        logger.info(f"Listening for UDP readings on {host}:{port}")
+        try:
+            await asyncio.Future()
+        finally:
+            transport.close()
+
+    async def serve_mqtt(self, host: str, port: int, prefix: str) -> None:
+        try:
+            import aiomqtt
+        except ImportError as e:
+            raise RuntimeError("aiomqtt is not installed; unset MQTT_HOST or pip install aiomqtt") from e
+
+        sensor_topic = f"{prefix}/sensors/"
+        batch_topic = f"{prefix}/batch"
+        while True:
+            try:
+                async with aiomqtt.Client(host, port) as client:
+                    await client.subscribe(f"{sensor_topic}+")
+                    await client.subscribe(batch_topic)
+                    logger.info(f"Subscribed to MQTT readings on {host}:{port} under {prefix}/")
+                    async for message in client.messages:
+                        topic = message.topic.value
+                        payload = message.payload
+                        if not isinstance(payload, (bytes, bytearray)):
+                            payload = b"" if payload is None else str(payload).encode("utf-8")
+                        if topic.startswith(sensor_topic):
+                            self.handle_payload(bytes(payload), "mqtt", sensor=topic[len(sensor_topic):])
+                        else:
+                            self.handle_payload(bytes(payload), "mqtt")
+            except aiomqtt.MqttError as e:
+                logger.warning(f"MQTT connection lost ({e}), reconnecting in {self.MQTT_RECONNECT_SECONDS:.0f}s")
+                await asyncio.sleep(self.MQTT_RECONNECT_SECONDS)
+
+    async def report_metrics(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            logger.info(f"Ingest metrics: {self.metrics.report(self.writer.stats())}")
+
+    async def run(self) -> None:
+        """Serve UDP, and MQTT when configured, until cancelled."""
+        tasks = [
+            self.serve_udp(Config.INGEST_UDP_HOST, Config.INGEST_UDP_PORT),
+            self.report_metrics(self.METRICS_INTERVAL_SECONDS),
+        ]
+        if Config.MQTT_HOST:
+            tasks.append(self.serve_mqtt(Config.MQTT_HOST, Config.MQTT_PORT, Config.MQTT_TOPIC_PREFIX))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self._watering_executor.shutdown(wait=False)
+            self.writer.stop()
+
+
+def main() -> int:
+    # Watering runs in the pump daemon; without one this process must not drive the pins
+    watering_controller = WateringClient(PumpClient(Config.PUMP_SOCKET)) if Config.PUMP_SOCKET else None
+    if watering_controller is None:
+        logger.warning("PUMP_SOCKET is not set; readings are stored but will not trigger watering")
+    # Written readings are announced to the web app's health monitor, latest readings and stream
+    listener = IngestListener(SensorReadingWriter(create_db_app(), notify=True), watering_controller)
+
+    async def _serve() -> None:
+        task = asyncio.ensure_future(listener.run())
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, task.cancel)
+        try:
+            await task
+        except asyncio.CancelledError:
+            logger.info("Ingest listener stopped")
+
+    asyncio.run(_serve())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,13 @@ Models package - imports all models for Alembic migrations.
 # Import order matters: import base models before models that reference them
 from app.models.photo_histories import PhotoHistory  # noqa: F401
 from app.models.plants import Plants  # noqa: F401
+from app.models.recurring_tasks import RecurringTask  # noqa: F401
 from app.models.notes import Note  # noqa: F401
+from app.models.pump_runs import PumpRun  # noqa: F401
+from app.models.watering_rules import WateringRule  # noqa: F401
+from app.models.sensor_readings import SensorReading  # noqa: F401
+from app.models.sensor_reading_rollups import SensorReadingRollup  # noqa: F401
+from app.models.sensors import Sensor  # noqa: F401
 
-__all__ = ["Plants", "PhotoHistory", "Note"]
+__all__ = ["Plants", "PhotoHistory", "RecurringTask", "Note", "PumpRun", "WateringRule", "SensorReading", "SensorReadingRollup", "Sensor"]
 
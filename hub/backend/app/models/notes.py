@@ -7,6 +7,19 @@ from app.database import db
 
 class Note(db.Model):
     __tablename__ = "notes"
+    __table_args__ = (
+        # Serves the due-soon digest: only open tasks are indexed, so the
+        # index stays small as completed notes accumulate.
+        db.Index(
+            "ix_notes_due_date_incomplete",
+            "due_date",
+            postgresql_where=db.text("completed_at IS NULL"),
+        ),
+        # One materialized note per completed occurrence of a recurring task.
+        db.UniqueConstraint(
+            "recurring_task_id", "due_date", name="uq_notes_recurring_task_id_due_date"
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     plant_id = db.Column(
@@ -18,6 +31,12 @@ class Note(db.Model):
         nullable=True,
     )
 
+    recurring_task_id = db.Column(
+        db.Integer,
+        db.ForeignKey("recurring_tasks.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
     content = db.Column(db.Text, nullable=False)
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.now(timezone.utc))
@@ -35,6 +54,7 @@ class Note(db.Model):
             "id": self.id,
             "plant_id": self.plant_id,
             "photo_history_id": self.photo_history_id,
+            "recurring_task_id": self.recurring_task_id,
             "content": self.content,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
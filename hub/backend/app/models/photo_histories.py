@@ -3,6 +3,9 @@ from datetime import datetime, timezone
 
 class PhotoHistory(db.Model):
     __tablename__ = 'photo_histories'
+    __table_args__ = (
+        db.Index('ix_photo_histories_plant_id_created_at', 'plant_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     plant_id = db.Column(db.Integer, db.ForeignKey('plants.id'), nullable=False)
@@ -7,15 +7,17 @@ class Plants(db.Model):
     species = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.now(timezone.utc))
 
-    def to_dict(self):
-        # Query the related PhotoHistory records each time to ensure up-to-date data
-        # Use lazy import to avoid circular dependency
-        from app.models.photo_histories import PhotoHistory
-        histories = PhotoHistory.query.filter_by(plant_id=self.id).all()
+    def to_dict(self, photo_histories=None):
+        # Query the related PhotoHistory records each time to ensure up-to-date data,
+        # unless the caller already has them (e.g. a freshly inserted plant has none)
+        if photo_histories is None:
+            # Use lazy import to avoid circular dependency
+            from app.models.photo_histories import PhotoHistory
+            photo_histories = PhotoHistory.query.filter_by(plant_id=self.id).all()
         return {
             "id": self.id,
             "nickname": self.nickname,
             "species": self.species,
             "created_at": self.created_at,
-            "photo_histories": [ph.to_dict() for ph in histories]
+            "photo_histories": [ph.to_dict() for ph in photo_histories]
         }
\ No newline at end of file
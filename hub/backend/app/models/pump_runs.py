@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from app.database import db
+
+
+class PumpRun(db.Model):
+    """One finished pump activation, written in batches by the pump executor."""
+
+    __tablename__ = "pump_runs"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    run_id = db.Column(db.String(32), nullable=False, unique=True)
+    pump_id = db.Column(db.String(64), nullable=False)
+    trigger_source = db.Column(db.String(32), nullable=False)
+    state = db.Column(db.String(16), nullable=False)
+    error = db.Column(db.Text, nullable=True)
+
+    requested_duration_seconds = db.Column(db.Float, nullable=False)
+    actual_duration_seconds = db.Column(db.Float, nullable=True)
+    started_at = db.Column(db.DateTime, nullable=False, index=True)
+    ended_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "run_id": self.run_id,
+            "pump_id": self.pump_id,
+            "trigger_source": self.trigger_source,
+            "state": self.state,
+            "error": self.error,
+            "requested_duration_seconds": self.requested_duration_seconds,
+            "actual_duration_seconds": self.actual_duration_seconds,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+        }
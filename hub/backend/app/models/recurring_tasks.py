@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.database import db
+
+
+class RecurringTask(db.Model):
+    """A repeating care task (e.g. water every 7 days) attached to a plant.
+
+    Occurrences are never stored up front; they are expanded from ``rrule``
+    and ``starts_at`` for whatever window is requested. Only completed
+    occurrences become ``notes`` rows (see ``Note.recurring_task_id``).
+    """
+
+    __tablename__ = "recurring_tasks"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    plant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("plants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    content = db.Column(db.Text, nullable=False)
+    rrule = db.Column(db.String(255), nullable=False)
+    starts_at = db.Column(db.DateTime, nullable=False)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "plant_id": self.plant_id,
+            "content": self.content,
+            "rrule": self.rrule,
+            "starts_at": self.starts_at,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from app.database import db
+
+
+class SensorReadingRollup(db.Model):
+    """Min/max/sum/count of one sensor's readings over one time bucket.
+
+    Kept for 1-minute, 1-hour and 1-day buckets (``resolution_seconds``) and
+    updated in the same statement that inserts the raw readings; see
+    ``SensorRollupService``. The sum is stored instead of the average so a
+    bucket can be merged with later readings and with neighbouring buckets.
+    """
+
+    __tablename__ = "sensor_reading_rollups"
+
+    # Key order serves "one sensor, one resolution, a time range"
+    sensor = db.Column(db.String(64), primary_key=True)
+    resolution_seconds = db.Column(db.Integer, primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    min_value = db.Column(db.Float, nullable=False)
+    max_value = db.Column(db.Float, nullable=False)
+    value_sum = db.Column(db.Float, nullable=False)
+    value_count = db.Column(db.Integer, nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "sensor": self.sensor,
+            "resolution_seconds": self.resolution_seconds,
+            "bucket_start": self.bucket_start,
+            "min": self.min_value,
+            "max": self.max_value,
+            "avg": self.value_sum / self.value_count,
+            "count": self.value_count,
+        }
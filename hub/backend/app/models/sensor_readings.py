@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from app.database import db
+
+
+class SensorReading(db.Model):
+    """One raw sensor value, written in batches by ``SensorReadingWriter``.
+
+    The table is range-partitioned by month on ``recorded_at``; partitions
+    are created and dropped by ``SensorPartitionService``.
+    """
+
+    __tablename__ = "sensor_readings"
+    __table_args__ = (
+        # Serves per-sensor time-range reads (charts, latest values)
+        db.Index("ix_sensor_readings_sensor_recorded_at", "sensor", "recorded_at"),
+        # Rows arrive in time order, so a BRIN index covers whole-range scans
+        # at a tiny fraction of a btree's size
+        db.Index("ix_sensor_readings_recorded_at_brin", "recorded_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+
+    # The partition key has to be part of the primary key
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    recorded_at = db.Column(db.DateTime, primary_key=True, nullable=False)
+    sensor = db.Column(db.String(64), nullable=False)
+    value = db.Column(db.Float, nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "sensor": self.sensor,
+            "value": self.value,
+            "recorded_at": self.recorded_at,
+        }
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.database import db
+
+
+class Sensor(db.Model):
+    """A device reporting readings under ``name``, optionally placed in a plant.
+
+    ``calibration`` is a piecewise-linear curve of ``[raw, percent]`` points
+    used to convert raw ``analogRead`` values; None means the default
+    ``MOISTURE_RAW_DRY``/``MOISTURE_RAW_WET`` line.
+    """
+
+    __tablename__ = "sensors"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # Name the firmware reports readings under, e.g. "moisture"
+    name = db.Column(db.String(64), nullable=False, unique=True)
+    plant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("plants.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    kind = db.Column(db.String(32), nullable=False, default="moisture")
+    calibration = db.Column(db.JSON(none_as_null=True), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "plant_id": self.plant_id,
+            "kind": self.kind,
+            "calibration": self.calibration,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.database import db
+
+
+class WateringRule(db.Model):
+    """Moisture thresholds that let the hub water a plant automatically.
+
+    Watering starts once the plant's sensor reads at or below ``low_percent``
+    and keeps going, one pump run per ``cooldown_seconds``, until it reads
+    ``high_percent`` again.
+    """
+
+    __tablename__ = "watering_rules"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    plant_id = db.Column(
+        db.Integer,
+        db.ForeignKey("plants.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    # Sensor name as reported by the firmware, e.g. "moisture"
+    sensor = db.Column(db.String(64), nullable=False, unique=True)
+
+    low_percent = db.Column(db.Float, nullable=False)
+    high_percent = db.Column(db.Float, nullable=False)
+    cooldown_seconds = db.Column(db.Integer, nullable=False, default=1800)
+    enabled = db.Column(db.Boolean, nullable=False, default=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "plant_id": self.plant_id,
+            "sensor": self.sensor,
+            "low_percent": self.low_percent,
+            "high_percent": self.high_percent,
+            "cooldown_seconds": self.cooldown_seconds,
+            "enabled": self.enabled,
+            "created_at": self.created_at,
+        }
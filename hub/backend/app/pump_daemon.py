@@ -0,0 +1,186 @@
+"""Pump daemon: the single process that owns the GPIO pins.
+
+Web workers talk to it over a Unix socket (see ``services/pump_client.py``),
+so running several WSGI workers never means several processes driving the
+same pins. It also runs the watering controller, so readings from the web
+workers and the ingest listener reach a single one. Run with::
+
+    PUMP_SOCKET=/run/growery/pump.sock python -m app.pump_daemon
+
+``GPIO_BACKEND=simulated`` (the default) lets the daemon run on any Linux box.
+"""
+import logging
+import os
+import queue
+import signal
+import socketserver
+import sys
+from typing import Any, Dict, Optional
+
+from flask import Flask
+
+from app import create_db_app
+from app.config import Config
+from app.services.pump_client import WATCH_HEARTBEAT_SECONDS, read_frame, write_frame
+from app.services.pump_run_service import PumpRunRecorder
+from app.services.pump_service import PumpService
+from app.services.watering_service import WateringController
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "/tmp/growery-pump.sock"
+
+
+class PumpDaemon:
+    """Dispatches framed commands to one in-process ``PumpService`` and ``WateringController``."""
+
+    def __init__(self, socket_path: str, pump_service: Optional[PumpService] = None, app: Optional[Flask] = None) -> None:
+        """Initialize the daemon.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on.
+            pump_service: The pump to drive (default: a new ``PumpService``).
+            app: App whose database holds the watering rules; watering
+                commands are rejected without one.
+        """
+        self.socket_path = socket_path
+        self.pump_service = pump_service or PumpService()
+        self.app = app
+        self.watering_controller = WateringController(self.pump_service) if app is not None else None
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    def handle(self, message: Any) -> Dict[str, Any]:
+        """Execute one command and build its response frame."""
+        if not isinstance(message, dict):
+            return {"ok": False, "error": "message must be an object"}
+
+        command = message.get("command")
+        try:
+            if command == "ping":
+                return {"ok": True, "result": "pong"}
+            if command == "activate":
+                trigger_source = str(message.get("trigger_source") or "manual")
+                return {"ok": True, "result": self.pump_service.activate_pump(trigger_source)}
+            if command == "get_run":
+                return {"ok": True, "result": self.pump_service.get_run(str(message.get("run_id")))}
+            # Actuator schedule commands answer with (result, error, status_code)
+            if command == "schedule_run":
+                return {"ok": True, "result": self.pump_service.schedule_run(
+                    message.get("device"),
+                    message.get("duration_seconds"),
+                    message.get("delay_seconds", 0),
+                    message.get("repeat_every_seconds"),
+                )}
+            if command == "cancel_scheduled_run":
+                return {"ok": True, "result": self.pump_service.cancel_scheduled_run(str(message.get("run_id")))}
+            if command == "list_scheduled_runs":
+                return {"ok": True, "result": self.pump_service.list_scheduled_runs(message.get("device"))}
+            if command in ("observe", "watering_state", "watering_rule", "invalidate_watering"):
+                return self._handle_watering(command, message)
+        except Exception as e:
+            logger.error(f"Error handling pump command {command!r}: {e}", exc_info=True)
+            return {"ok": False, "error": f"{command} failed"}
+        return {"ok": False, "error": f"unknown command {command!r}"}
+
+    def _handle_watering(self, command: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        if self.watering_controller is None:
+            return {"ok": False, "error": "watering is not enabled in this daemon"}
+        sensor = str(message.get("sensor"))
+        # Rules and calibrations are loaded from the database
+        with self.app.app_context():
+            if command == "observe":
+                return {"ok": True, "result": self.watering_controller.observe(sensor, float(message.get("value")))}
+            if command == "watering_state":
+                return {"ok": True, "result": self.watering_controller.get_state(sensor)}
+            if command == "watering_rule":
+                return {"ok": True, "result": self.watering_controller.rule(sensor)}
+            self.watering_controller.invalidate()
+            return {"ok": True, "result": None}
+
+    def stream_runs(self, sock: Any) -> None:
+        """Send every pump run state change to one watcher until it disconnects."""
+        runs: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=256)
+
+        def _enqueue(run: Dict[str, Any]) -> None:
+            try:
+                runs.put_nowait(run)
+            except queue.Full:
+                logger.warning(f"Pump run watcher is lagging, skipped run {run['id']} {run['state']}")
+
+        self.pump_service.add_run_listener(_enqueue)
+        try:
+            while True:
+                try:
+                    run: Optional[Dict[str, Any]] = runs.get(timeout=WATCH_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    run = None
+                write_frame(sock, {"ok": True, "result": run})
+        except OSError as e:
+            logger.info(f"Pump run watcher disconnected: {e}")
+        finally:
+            self.pump_service.remove_run_listener(_enqueue)
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until ``shutdown`` is called."""
+        daemon = self
+
+        class _Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                # A connection may carry any number of request/response pairs
+                while True:
+                    try:
+                        message = read_frame(self.request)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Dropping pump client connection: {e}")
+                        return
+                    if message is None:
+                        return
+                    if isinstance(message, dict) and message.get("command") == "watch_runs":
+                        daemon.stream_runs(self.request)
+                        return
+                    write_frame(self.request, daemon.handle(message))
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _Handler)
+        self._server.daemon_threads = True
+        logger.info(f"Pump daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.pump_service.scheduler.stop()
+            if self.pump_service.recorder is not None:
+                self.pump_service.recorder.flush()
+            self.pump_service.pump_controller.gpio.cleanup()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def main() -> int:
+    daemon_app = create_db_app()
+    daemon = PumpDaemon(
+        Config.PUMP_SOCKET or DEFAULT_SOCKET_PATH,
+        PumpService(recorder=PumpRunRecorder(daemon_app)),
+        daemon_app,
+    )
+
+    def _stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Pump daemon stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
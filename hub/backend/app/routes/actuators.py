@@ -0,0 +1,77 @@
+from flask import Blueprint, jsonify, request, Response
+from typing import Any, Dict, Optional, Tuple
+from app.exceptions import PumpDaemonError
+from app.routes.controls import pump_service
+
+actuators_bp = Blueprint("actuators", __name__)
+
+@actuators_bp.route("/", methods=["GET"])
+def list_actuators() -> Tuple[Response, int]:
+    """List actuators and their scheduled, waiting or running runs.
+    
+    Query params:
+        - device (str, optional): Only list runs of this actuator
+    
+    Returns:
+        JSON response with actuators and runs or error message.
+    """
+    try:
+        result, error, status_code = pump_service.list_scheduled_runs(request.args.get("device"))
+    except PumpDaemonError:
+        return jsonify({"error": "Pump daemon unavailable"}), 503
+    if error:
+        return jsonify(error), status_code
+    
+    return jsonify(result), status_code
+
+@actuators_bp.route("/<device>/runs", methods=["POST"])
+def schedule_run(device: str) -> Tuple[Response, int]:
+    """Schedule a timed run of an actuator.
+    
+    Args:
+        device: Actuator name, e.g. the pump id, "light" or "fan".
+    
+    Request body:
+        - duration_seconds (number, required): How long the device stays on
+        - delay_seconds (number, optional): Seconds until the first run (default 0)
+        - repeat_every_seconds (number, optional): Period of a repeating schedule
+    
+    Returns:
+        JSON response with the scheduled run or error message.
+    """
+    data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "request body required"}), 400
+    
+    try:
+        result, error, status_code = pump_service.schedule_run(
+            device,
+            data.get("duration_seconds"),
+            data.get("delay_seconds", 0),
+            data.get("repeat_every_seconds"),
+        )
+    except PumpDaemonError:
+        return jsonify({"error": "Pump daemon unavailable"}), 503
+    if error:
+        return jsonify(error), status_code
+    
+    return jsonify(result), status_code
+
+@actuators_bp.route("/runs/<run_id>", methods=["DELETE"])
+def cancel_run(run_id: str) -> Tuple[Response, int]:
+    """Cancel a scheduled run; a device that is on is switched off.
+    
+    Args:
+        run_id: The ID returned when the run was scheduled.
+    
+    Returns:
+        JSON response with the cancelled run or error message.
+    """
+    try:
+        result, error, status_code = pump_service.cancel_scheduled_run(run_id)
+    except PumpDaemonError:
+        return jsonify({"error": "Pump daemon unavailable"}), 503
+    if error:
+        return jsonify(error), status_code
+    
+    return jsonify(result), status_code
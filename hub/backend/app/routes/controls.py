@@ -1,19 +1,72 @@
-from flask import Blueprint, jsonify, Response
+from flask import Blueprint, jsonify, request, Response
 from typing import Tuple
+from app.config import Config
+from app.exceptions import PumpDaemonError
+from app.services.pump_client import PumpClient
+from app.services.pump_run_service import PumpRunRecorder, PumpRunService
 from app.services.pump_service import PumpService
 
 controls_bp = Blueprint("controls", __name__)
-pump_service = PumpService()
+# With a pump daemon configured, only the daemon touches the GPIO pins;
+# otherwise (single-process dev server) the pump is driven in-process
+pump_service = PumpClient(Config.PUMP_SOCKET) if Config.PUMP_SOCKET else PumpService()
+pump_run_service = PumpRunService()
+
+@controls_bp.record_once
+def _attach_run_recorder(state) -> None:
+    """Persist runs of an in-process pump; the daemon records its own."""
+    if isinstance(pump_service, PumpService):
+        pump_service.recorder = PumpRunRecorder(state.app)
 
 @controls_bp.route("/", methods=["POST"])
 def pump() -> Tuple[Response, int]:
-    """Activate the pump.
+    """Queue a pump run.
     
     Returns:
-        JSON response with activation confirmation or error message.
+        JSON response with the queued (or coalesced) run, or error message.
     """
     try:
         response = pump_service.activate_pump()
-        return jsonify(response), 200
+        return jsonify(response), 202
+    except PumpDaemonError:
+        return jsonify({"error": "Pump daemon unavailable"}), 503
     except Exception as e:
-        return jsonify({"error": "Failed to activate pump"}), 500
\ No newline at end of file
+        return jsonify({"error": "Failed to activate pump"}), 500
+
+@controls_bp.route("/runs/<run_id>", methods=["GET"])
+def get_pump_run(run_id: str) -> Tuple[Response, int]:
+    """Get the state of a pump run.
+    
+    Args:
+        run_id: The ID of the pump run.
+    
+    Returns:
+        JSON response with the run state or error message.
+    """
+    try:
+        run = pump_service.get_run(run_id)
+    except PumpDaemonError:
+        return jsonify({"error": "Pump daemon unavailable"}), 503
+    if not run:
+        return jsonify({"error": "pump run not found"}), 404
+    
+    return jsonify(run), 200
+
+@controls_bp.route("/stats", methods=["GET"])
+def pump_stats() -> Tuple[Response, int]:
+    """Get pump run totals per day and per pump.
+    
+    Query params:
+        - from (str, optional): ISO datetime window start (default 30 days before ``to``)
+        - to (str, optional): ISO datetime window end (default now)
+    
+    Returns:
+        JSON response with per-day and per-pump aggregates or error message.
+    """
+    result, error, status_code = pump_run_service.get_stats(
+        request.args.get("from"), request.args.get("to")
+    )
+    if error:
+        return jsonify(error), status_code
+    
+    return jsonify(result), status_code
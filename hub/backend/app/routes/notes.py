@@ -32,6 +32,29 @@ def list_all_notes() -> Tuple[Response, int]:
     return jsonify(result), status_code
 
 
+@notes_bp.route("/notes/due", methods=["GET"])
+def list_due_notes() -> Tuple[Response, int]:
+    result, error, status_code = note_service.list_due_notes(within=request.args.get("within"))
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@notes_bp.route("/notes/bulk", methods=["POST"])
+def bulk_notes() -> Tuple[Response, int]:
+    if not request.is_json:
+        return jsonify({"error": "JSON body required"}), 400
+
+    data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "request body required"}), 400
+
+    result, error, status_code = note_service.bulk_apply(data.get("operations"))
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
 @notes_bp.route("/plants/<int:plant_id>/notes", methods=["POST"])
 def create_note(plant_id: int) -> Tuple[Response, int]:
     content: Optional[str] = None
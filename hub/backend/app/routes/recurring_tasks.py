@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from flask import Blueprint, Response, jsonify, request
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.recurring_task_service import RecurringTaskService
+
+
+recurring_tasks_bp = Blueprint("recurring_tasks", __name__)
+recurring_task_service = RecurringTaskService()
+
+
+@recurring_tasks_bp.route("/plants/<int:plant_id>/tasks", methods=["POST"])
+def create_task(plant_id: int) -> Tuple[Response, int]:
+    data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "request body required"}), 400
+
+    result, error, status_code = recurring_task_service.create_task(
+        plant_id=plant_id,
+        content=data.get("content"),
+        rrule=data.get("rrule"),
+        starts_at_str=data.get("starts_at"),
+    )
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@recurring_tasks_bp.route("/plants/<int:plant_id>/tasks", methods=["GET"])
+def list_tasks(plant_id: int) -> Tuple[Response, int]:
+    result, error, status_code = recurring_task_service.list_tasks(plant_id)
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@recurring_tasks_bp.route("/plants/<int:plant_id>/tasks/<int:task_id>", methods=["DELETE"])
+def delete_task(plant_id: int, task_id: int) -> Tuple[Response, int]:
+    result, error, status_code = recurring_task_service.delete_task(plant_id, task_id)
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@recurring_tasks_bp.route("/plants/<int:plant_id>/tasks/<int:task_id>/complete", methods=["POST"])
+def complete_occurrence(plant_id: int, task_id: int) -> Tuple[Response, int]:
+    data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "request body required"}), 400
+
+    result, error, status_code = recurring_task_service.complete_occurrence(
+        plant_id, task_id, data.get("due_date")
+    )
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@recurring_tasks_bp.route("/tasks/occurrences", methods=["GET"])
+def list_occurrences() -> Tuple[Response, int]:
+    raw_plant_id = request.args.get("plant_id")
+    plant_id: Optional[int] = None
+    if raw_plant_id:
+        try:
+            plant_id = int(raw_plant_id)
+        except ValueError:
+            return jsonify({"error": "plant_id must be an integer"}), 400
+
+    result, error, status_code = recurring_task_service.list_occurrences(
+        window_from=request.args.get("from"),
+        window_to=request.args.get("to"),
+        plant_id=plant_id,
+    )
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from flask import Blueprint, Response, current_app, jsonify, request
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.routes.sensors import latest_reading_service, sensor_health_monitor
+from app.routes.stream import event_broker
+from app.routes.watering import watering_controller
+from app.services.reading_notification_service import ReadingNotificationListener
+from app.services.reading_sequence_service import ReadingSequenceTracker
+from app.services.report_interval_service import ReportIntervalPolicy
+from app.services.sensor_reading_service import SensorReadingService, SensorReadingWriter
+
+
+sensor_data_bp = Blueprint("sensor_data", __name__)
+sensor_reading_service = SensorReadingService()
+sequence_tracker = ReadingSequenceTracker()
+
+
+def _record_forwarded(rows: List[Dict[str, Any]]) -> None:
+    """Readings stored by the ingest listener, handled like posted ones (without watering)."""
+    latest_reading_service.record_many(rows)
+    sensor_health_monitor.record_many(rows)
+    event_broker.publish("readings", sensor_reading_service.latest_per_sensor(rows))
+
+
+reading_notifications = ReadingNotificationListener(_record_forwarded)
+
+
+@sensor_data_bp.record_once
+def _attach_reading_writer(state) -> None:
+    """One buffered writer per app; readings are flushed by its own thread."""
+    state.app.extensions["sensor_reading_writer"] = SensorReadingWriter(state.app)
+
+
+@sensor_data_bp.before_app_request
+def _listen_for_forwarded_readings() -> None:
+    # Started by the first request, so processes that only build the app
+    # (the ingest listener among them) do not listen
+    reading_notifications.start(current_app._get_current_object())
+
+
+def _reading_writer() -> SensorReadingWriter:
+    return current_app.extensions["sensor_reading_writer"]
+
+
+def _next_report_seconds(sensor: str, state: Optional[Dict[str, Any]]) -> int:
+    return ReportIntervalPolicy.next_report_seconds(
+        sensor_health_monitor.rolling_std(sensor), state, watering_controller.rule(sensor)
+    )
+
+
+@sensor_data_bp.route("/data", methods=["POST"])
+def ingest_reading() -> Tuple[Response, int]:
+    """Accept one firmware reading ({"sensor": str, "value": int}).
+
+    The reading is buffered for a batched write and fed to the watering
+    controller; it is not yet in the database when this returns. The
+    response's ``next_report_seconds`` tells the device when to send the
+    next reading. With
+    ``seq`` (and optionally ``boot`` and ``device``, default the sensor) a
+    retried reading is answered with ``{"duplicate": true}`` and dropped.
+    """
+    data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "request body required"}), 400
+
+    sensor = data.get("sensor")
+    value = data.get("value")
+    error = sensor_reading_service.validate_reading(sensor, value)
+    if error:
+        return jsonify({"error": error}), 400
+
+    sensor = sensor.strip()
+    sequence, message = sensor_reading_service.parse_sequence(data, sensor)
+    if message:
+        return jsonify({"error": message}), 400
+    if sequence:
+        _, duplicates = sequence_tracker.filter_new([sequence])
+        if duplicates:
+            next_report = _next_report_seconds(sensor, watering_controller.get_state(sensor))
+            return jsonify({"sensor": sensor, "duplicate": True, "next_report_seconds": next_report}), 200
+
+    recorded_at = datetime.now(timezone.utc)
+    _reading_writer().add(sensor, value, recorded_at)
+    latest_reading_service.record(sensor, value, recorded_at)
+    sensor_health_monitor.record(sensor, value)
+    event_broker.publish("readings", [{"sensor": sensor, "value": value, "recorded_at": recorded_at}])
+    result = watering_controller.observe(sensor, value)
+    result["next_report_seconds"] = _next_report_seconds(sensor, result)
+    return jsonify(result), 202
+
+
+@sensor_data_bp.route("/data/batch", methods=["POST"])
+def ingest_batch() -> Tuple[Response, int]:
+    """Store a batch of timestamped readings in one INSERT.
+
+    Accepts a JSON array of ``[sensor, ts, value]`` or the packed binary
+    format (``Content-Type: application/octet-stream``) described in
+    ``services/sensor_reading_service.py``. Readings of a sequence-numbered
+    batch that were already stored are skipped and counted in ``duplicates``.
+    """
+    received_at = datetime.now(timezone.utc)
+    if request.mimetype == "application/octet-stream":
+        if (request.content_length or 0) > sensor_reading_service.MAX_BINARY_BYTES:
+            return jsonify({"error": "batch too large"}), 413
+        rows, message = sensor_reading_service.parse_binary_batch(request.get_data(cache=False), received_at)
+    else:
+        rows, message = sensor_reading_service.parse_json_batch(request.get_json(silent=True), received_at)
+    if message:
+        return jsonify({"error": message}), 400
+
+    sensors = {row["sensor"] for row in rows}
+    rows, duplicates = sequence_tracker.filter_new(rows)
+    if not rows:
+        # A retried batch still tells the device when to report next
+        next_report = min(_next_report_seconds(sensor, watering_controller.get_state(sensor)) for sensor in sensors)
+        return jsonify({"accepted": 0, "duplicates": duplicates, "next_report_seconds": next_report}), 200
+
+    result, error, status_code = sensor_reading_service.insert_batch(rows)
+    if error:
+        sequence_tracker.release(rows)
+        return jsonify(error), status_code
+    result["duplicates"] = duplicates
+
+    latest_reading_service.record_many(rows)
+    sensor_health_monitor.record_many(rows)
+    event_broker.publish("readings", sensor_reading_service.latest_per_sensor(rows))
+    for sensor, value in sensor_reading_service.fresh_latest(rows, received_at):
+        watering_controller.observe(sensor, value)
+    # A device sends one batch for all its sensors, so it follows the most urgent one
+    result["next_report_seconds"] = min(
+        _next_report_seconds(sensor, watering_controller.get_state(sensor)) for sensor in sensors
+    )
+    return jsonify(result), status_code
+
+
+@sensor_data_bp.route("/data/stats", methods=["GET"])
+def ingest_stats() -> Tuple[Response, int]:
+    """Counters of the buffered reading writer (accepted, written, dropped, ...) and of duplicate detection."""
+    return jsonify({**_reading_writer().stats(), "sequences": sequence_tracker.stats()}), 200
+
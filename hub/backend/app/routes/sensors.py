@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from flask import Blueprint, Response, jsonify, request
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.latest_reading_service import LatestReadingService
+from app.services.sensor_health_service import SensorHealthMonitor
+from app.services.sensor_registry_service import SensorRegistryService
+from app.services.sensor_rollup_service import SensorRollupService
+from app.services.sensor_series_service import SensorSeriesService
+
+
+sensors_bp = Blueprint("sensors", __name__)
+sensor_rollup_service = SensorRollupService()
+sensor_series_service = SensorSeriesService()
+latest_reading_service = LatestReadingService()
+sensor_registry_service = SensorRegistryService()
+sensor_health_monitor = SensorHealthMonitor()
+
+
+def _int_arg(name: str) -> Tuple[Optional[int], Optional[str]]:
+    raw = request.args.get(name)
+    if not raw:
+        return None, None
+    try:
+        return int(raw), None
+    except ValueError:
+        return None, f"{name} must be an integer"
+
+
+@sensors_bp.route("/sensors", methods=["GET"])
+def list_sensors() -> Tuple[Response, int]:
+    """Registered sensors. Query: ``plant_id`` to list one plant's sensors."""
+    plant_id, message = _int_arg("plant_id")
+    if message:
+        return jsonify({"error": message}), 400
+
+    result, error, status_code = sensor_registry_service.list_sensors(plant_id)
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@sensors_bp.route("/sensors/latest", methods=["GET"])
+def get_latest_readings() -> Tuple[Response, int]:
+    """Latest reading per sensor, from memory.
+
+    Query: ``sensor`` (repeatable) to restrict the sensors, ``recent``
+    to include up to that many newest readings per sensor, and ``unit``
+    (``raw`` or ``percent``).
+    """
+    recent, message = _int_arg("recent")
+    if message:
+        return jsonify({"error": message}), 400
+
+    result, error, status_code = latest_reading_service.get_latest(
+        sensors=request.args.getlist("sensor"), recent=recent or 0, unit=request.args.get("unit", "raw")
+    )
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@sensors_bp.route("/sensors/health", methods=["GET"])
+def get_sensor_health() -> Tuple[Response, int]:
+    """Health per sensor: ``ok``, ``stale``, ``out_of_range`` or ``flatline``,
+    with last-seen time, rolling mean/std and spike count.
+
+    Query: ``sensor`` (repeatable) to restrict the sensors.
+    """
+    result, error, status_code = sensor_health_monitor.get_health(request.args.getlist("sensor"))
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@sensors_bp.route("/sensors/<sensor>/rollups", methods=["GET"])
+def get_sensor_rollups(sensor: str) -> Tuple[Response, int]:
+    """Min/max/avg/count per bucket, read from the coarsest rollup that fits.
+
+    Query: ``from``/``to`` (ISO datetimes, default the last day), and either
+    ``resolution`` (bucket seconds) or ``points`` (bucket count, default 500),
+    and ``unit`` (``raw`` or ``percent``).
+    """
+    resolution, message = _int_arg("resolution")
+    if message:
+        return jsonify({"error": message}), 400
+    points, message = _int_arg("points")
+    if message:
+        return jsonify({"error": message}), 400
+
+    result, error, status_code = sensor_rollup_service.get_series(
+        sensor,
+        window_from=request.args.get("from"),
+        window_to=request.args.get("to"),
+        resolution_seconds=resolution,
+        points=points,
+        unit=request.args.get("unit", "raw"),
+    )
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@sensors_bp.route("/sensors/<sensor>/readings", methods=["GET"])
+def get_sensor_readings(sensor: str) -> Tuple[Response, int]:
+    """Raw readings downsampled with LTTB, as parallel ``ts`` and ``value`` arrays.
+
+    Query: ``from``/``to`` (ISO datetimes, default the last day),
+    ``points`` (default 500) and ``unit`` (``raw`` or ``percent``).
+    """
+    points, message = _int_arg("points")
+    if message:
+        return jsonify({"error": message}), 400
+
+    result, error, status_code = sensor_series_service.get_readings(
+        sensor,
+        window_from=request.args.get("from"),
+        window_to=request.args.get("to"),
+        points=points,
+        unit=request.args.get("unit", "raw"),
+    )
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@sensors_bp.route("/sensors/<sensor>", methods=["GET"])
+def get_sensor(sensor: str) -> Tuple[Response, int]:
+    result, error, status_code = sensor_registry_service.get_sensor(sensor)
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@sensors_bp.route("/sensors/<sensor>", methods=["PUT"])
+def put_sensor(sensor: str) -> Tuple[Response, int]:
+    """Register a sensor: ``plant_id``, ``kind`` and ``calibration`` (all optional)."""
+    data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "request body must be an object"}), 400
+
+    result, error, status_code = sensor_registry_service.put_sensor(sensor, data)
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
+
+
+@sensors_bp.route("/sensors/<sensor>", methods=["DELETE"])
+def delete_sensor(sensor: str) -> Tuple[Response, int]:
+    result, error, status_code = sensor_registry_service.delete_sensor(sensor)
+    if error:
+        return jsonify(error), status_code
+    return jsonify(result), status_code
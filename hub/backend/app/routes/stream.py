@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from flask import Blueprint, Response, jsonify, request
+from typing import Any, Dict, Iterator, Tuple, Union
+
+from app.routes.controls import pump_service
+from app.routes.sensors import sensor_health_monitor
+from app.services.event_broker import EventBroker, Subscription
+
+
+stream_bp = Blueprint("stream", __name__)
+event_broker = EventBroker()
+
+KEEPALIVE_SECONDS = 15.0
+# Blueprints whose successful writes are announced as "change" events
+ENTITY_BLUEPRINTS = {
+    "plants": "plant",
+    "photo_histories": "photo_history",
+    "notes": "note",
+    "recurring_tasks": "recurring_task",
+    "watering": "watering_rule",
+    "sensors": "sensor",
+}
+CHANGE_ACTIONS = {"POST": "created", "PUT": "updated", "PATCH": "updated", "DELETE": "deleted"}
+
+
+@stream_bp.record_once
+def _publish_monitor_events(state) -> None:
+    """Forward pump run state changes (in-process or from the pump daemon) and sensor health changes."""
+    pump_service.add_run_listener(lambda run: event_broker.publish("pump_run", run))
+    sensor_health_monitor.add_listener(lambda health: event_broker.publish("sensor_health", health))
+
+
+@stream_bp.after_app_request
+def _publish_entity_change(response: Response) -> Response:
+    entity = ENTITY_BLUEPRINTS.get(request.blueprint or "")
+    action = CHANGE_ACTIONS.get(request.method)
+    if entity is None or action is None or not 200 <= response.status_code < 300:
+        return response
+
+    change: Dict[str, Any] = {"entity": entity, "action": action, "path": request.path, **(request.view_args or {})}
+    body = response.get_json(silent=True) if response.is_json else None
+    if isinstance(body, dict) and "id" in body:
+        change.setdefault("id", body["id"])
+    event_broker.publish("change", change)
+    return response
+
+
+def _events(subscription: Subscription, types: set) -> Iterator[str]:
+    yield f"retry: {int(KEEPALIVE_SECONDS * 1000)}\n\n"
+    while True:
+        event = subscription.get(KEEPALIVE_SECONDS)
+        if event is None:
+            if subscription.dropped:
+                yield "event: dropped\ndata: {}\n\n"
+                return
+            # Comment line: keeps proxies from closing an idle connection
+            yield ": keepalive\n\n"
+            continue
+        event_id, event_type, data = event
+        if not types or event_type in types:
+            yield f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+@stream_bp.route("/stream", methods=["GET"])
+def stream() -> Union[Response, Tuple[Response, int]]:
+    """Server-Sent Events: ``readings``, ``pump_run``, ``sensor_health`` and ``change`` events.
+
+    Query: ``types`` (comma-separated) to receive only some event types.
+    A client that falls too far behind gets a ``dropped`` event and is
+    disconnected; it should reconnect and refetch.
+    """
+    subscription = event_broker.subscribe()
+    if subscription is None:
+        return jsonify({"error": "too many stream clients"}), 503
+
+    types = {name.strip() for name in request.args.get("types", "").split(",") if name.strip()}
+    response = Response(
+        _events(subscription, types),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Runs when the client disconnects, even before the first event
+    response.call_on_close(lambda: event_broker.unsubscribe(subscription))
+    return response
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from flask import Blueprint, Response, jsonify, request
+from typing import Any, Dict, Optional, Tuple
+
+from app.routes.controls import pump_service
+from app.services.pump_client import PumpClient, WateringClient
+from app.services.watering_service import WateringController, WateringRuleService
+
+
+watering_bp = Blueprint("watering", __name__)
+watering_rule_service = WateringRuleService()
+# With a pump daemon the controller runs there, shared with the ingest listener
+watering_controller = WateringClient(pump_service) if isinstance(pump_service, PumpClient) else WateringController(pump_service)
+
+
+@watering_bp.route("/plants/<int:plant_id>/watering", methods=["GET"])
+def get_watering_rule(plant_id: int) -> Tuple[Response, int]:
+    result, error, status_code = watering_rule_service.get_rule(plant_id)
+    if error:
+        return jsonify(error), status_code
+    result["state"] = watering_controller.get_state(result["sensor"])
+    return jsonify(result), status_code
+
+
+@watering_bp.route("/plants/<int:plant_id>/watering", methods=["PUT"])
+def put_watering_rule(plant_id: int) -> Tuple[Response, int]:
+    data: Optional[Dict[str, Any]] = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "request body required"}), 400
+
+    result, error, status_code = watering_rule_service.put_rule(plant_id, data)
+    if error:
+        return jsonify(error), status_code
+    watering_controller.invalidate()
+    return jsonify(result), status_code
+
+
+@watering_bp.route("/plants/<int:plant_id>/watering", methods=["DELETE"])
+def delete_watering_rule(plant_id: int) -> Tuple[Response, int]:
+    result, error, status_code = watering_rule_service.delete_rule(plant_id)
+    if error:
+        return jsonify(error), status_code
+    watering_controller.invalidate()
+    return jsonify(result), status_code
@@ -0,0 +1,85 @@
+"""In-process publish/subscribe for live dashboard events (see ``routes/stream.py``)."""
+import itertools
+import json
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Subscription:
+    """One subscriber's bounded queue of ``(id, type, json_data)`` events."""
+
+    def __init__(self, max_queued: int) -> None:
+        self._queue: "queue.Queue[Tuple[int, str, str]]" = queue.Queue(maxsize=max_queued)
+        self.dropped = False
+
+    def get(self, timeout: float) -> Optional[Tuple[int, str, str]]:
+        """Next event, or None after ``timeout`` seconds without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _offer(self, event: Tuple[int, str, str]) -> bool:
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+
+class EventBroker:
+    """Fans events out to subscribers without ever blocking the publisher.
+
+    Each subscriber has a queue of at most ``max_queued`` events. A
+    subscriber that falls that far behind is dropped, so a slow dashboard
+    costs ingestion nothing; it reconnects and refetches.
+    """
+
+    def __init__(self, max_queued: int = 256, max_subscribers: int = 50) -> None:
+        self.max_queued = max_queued
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscription] = []
+        self._ids = itertools.count(1)
+
+    def subscribe(self) -> Optional[Subscription]:
+        """Register a subscriber, or return None when ``max_subscribers`` are connected."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.max_queued)
+            self._subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(self, event_type: str, data: Any) -> None:
+        """Queue an event for every subscriber. ``data`` is serialized once, here."""
+        with self._lock:
+            if not self._subscribers:
+                return
+            event = (next(self._ids), event_type, json.dumps(data, default=_encode_default))
+            lagging = [subscription for subscription in self._subscribers if not subscription._offer(event)]
+            for subscription in lagging:
+                subscription.dropped = True
+                self._subscribers.remove(subscription)
+        if lagging:
+            logger.warning(f"Dropped {len(lagging)} event subscriber(s) that fell {self.max_queued} events behind")
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
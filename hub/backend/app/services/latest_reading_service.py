@@ -0,0 +1,212 @@
+"""Service for the latest sensor readings, served from memory."""
+import logging
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from app.database import db
+from app.models.sensor_reading_rollups import SensorReadingRollup
+from app.models.sensor_readings import SensorReading
+from app.services.sensor_registry_service import SensorRegistryService
+
+logger = logging.getLogger(__name__)
+
+
+class ReadingRingBuffer:
+    """The last ``capacity`` readings of one sensor, oldest overwritten first.
+
+    Times (Unix seconds) and values live in two preallocated ``array('d')``
+    so appending never allocates.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._ts = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self.size = 0
+
+    def append(self, ts: float, value: float) -> None:
+        self._ts[self._next] = ts
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self.size:
+            return None
+        index = self._next - 1
+        return self._ts[index], self._values[index]
+
+    def recent(self, count: int) -> Tuple[List[float], List[float]]:
+        """Up to ``count`` newest readings, oldest first, as (ts, values)."""
+        count = min(count, self.size)
+        start = (self._next - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._ts[start:start + count].tolist(), self._values[start:start + count].tolist()
+        head = self.capacity - start
+        return (
+            self._ts[start:].tolist() + self._ts[:count - head].tolist(),
+            self._values[start:].tolist() + self._values[:count - head].tolist(),
+        )
+
+
+class LatestReadingService:
+    """Keeps a ring buffer per sensor and answers "latest reading" from it.
+
+    Buffers are fed by the readings this process receives (``/api/data``,
+    ``/api/data/batch`` and those forwarded from the ingest listener) and are
+    then authoritative. Sensors this process has not heard from, e.g.
+    because the app just started, are loaded from the database, at most once
+    per ``DB_REFRESH_SECONDS``. Once every sensor found there is fed by this
+    process, the database is no longer read. The trade-off: a new sensor
+    whose readings only reach another web worker is not listed here until it
+    also reports to this one.
+    """
+
+    CAPACITY = 60
+    DB_REFRESH_SECONDS = 10.0
+    # Sensors silent for longer than this are not listed
+    LOOKBACK = timedelta(days=7)
+
+    def __init__(self, capacity: int = CAPACITY) -> None:
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, ReadingRingBuffer] = {}
+        self._live: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+
+    def record(self, sensor: str, value: float, recorded_at: datetime) -> None:
+        """Append a reading, unless it is older than the newest one buffered.
+
+        A naive ``recorded_at`` is taken as UTC, like the database's timestamps.
+        """
+        if recorded_at.tzinfo is None:
+            recorded_at = recorded_at.replace(tzinfo=timezone.utc)
+        ts = recorded_at.timestamp()
+        with self._lock:
+            buffer = self._buffers.get(sensor)
+            if buffer is None:
+                buffer = self._buffers[sensor] = ReadingRingBuffer(self.capacity)
+            self._live.add(sensor)
+            newest = buffer.latest()
+            if newest is None or ts >= newest[0]:
+                buffer.append(ts, float(value))
+
+    def record_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Append ``{"sensor", "value", "recorded_at"}`` rows, in time order."""
+        for row in sorted(rows, key=lambda row: row["recorded_at"]):
+            self.record(row["sensor"], row["value"], row["recorded_at"])
+
+    def get_latest(
+        self, sensors: Optional[List[str]] = None, recent: int = 0, unit: str = "raw"
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], int]:
+        """Latest reading per sensor, optionally with the ``recent`` newest ones.
+
+        Args:
+            sensors: Restrict to these sensors (default all).
+            recent: Also return up to this many newest readings per sensor,
+                as parallel ``ts``/``value`` lists.
+            unit: "raw" or "percent" (converted with each sensor's calibration).
+
+        Returns:
+            tuple: (list of reading dictionaries sorted by sensor, error_dict, status_code)
+        """
+        if not 0 <= recent <= self.capacity:
+            return None, {"error": f"recent must be between 0 and {self.capacity}"}, 400
+        if unit not in SensorRegistryService.UNITS:
+            return None, {"error": f"unit must be one of {', '.join(SensorRegistryService.UNITS)}"}, 400
+
+        if self._needs_refresh():
+            try:
+                self._load_from_db()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error loading latest sensor readings: {e}", exc_info=True)
+                if self._loaded_at is None:
+                    return None, {"error": "Failed to load latest readings"}, 500
+
+        wanted = set(sensors) if sensors else None
+        result = []
+        with self._lock:
+            for sensor in sorted(self._buffers):
+                buffer = self._buffers[sensor]
+                latest = buffer.latest()
+                if latest is None or (wanted is not None and sensor not in wanted):
+                    continue
+                item: Dict[str, Any] = {
+                    "sensor": sensor,
+                    "value": latest[1],
+                    "recorded_at": datetime.fromtimestamp(latest[0], timezone.utc),
+                }
+                if recent:
+                    ts, values = buffer.recent(recent)
+                    item["recent"] = {"ts": ts, "value": values}
+                result.append(item)
+        if unit == "percent":
+            # Outside the lock: the calibrations may have to be loaded first
+            for item in result:
+                curve = SensorRegistryService.calibration(item["sensor"])
+                item["value"] = round(float(curve.to_percent(item["value"])), 2)
+                if recent:
+                    item["recent"]["value"] = np.round(curve.to_percent(item["recent"]["value"]), 2).tolist()
+        return result, None, 200
+
+    def _needs_refresh(self) -> bool:
+        with self._lock:
+            if self._loaded_at is None:
+                return True
+            # Every sensor of the last load is fed here; the database has nothing newer
+            if self._live.issuperset(self._buffers):
+                return False
+            return time.monotonic() - self._loaded_at >= self.DB_REFRESH_SECONDS
+
+    def _load_from_db(self) -> None:
+        """Reload the sensors not fed by this process: their newest rows, one query."""
+        cutoff = datetime.now(timezone.utc) - self.LOOKBACK
+        with self._lock:
+            live = list(self._live)
+
+        rollups = SensorReadingRollup.__table__
+        readings = SensorReading.__table__
+        # The daily rollups list recent sensors without scanning the readings
+        sensors = (
+            db.select(rollups.c.sensor)
+            .where(
+                rollups.c.resolution_seconds == 86400,
+                rollups.c.bucket_start >= cutoff - timedelta(days=1),
+                rollups.c.sensor.not_in(live),
+            )
+            .distinct()
+            .subquery()
+        )
+        newest = (
+            db.select(readings.c.recorded_at, readings.c.value)
+            .where(readings.c.sensor == sensors.c.sensor, readings.c.recorded_at >= cutoff)
+            .order_by(readings.c.recorded_at.desc())
+            .limit(self.capacity)
+            .lateral()
+        )
+        rows = db.session.execute(
+            db.select(sensors.c.sensor, newest.c.recorded_at, newest.c.value)
+            .select_from(sensors.join(newest, db.true()))
+            .order_by(sensors.c.sensor, newest.c.recorded_at)
+        ).all()
+
+        loaded: Dict[str, ReadingRingBuffer] = {}
+        for sensor, recorded_at, value in rows:
+            buffer = loaded.get(sensor)
+            if buffer is None:
+                buffer = loaded[sensor] = ReadingRingBuffer(self.capacity)
+            buffer.append(recorded_at.replace(tzinfo=timezone.utc).timestamp(), value)
+        with self._lock:
+            for sensor in list(self._buffers):
+                if sensor not in self._live and sensor not in loaded:
+                    del self._buffers[sensor]
+            for sensor, buffer in loaded.items():
+                # A sensor may have gone live while the query ran
+                if sensor not in self._live:
+                    self._buffers[sensor] = buffer
+            self._loaded_at = time.monotonic()
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
+import re
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 from werkzeug.datastructures import FileStorage
@@ -11,6 +12,7 @@ from werkzeug.datastructures import FileStorage
 from app.database import db
 from app.models.notes import Note
 from app.models.photo_histories import PhotoHistory
+from app.models.plants import Plants
 from app.services.photo_history_service import PhotoHistoryService
 from app.services.plant_service import PlantService
 
@@ -21,6 +23,13 @@ class NoteService:
     """Service class for note operations."""
 
     UTC_TIMEZONE_OFFSET = "+00:00"
+    MAX_BULK_OPERATIONS = 500
+    DEFAULT_DUE_WINDOW = "7d"
+    MAX_DUE_WINDOW = timedelta(days=366)
+    # A bounded digit count keeps timedelta from overflowing before MAX_DUE_WINDOW is checked
+    WINDOW_PATTERN = re.compile(r"^(\d{1,4})([hdw])$")
+    WINDOW_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+    BULK_OPERATIONS = ("create", "complete", "reschedule", "delete")
 
     @staticmethod
     def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
@@ -40,10 +49,39 @@ class NoteService:
             return None
 
     @staticmethod
-    def _get_photo_history_for_plant(
-        plant_id: int, photo_history_id: int
-    ) -> Optional[PhotoHistory]:
-        return PhotoHistory.query.filter_by(id=photo_history_id, plant_id=plant_id).first()
+    def _parse_window(value: Optional[str]) -> Optional[timedelta]:
+        """Parse a window such as ``12h``, ``7d`` or ``2w`` into a timedelta."""
+        if not isinstance(value, str):
+            return None
+        match = NoteService.WINDOW_PATTERN.match(value.strip().lower())
+        if not match:
+            return None
+        amount, unit = match.groups()
+        return timedelta(**{NoteService.WINDOW_UNITS[unit]: int(amount)})
+
+    @staticmethod
+    def _photo_belongs_to_plant(plant_id: int, photo_history_id: int) -> Any:
+        return db.exists().where(
+            PhotoHistory.id == photo_history_id, PhotoHistory.plant_id == plant_id
+        )
+
+    @staticmethod
+    def _note_filters(
+        created_from_dt: Optional[datetime],
+        created_to_dt: Optional[datetime],
+        due_from_dt: Optional[datetime],
+        due_to_dt: Optional[datetime],
+    ) -> List[Any]:
+        filters: List[Any] = []
+        if created_from_dt is not None:
+            filters.append(Note.created_at >= created_from_dt)
+        if created_to_dt is not None:
+            filters.append(Note.created_at <= created_to_dt)
+        if due_from_dt is not None:
+            filters.append(Note.due_date >= due_from_dt)
+        if due_to_dt is not None:
+            filters.append(Note.due_date <= due_to_dt)
+        return filters
 
     @staticmethod
     def create_note(
@@ -54,10 +92,6 @@ class NoteService:
         image: Optional[FileStorage] = None,
         image_date_str: Optional[str] = None,
     ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-
         if not content or not isinstance(content, str) or not content.strip():
             return None, {"error": "content is required"}, 400
 
@@ -65,15 +99,11 @@ class NoteService:
         if due_date_str and due_date is None:
             return None, {"error": "due_date must be an ISO datetime string"}, 400
 
-        resolved_photo_history_id: Optional[int] = None
-        if photo_history_id is not None:
-            if not isinstance(photo_history_id, int):
-                return None, {"error": "photo_history_id must be an integer"}, 400
-            photo = NoteService._get_photo_history_for_plant(plant_id, photo_history_id)
-            if not photo:
-                return None, {"error": "photo history not found"}, 404
-            resolved_photo_history_id = photo.id
+        if photo_history_id is not None and not isinstance(photo_history_id, int):
+            return None, {"error": "photo_history_id must be an integer"}, 400
 
+        resolved_photo_history_id: Optional[int] = None
+        photo_check = None
         if image is not None and image.filename:
             created_photo, error, status = PhotoHistoryService.create_photo_history(
                 plant_id, image, image_date_str
@@ -81,17 +111,38 @@ class NoteService:
             if error:
                 return None, error, status
             resolved_photo_history_id = created_photo["id"]
+        elif photo_history_id is not None:
+            resolved_photo_history_id = photo_history_id
+            photo_check = NoteService._photo_belongs_to_plant(plant_id, photo_history_id)
 
         try:
-            note = Note(
-                plant_id=plant_id,
-                photo_history_id=resolved_photo_history_id,
-                content=content.strip(),
-                due_date=due_date,
+            source = db.select(
+                Plants.id,
+                db.literal(resolved_photo_history_id, Note.photo_history_id.type),
+                db.literal(content.strip(), Note.content.type),
+                db.literal(due_date, Note.due_date.type),
+            ).where(Plants.id == plant_id)
+            extra_columns = []
+            if photo_check is not None:
+                source = source.where(photo_check)
+                extra_columns.append(photo_check.label("photo_found"))
+
+            row = PlantService.execute_for_plant(
+                plant_id,
+                db.insert(Note.__table__)
+                .from_select(["plant_id", "photo_history_id", "content", "due_date"], source)
+                .returning(*Note.__table__.c),
+                Note,
+                *extra_columns,
             )
-            db.session.add(note)
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+            if photo_check is not None and not row.photo_found:
+                return None, {"error": "photo history not found"}, 404
+
+            note_dict = row[1].to_dict()
             db.session.commit()
-            return note.to_dict(), None, 201
+            return note_dict, None, 201
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error creating note for plant {plant_id}: {e}", exc_info=True)
@@ -105,10 +156,6 @@ class NoteService:
         due_from: Optional[str] = None,
         due_to: Optional[str] = None,
     ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], int]:
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-
         created_from_dt = NoteService._parse_iso_datetime(created_from)
         created_to_dt = NoteService._parse_iso_datetime(created_to)
         due_from_dt = NoteService._parse_iso_datetime(due_from)
@@ -123,19 +170,19 @@ class NoteService:
         if due_to and due_to_dt is None:
             return None, {"error": "due_to must be an ISO datetime string"}, 400
 
-        q = Note.query.filter_by(plant_id=plant_id)
-
-        if created_from_dt is not None:
-            q = q.filter(Note.created_at >= created_from_dt)
-        if created_to_dt is not None:
-            q = q.filter(Note.created_at <= created_to_dt)
-        if due_from_dt is not None:
-            q = q.filter(Note.due_date >= due_from_dt)
-        if due_to_dt is not None:
-            q = q.filter(Note.due_date <= due_to_dt)
-
-        notes = q.order_by(Note.created_at.desc()).all()
-        return [n.to_dict() for n in notes], None, 200
+        # Outer join from the plant so a missing plant (no rows) can be told
+        # apart from a plant without matching notes (one row with no note).
+        filters = NoteService._note_filters(created_from_dt, created_to_dt, due_from_dt, due_to_dt)
+        rows = (
+            db.session.query(Plants.id, Note)
+            .outerjoin(Note, db.and_(Note.plant_id == Plants.id, *filters))
+            .filter(Plants.id == plant_id)
+            .order_by(Note.created_at.desc())
+            .all()
+        )
+        if not rows:
+            return None, {"error": "plant not found"}, 404
+        return [note.to_dict() for _, note in rows if note is not None], None, 200
 
     @staticmethod
     def list_all_notes(
@@ -159,22 +206,63 @@ class NoteService:
         if due_to and due_to_dt is None:
             return None, {"error": "due_to must be an ISO datetime string"}, 400
 
-        q = Note.query
+        q = Note.query.filter(
+            *NoteService._note_filters(created_from_dt, created_to_dt, due_from_dt, due_to_dt)
+        )
         if plant_id is not None:
             q = q.filter(Note.plant_id == plant_id)
 
-        if created_from_dt is not None:
-            q = q.filter(Note.created_at >= created_from_dt)
-        if created_to_dt is not None:
-            q = q.filter(Note.created_at <= created_to_dt)
-        if due_from_dt is not None:
-            q = q.filter(Note.due_date >= due_from_dt)
-        if due_to_dt is not None:
-            q = q.filter(Note.due_date <= due_to_dt)
-
         notes = q.order_by(Note.created_at.desc()).all()
         return [n.to_dict() for n in notes], None, 200
 
+    @staticmethod
+    def list_due_notes(
+        within: Optional[str] = None,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], int]:
+        """List incomplete notes due within a window, across every plant.
+
+        Overdue notes are included, since they still need doing. Each note
+        carries its plant's nickname and the id of the plant's most recent
+        photo so the home screen task list needs no further requests.
+
+        Args:
+            within: Window such as ``12h``, ``7d`` or ``2w`` (default ``7d``).
+
+        Returns:
+            tuple: (list of note dictionaries, error_dict, status_code)
+        """
+        window = NoteService._parse_window(within or NoteService.DEFAULT_DUE_WINDOW)
+        if window is None:
+            return None, {"error": "within must look like 12h, 7d or 2w"}, 400
+        if window > NoteService.MAX_DUE_WINDOW:
+            return None, {"error": "within must be at most 366d"}, 400
+
+        cover_photo_id = (
+            db.select(PhotoHistory.id)
+            .where(PhotoHistory.plant_id == Plants.id)
+            .order_by(PhotoHistory.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        # completed_at IS NULL plus a due_date range matches the partial
+        # index ix_notes_due_date_incomplete.
+        rows = (
+            db.session.query(Note, Plants.nickname, cover_photo_id.label("cover_photo_id"))
+            .join(Plants, Plants.id == Note.plant_id)
+            .filter(Note.completed_at.is_(None))
+            .filter(Note.due_date <= datetime.now(timezone.utc) + window)
+            .order_by(Note.due_date.asc())
+            .all()
+        )
+
+        notes: List[Dict[str, Any]] = []
+        for note, nickname, photo_id in rows:
+            note_dict = note.to_dict()
+            note_dict["plant_nickname"] = nickname
+            note_dict["cover_photo_id"] = photo_id
+            notes.append(note_dict)
+        return notes, None, 200
+
     @staticmethod
     def update_note(
         plant_id: int,
@@ -187,45 +275,63 @@ class NoteService:
         complete: bool = False,
         clear_completed_at: bool = False,
     ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-
-        note = Note.query.filter_by(id=note_id, plant_id=plant_id).first()
-        if not note:
-            return None, {"error": "note not found"}, 404
+        values: Dict[str, Any] = {}
 
         if content is not None:
             if not isinstance(content, str) or not content.strip():
                 return None, {"error": "content must be a non-empty string"}, 400
-            note.content = content.strip()
+            values["content"] = content.strip()
 
         if clear_due_date:
-            note.due_date = None
+            values["due_date"] = None
         elif due_date_str is not None:
             due_date = NoteService._parse_iso_datetime(due_date_str)
             if due_date is None:
                 return None, {"error": "due_date must be an ISO datetime string"}, 400
-            note.due_date = due_date
+            values["due_date"] = due_date
 
+        photo_check = None
         if clear_photo:
-            note.photo_history_id = None
+            values["photo_history_id"] = None
         elif photo_history_id is not None:
             if not isinstance(photo_history_id, int):
                 return None, {"error": "photo_history_id must be an integer"}, 400
-            photo = NoteService._get_photo_history_for_plant(plant_id, photo_history_id)
-            if not photo:
-                return None, {"error": "photo history not found"}, 404
-            note.photo_history_id = photo.id
+            values["photo_history_id"] = photo_history_id
+            photo_check = NoteService._photo_belongs_to_plant(plant_id, photo_history_id)
 
         if clear_completed_at:
-            note.completed_at = None
+            values["completed_at"] = None
         elif complete is True:
-            note.completed_at = datetime.now(timezone.utc)
+            values["completed_at"] = datetime.now(timezone.utc)
+
+        notes = Note.__table__
+        ownership = (notes.c.id == note_id, notes.c.plant_id == plant_id)
+        extra_columns = []
+        if not values:
+            statement = db.select(notes).where(*ownership)
+        else:
+            statement = db.update(notes).where(*ownership)
+            if photo_check is not None:
+                statement = statement.where(photo_check)
+                extra_columns = [
+                    photo_check.label("photo_found"),
+                    db.exists().where(*ownership).label("note_found"),
+                ]
+            statement = statement.values(**values).returning(*notes.c)
 
         try:
+            row = PlantService.execute_for_plant(plant_id, statement, Note, *extra_columns)
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+            note = row[1]
+            if note is None:
+                if photo_check is not None and row.note_found and not row.photo_found:
+                    return None, {"error": "photo history not found"}, 404
+                return None, {"error": "note not found"}, 404
+
+            note_dict = note.to_dict()
             db.session.commit()
-            return note.to_dict(), None, 200
+            return note_dict, None, 200
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error updating note {note_id} for plant {plant_id}: {e}", exc_info=True)
@@ -235,16 +341,20 @@ class NoteService:
     def delete_note(
         plant_id: int, note_id: int
     ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-
-        note = Note.query.filter_by(id=note_id, plant_id=plant_id).first()
-        if not note:
-            return None, {"error": "note not found"}, 404
-
+        notes = Note.__table__
         try:
-            db.session.delete(note)
+            row = PlantService.execute_for_plant(
+                plant_id,
+                db.delete(notes)
+                .where(notes.c.id == note_id, notes.c.plant_id == plant_id)
+                .returning(*notes.c),
+                Note,
+            )
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+            if row[1] is None:
+                return None, {"error": "note not found"}, 404
+
             db.session.commit()
             return {"message": "Note deleted successfully"}, None, 200
         except Exception as e:
@@ -252,16 +362,214 @@ class NoteService:
             logger.error(f"Error deleting note {note_id} for plant {plant_id}: {e}", exc_info=True)
             return None, {"error": "Failed to delete note"}, 500
 
+    @staticmethod
+    def _validate_bulk_operation(
+        index: int, operation: Any
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Normalize a single bulk operation.
+
+        Returns:
+            tuple: (operation_dict, None) when valid, (None, result_dict) otherwise.
+        """
+
+        def invalid(message: str) -> Tuple[None, Dict[str, Any]]:
+            return None, {"index": index, "status": 400, "error": message}
+
+        if not isinstance(operation, dict):
+            return invalid("operation must be an object")
+
+        op = operation.get("op")
+        if op not in NoteService.BULK_OPERATIONS:
+            return invalid(f"op must be one of: {', '.join(NoteService.BULK_OPERATIONS)}")
+
+        plant_id = operation.get("plant_id")
+        if not isinstance(plant_id, int) or isinstance(plant_id, bool):
+            return invalid("plant_id must be an integer")
+
+        normalized: Dict[str, Any] = {"index": index, "op": op, "plant_id": plant_id}
+
+        if op == "create":
+            content = operation.get("content")
+            if not isinstance(content, str) or not content.strip():
+                return invalid("content is required")
+            normalized["content"] = content.strip()
+
+            due_date_str = operation.get("due_date")
+            due_date = NoteService._parse_iso_datetime(due_date_str) if due_date_str else None
+            if due_date_str and due_date is None:
+                return invalid("due_date must be an ISO datetime string")
+            normalized["due_date"] = due_date
+            return normalized, None
+
+        note_id = operation.get("note_id")
+        if not isinstance(note_id, int) or isinstance(note_id, bool):
+            return invalid("note_id must be an integer")
+        normalized["note_id"] = note_id
+
+        if op == "reschedule":
+            due_date = NoteService._parse_iso_datetime(operation.get("due_date"))
+            if due_date is None:
+                return invalid("due_date must be an ISO datetime string")
+            normalized["due_date"] = due_date
+
+        return normalized, None
+
+    @staticmethod
+    def _bulk_create(ops: List[Dict[str, Any]], results: Dict[int, Dict[str, Any]]) -> None:
+        if not ops:
+            return
+        notes = db.session.scalars(
+            db.insert(Note).returning(Note, sort_by_parameter_order=True),
+            [
+                {"plant_id": op["plant_id"], "content": op["content"], "due_date": op["due_date"]}
+                for op in ops
+            ],
+        ).all()
+        for op, note in zip(ops, notes):
+            results[op["index"]] = {"index": op["index"], "status": 201, "note": note.to_dict()}
+
+    @staticmethod
+    def _bulk_update(
+        ops: List[Dict[str, Any]], values: Dict[str, Any], results: Dict[int, Dict[str, Any]]
+    ) -> None:
+        if not ops:
+            return
+        pairs = [(op["note_id"], op["plant_id"]) for op in ops]
+        notes = db.session.scalars(
+            db.update(Note)
+            .where(db.tuple_(Note.id, Note.plant_id).in_(pairs))
+            .values(**values)
+            .returning(Note),
+            execution_options={"synchronize_session": False},
+        ).all()
+        updated = {note.id: note.to_dict() for note in notes}
+        for op in ops:
+            note_dict = updated.get(op["note_id"])
+            if note_dict is None:
+                results[op["index"]] = {"index": op["index"], "status": 404, "error": "note not found"}
+            else:
+                results[op["index"]] = {"index": op["index"], "status": 200, "note": note_dict}
+
+    @staticmethod
+    def _bulk_delete(ops: List[Dict[str, Any]], results: Dict[int, Dict[str, Any]]) -> None:
+        if not ops:
+            return
+        pairs = [(op["note_id"], op["plant_id"]) for op in ops]
+        deleted_ids = set(
+            db.session.scalars(
+                db.delete(Note)
+                .where(db.tuple_(Note.id, Note.plant_id).in_(pairs))
+                .returning(Note.id),
+                execution_options={"synchronize_session": False},
+            )
+        )
+        for op in ops:
+            if op["note_id"] in deleted_ids:
+                results[op["index"]] = {"index": op["index"], "status": 200, "note_id": op["note_id"]}
+            else:
+                results[op["index"]] = {"index": op["index"], "status": 404, "error": "note not found"}
+
+    @staticmethod
+    def bulk_apply(
+        operations: Any,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Apply a batch of note operations in a single transaction.
+
+        Each operation is an object with an ``op`` of create, complete,
+        reschedule or delete. Operations of the same kind are applied together
+        with one set-based INSERT/UPDATE/DELETE statement, so the cost of a
+        batch does not grow by a round trip per note.
+
+        Args:
+            operations: List of operation dictionaries.
+
+        Returns:
+            tuple: (result_dict, error_dict, status_code)
+                   If successful: ({"results": [...]}, None, 200) where each
+                   result carries the operation index and its own status.
+                   If error: (None, error_dict, error_code)
+        """
+        if not isinstance(operations, list) or not operations:
+            return None, {"error": "operations must be a non-empty list"}, 400
+        if len(operations) > NoteService.MAX_BULK_OPERATIONS:
+            return None, {
+                "error": f"at most {NoteService.MAX_BULK_OPERATIONS} operations are allowed"
+            }, 400
+
+        results: Dict[int, Dict[str, Any]] = {}
+        valid_ops: List[Dict[str, Any]] = []
+        seen_note_ids = set()
+        for index, raw_operation in enumerate(operations):
+            op, invalid_result = NoteService._validate_bulk_operation(index, raw_operation)
+            if invalid_result:
+                results[index] = invalid_result
+                continue
+            if "note_id" in op:
+                # Operations of one kind run together, so a note touched twice
+                # would have an ambiguous outcome.
+                if op["note_id"] in seen_note_ids:
+                    results[index] = {
+                        "index": index,
+                        "status": 400,
+                        "error": "note_id appears in more than one operation",
+                    }
+                    continue
+                seen_note_ids.add(op["note_id"])
+            valid_ops.append(op)
+
+        try:
+            plant_ids = {op["plant_id"] for op in valid_ops}
+            existing_plant_ids = (
+                set(db.session.scalars(db.select(Plants.id).where(Plants.id.in_(plant_ids))))
+                if plant_ids
+                else set()
+            )
+
+            ops_by_kind: Dict[str, List[Dict[str, Any]]] = {
+                kind: [] for kind in NoteService.BULK_OPERATIONS
+            }
+            for op in valid_ops:
+                if op["plant_id"] not in existing_plant_ids:
+                    results[op["index"]] = {
+                        "index": op["index"],
+                        "status": 404,
+                        "error": "plant not found",
+                    }
+                else:
+                    ops_by_kind[op["op"]].append(op)
+
+            NoteService._bulk_create(ops_by_kind["create"], results)
+            NoteService._bulk_update(
+                ops_by_kind["complete"], {"completed_at": datetime.now(timezone.utc)}, results
+            )
+            reschedule_ops = ops_by_kind["reschedule"]
+            if reschedule_ops:
+                NoteService._bulk_update(
+                    reschedule_ops,
+                    {
+                        "due_date": db.case(
+                            {op["note_id"]: op["due_date"] for op in reschedule_ops},
+                            value=Note.id,
+                        )
+                    },
+                    results,
+                )
+            NoteService._bulk_delete(ops_by_kind["delete"], results)
+
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error applying bulk note operations: {e}", exc_info=True)
+            return None, {"error": "Failed to apply note operations"}, 500
+
+        return {"results": [results[index] for index in range(len(operations))]}, None, 200
+
     @staticmethod
     def get_timeline(
         plant_id: int,
         created_from: Optional[str] = None,
         created_to: Optional[str] = None,
     ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], int]:
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-
         created_from_dt = NoteService._parse_iso_datetime(created_from)
         created_to_dt = NoteService._parse_iso_datetime(created_to)
         if created_from and created_from_dt is None:
@@ -269,20 +577,29 @@ class NoteService:
         if created_to and created_to_dt is None:
             return None, {"error": "created_to must be an ISO datetime string"}, 400
 
-        photos_q = PhotoHistory.query.filter_by(plant_id=plant_id)
+        photo_filters = [PhotoHistory.plant_id == Plants.id]
         if created_from_dt is not None:
-            photos_q = photos_q.filter(PhotoHistory.created_at >= created_from_dt)
+            photo_filters.append(PhotoHistory.created_at >= created_from_dt)
         if created_to_dt is not None:
-            photos_q = photos_q.filter(PhotoHistory.created_at <= created_to_dt)
-        photos = photos_q.order_by(PhotoHistory.created_at.desc()).all()
+            photo_filters.append(PhotoHistory.created_at <= created_to_dt)
+        photo_rows = (
+            db.session.query(Plants.id, PhotoHistory)
+            .outerjoin(PhotoHistory, db.and_(*photo_filters))
+            .filter(Plants.id == plant_id)
+            .order_by(PhotoHistory.created_at.desc())
+            .all()
+        )
+        if not photo_rows:
+            return None, {"error": "plant not found"}, 404
+        photos = [photo for _, photo in photo_rows if photo is not None]
         photo_ids = {p.id for p in photos}
 
-        notes_q = Note.query.filter_by(plant_id=plant_id)
-        if created_from_dt is not None:
-            notes_q = notes_q.filter(Note.created_at >= created_from_dt)
-        if created_to_dt is not None:
-            notes_q = notes_q.filter(Note.created_at <= created_to_dt)
-        notes = notes_q.order_by(Note.created_at.desc()).all()
+        notes = (
+            Note.query.filter_by(plant_id=plant_id)
+            .filter(*NoteService._note_filters(created_from_dt, created_to_dt, None, None))
+            .order_by(Note.created_at.desc())
+            .all()
+        )
 
         notes_by_photo_id: Dict[int, List[Dict[str, Any]]] = {}
         standalone_notes: List[Dict[str, Any]] = []
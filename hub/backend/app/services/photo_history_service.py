@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from werkzeug.datastructures import FileStorage
 from app.database import db
 from app.models.photo_histories import PhotoHistory
+from app.models.plants import Plants
 from app.services.plant_service import PlantService
 from app.exceptions import PlantNotFoundError, PhotoHistoryNotFoundError, InvalidFileTypeError
 
@@ -218,11 +219,6 @@ class PhotoHistoryService:
                    If successful: (dict, None, 201)
                    If error: (None, error_dict, error_code)
         """
-        # Check if plant exists
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-        
         # Validate file
         if not file or file.filename == '':
             return None, {"error": "no file selected"}, 400
@@ -261,16 +257,32 @@ class PhotoHistoryService:
             else:
                 created_at = PhotoHistoryService._extract_date_from_file(file_path)
             
-            # Create database record
-            photo_history = PhotoHistory(
-                plant_id=plant_id,
-                image_location=relative_path,
-                created_at=created_at
+            # Create database record; selecting from plants makes the insert
+            # double as the existence check
+            photo_histories = PhotoHistory.__table__
+            row = PlantService.execute_for_plant(
+                plant_id,
+                db.insert(photo_histories)
+                .from_select(
+                    ["plant_id", "image_location", "created_at"],
+                    db.select(
+                        Plants.id,
+                        db.literal(relative_path, PhotoHistory.image_location.type),
+                        db.literal(created_at, PhotoHistory.created_at.type),
+                    ).where(Plants.id == plant_id),
+                )
+                .returning(*photo_histories.c),
+                PhotoHistory,
             )
-            db.session.add(photo_history)
+            if row is None:
+                db.session.rollback()
+                os.remove(file_path)
+                return None, {"error": "plant not found"}, 404
+
+            photo_history_dict = row[1].to_dict()
             db.session.commit()
             logger.info(f"Created photo history for plant {plant_id}: {unique_filename}")
-            return photo_history.to_dict(), None, 201
+            return photo_history_dict, None, 201
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error creating photo history for plant {plant_id}: {e}", exc_info=True)
@@ -290,17 +302,18 @@ class PhotoHistoryService:
                    If successful: (list, None, 200)
                    If error: (None, error_dict, error_code)
         """
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-        
-        photo_histories = (
-            PhotoHistory.query
-            .filter_by(plant_id=plant_id)
+        # Outer join from the plant: no rows means the plant does not exist
+        rows = (
+            db.session.query(Plants.id, PhotoHistory)
+            .outerjoin(PhotoHistory, PhotoHistory.plant_id == Plants.id)
+            .filter(Plants.id == plant_id)
             .order_by(PhotoHistory.created_at.desc())
             .all()
         )
-        return [ph.to_dict() for ph in photo_histories], None, 200
+        if not rows:
+            return None, {"error": "plant not found"}, 404
+        
+        return [ph.to_dict() for _, ph in rows if ph is not None], None, 200
     
     @staticmethod
     def get_photo_history_image(
@@ -318,14 +331,21 @@ class PhotoHistoryService:
                    If successful: (file_path, mimetype, None, 200)
                    If error: (None, None, error_dict, error_code)
         """
-        # Check if plant exists
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
+        # Check plant existence and photo ownership in one query
+        row = (
+            db.session.query(Plants.id, PhotoHistory)
+            .outerjoin(
+                PhotoHistory,
+                db.and_(PhotoHistory.plant_id == Plants.id, PhotoHistory.id == photo_id),
+            )
+            .filter(Plants.id == plant_id)
+            .first()
+        )
+        if row is None:
             return None, None, {"error": "plant not found"}, 404
         
-        # Check if photo history exists and belongs to the plant
-        photo_history = PhotoHistory.query.filter_by(id=photo_id, plant_id=plant_id).first()
-        if not photo_history:
+        photo_history = row[1]
+        if photo_history is None:
             return None, None, {"error": "photo history not found"}, 404
         
         # Construct absolute path to the image file
@@ -359,23 +379,27 @@ class PhotoHistoryService:
                    If successful: ({"message": "deleted"}, None, 200)
                    If error: (None, error_dict, error_code)
         """
-        # Check if plant exists
-        plant = PlantService.get_plant_model_by_id(plant_id)
-        if not plant:
-            return None, {"error": "plant not found"}, 404
-        
-        # Check if photo history exists and belongs to the plant
-        photo_history = PhotoHistory.query.filter_by(id=photo_id, plant_id=plant_id).first()
-        if not photo_history:
-            return None, {"error": "photo history not found"}, 404
-        
         try:
+            # Delete from database first; the plant join tells a missing plant
+            # apart from a photo that is missing or owned by another plant
+            photo_histories = PhotoHistory.__table__
+            row = PlantService.execute_for_plant(
+                plant_id,
+                db.delete(photo_histories)
+                .where(photo_histories.c.id == photo_id, photo_histories.c.plant_id == plant_id)
+                .returning(*photo_histories.c),
+                PhotoHistory,
+            )
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+            
+            photo_history = row[1]
+            if photo_history is None:
+                return None, {"error": "photo history not found"}, 404
+            
             # Construct absolute path to the image file
             backend_dir = PhotoHistoryService._get_backend_directory()
             image_path = os.path.join(backend_dir, photo_history.image_location)
-            
-            # Delete from database first
-            db.session.delete(photo_history)
             db.session.commit()
             
             # Delete file if it exists
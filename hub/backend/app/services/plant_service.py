@@ -1,6 +1,7 @@
 """Service for plant-related business logic."""
 import logging
 from typing import Optional, Dict, Any, Tuple, List
+from sqlalchemy.engine import Row
 from app.database import db
 from app.models.plants import Plants
 from app.models.photo_histories import PhotoHistory
@@ -76,12 +77,16 @@ class PlantService:
             .all()
         )
 
+        # Lazy import to avoid circular dependency (the forecast reads rollups via NoteService)
+        from app.services.watering_forecast_service import WateringForecastService
+
         plants: List[Dict[str, Any]] = []
         for plant, next_due_date, last_photo_at, incomplete_note_count in rows:
             plant_dict = plant.to_dict()
             plant_dict["next_due_date"] = next_due_date
             plant_dict["last_photo_at"] = last_photo_at
             plant_dict["has_incomplete_notes"] = bool((incomplete_note_count or 0) > 0)
+            plant_dict["next_water_at"] = WateringForecastService.next_water_at(plant.id)
             plants.append(plant_dict)
 
         return plants, len(plants)
@@ -97,7 +102,13 @@ class PlantService:
             dict: Plant dictionary if found, None otherwise.
         """
         plant = Plants.query.get(plant_id)
-        return plant.to_dict() if plant else None
+        if not plant:
+            return None
+        from app.services.watering_forecast_service import WateringForecastService
+
+        plant_dict = plant.to_dict()
+        plant_dict["next_water_at"] = WateringForecastService.next_water_at(plant_id)
+        return plant_dict
     
     @staticmethod
     def get_plant_model_by_id(plant_id: int) -> Optional[Plants]:
@@ -111,6 +122,36 @@ class PlantService:
         """
         return Plants.query.get(plant_id)
     
+    @staticmethod
+    def execute_for_plant(
+        plant_id: int, statement: Any, entity: type, *extra_columns: Any
+    ) -> Optional[Row]:
+        """Run a single-row statement together with the plant existence check.
+
+        The statement (typically an INSERT/UPDATE/DELETE ... RETURNING of every
+        column of ``entity``, or a SELECT of them) is wrapped in a CTE and
+        outer-joined to the plant row, so existence and ownership are resolved
+        in one round trip.
+
+        Args:
+            plant_id: The ID of the plant that owns the affected row.
+            statement: Statement yielding at most one row of ``entity`` columns.
+            entity: Model class the statement's rows are loaded as.
+            *extra_columns: Additional labelled columns to select, e.g. EXISTS flags.
+
+        Returns:
+            Row: None if the plant does not exist. Otherwise a row where
+                 ``row[1]`` is the affected ``entity`` instance (None if the
+                 statement matched nothing) followed by ``extra_columns``.
+        """
+        affected = db.aliased(entity, statement.cte())
+        return db.session.execute(
+            db.select(Plants.id, affected, *extra_columns)
+            .select_from(Plants)
+            .outerjoin(affected, db.true())
+            .where(Plants.id == plant_id)
+        ).first()
+
     @staticmethod
     def create_plant(nickname: str, species: str) -> Dict[str, Any]:
         """Create a new plant.
@@ -126,11 +167,17 @@ class PlantService:
             Exception: If database operation fails.
         """
         try:
-            new_plant = Plants(nickname=nickname, species=species)
-            db.session.add(new_plant)
+            # INSERT ... RETURNING loads the row in the same round trip, and the
+            # response is built before commit so nothing is re-selected afterwards
+            new_plant = db.session.scalar(
+                db.insert(Plants).values(nickname=nickname, species=species).returning(Plants)
+            )
+            plant_dict = new_plant.to_dict(photo_histories=[])
+            # A new plant has no watering rule, so nothing to forecast yet
+            plant_dict["next_water_at"] = None
             db.session.commit()
             logger.info(f"Created plant: {nickname} ({species})")
-            return new_plant.to_dict()
+            return plant_dict
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error creating plant: {e}", exc_info=True)
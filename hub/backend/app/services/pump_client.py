@@ -0,0 +1,259 @@
+"""Client for the pump daemon, plus the framing shared with it.
+
+Frames are a 4-byte big-endian length followed by a UTF-8 JSON document.
+Requests look like ``{"command": "activate"}``; responses are
+``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``.
+``{"command": "watch_runs"}`` keeps the connection open instead: the daemon
+sends a frame with the run as ``result`` on every pump run state change,
+and one with a null ``result`` every ``WATCH_HEARTBEAT_SECONDS``.
+The daemon also runs the watering controller; ``WateringClient`` forwards
+readings to it.
+"""
+import json
+import logging
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.exceptions import PumpDaemonError
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 1024 * 1024
+WATCH_HEARTBEAT_SECONDS = 15.0
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_object(obj: Dict[str, Any]) -> Dict[str, Any]:
+    # Timestamps travel as ISO strings; keys ending in "_at" are turned back
+    # into datetimes so responses look the same as in-process ones
+    for key, value in obj.items():
+        if key.endswith("_at") and isinstance(value, str):
+            try:
+                obj[key] = datetime.fromisoformat(value)
+            except ValueError:
+                pass
+    return obj
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def write_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Send one length-prefixed JSON message."""
+    body = json.dumps(message, default=_encode_default).encode("utf-8")
+    if len(body) > MAX_FRAME_BYTES:
+        raise ValueError(f"frame of {len(body)} bytes exceeds {MAX_FRAME_BYTES}")
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def read_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Read one length-prefixed JSON message, or None on a clean EOF."""
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"frame of {size} bytes exceeds {MAX_FRAME_BYTES}")
+    body = _recv_exactly(sock, size)
+    if body is None:
+        raise ConnectionError("connection closed mid-frame")
+    return json.loads(body.decode("utf-8"), object_hook=_decode_object)
+
+
+class PumpClient:
+    """Drop-in replacement for ``PumpService`` that forwards to the pump daemon.
+
+    Web workers use this so that only the daemon process touches the GPIO
+    pins, however many workers the WSGI server starts.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 5.0) -> None:
+        """Initialize the client.
+
+        Args:
+            socket_path: Path of the daemon's Unix socket.
+            timeout: Seconds to wait for connect and for each response.
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._watch_lock = threading.Lock()
+        self._run_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._watch_thread: Optional[threading.Thread] = None
+
+    def _request(self, message: Dict[str, Any]) -> Any:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                write_frame(sock, message)
+                response = read_frame(sock)
+        except (OSError, ValueError) as e:
+            raise PumpDaemonError(f"pump daemon unavailable at {self.socket_path}: {e}") from e
+
+        if response is None:
+            raise PumpDaemonError("pump daemon closed the connection without a response")
+        if not response.get("ok"):
+            raise PumpDaemonError(response.get("error", "pump daemon rejected the command"))
+        return response.get("result")
+
+    def call(self, command: str, **args: Any) -> Any:
+        """Send any daemon command and return its ``result``.
+
+        Raises:
+            PumpDaemonError: If the daemon is unreachable or rejects the command.
+        """
+        return self._request({"command": command, **args})
+
+    def activate_pump(self, trigger_source: str = "manual") -> Dict[str, Any]:
+        """Queue a pump run in the daemon. See ``PumpService.activate_pump``."""
+        return self._request({"command": "activate", "trigger_source": trigger_source})
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get a pump run from the daemon. See ``PumpService.get_run``."""
+        return self._request({"command": "get_run", "run_id": run_id})
+
+    def schedule_run(
+        self,
+        device: Optional[str],
+        duration_seconds: Any,
+        delay_seconds: Any = 0,
+        repeat_every_seconds: Any = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Schedule an actuator run in the daemon. See ``PumpService.schedule_run``."""
+        result, error, status_code = self._request({
+            "command": "schedule_run",
+            "device": device,
+            "duration_seconds": duration_seconds,
+            "delay_seconds": delay_seconds,
+            "repeat_every_seconds": repeat_every_seconds,
+        })
+        return result, error, status_code
+
+    def cancel_scheduled_run(self, run_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Cancel an actuator run in the daemon. See ``PumpService.cancel_scheduled_run``."""
+        result, error, status_code = self._request({"command": "cancel_scheduled_run", "run_id": run_id})
+        return result, error, status_code
+
+    def list_scheduled_runs(self, device: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """List actuators and runs in the daemon. See ``PumpService.list_scheduled_runs``."""
+        result, error, status_code = self._request({"command": "list_scheduled_runs", "device": device})
+        return result, error, status_code
+
+    def add_run_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call ``listener`` on every pump run state change in the daemon.
+
+        See ``PumpService.add_run_listener``. Changes arrive on a background
+        thread holding a ``watch_runs`` connection, reconnecting when the
+        daemon restarts; changes made while disconnected are missed.
+        """
+        with self._watch_lock:
+            self._run_listeners.append(listener)
+            if self._watch_thread is None:
+                self._watch_thread = threading.Thread(target=self._watch_runs, name="pump-run-watcher", daemon=True)
+                self._watch_thread.start()
+
+    def remove_run_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        with self._watch_lock:
+            if listener in self._run_listeners:
+                self._run_listeners.remove(listener)
+
+    def _watch_runs(self) -> None:
+        connected = True
+        while True:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(self.timeout)
+                    sock.connect(self.socket_path)
+                    write_frame(sock, {"command": "watch_runs"})
+                    # A missed heartbeat means the daemon is gone
+                    sock.settimeout(2 * WATCH_HEARTBEAT_SECONDS)
+                    while True:
+                        response = read_frame(sock)
+                        if response is None:
+                            raise ConnectionError("pump daemon closed the watch connection")
+                        if not connected:
+                            logger.info("Watching pump runs again")
+                            connected = True
+                        run = response.get("result")
+                        if not run:
+                            continue
+                        with self._watch_lock:
+                            listeners = list(self._run_listeners)
+                        for listener in listeners:
+                            try:
+                                listener(run)
+                            except Exception as e:
+                                logger.error(f"Error in pump run listener: {e}", exc_info=True)
+            except (OSError, ValueError) as e:
+                if connected:
+                    logger.warning(f"Lost pump run watch on {self.socket_path} ({e}), retrying")
+                connected = False
+            time.sleep(self.timeout)
+
+    def ping(self) -> bool:
+        """Check that the daemon is answering."""
+        return self._request({"command": "ping"}) == "pong"
+
+
+class WateringClient:
+    """Drop-in replacement for ``WateringController`` that forwards to the pump daemon.
+
+    The daemon runs the only controller, so readings from every web worker
+    and from the ingest listener share one filter, cool-down and halt state
+    per sensor, and a rule change reaches all of them at once. Readings are
+    still accepted while the daemon is down: nothing is watered, and
+    ``get_state`` and ``rule`` return None.
+    """
+
+    def __init__(self, pump_client: PumpClient) -> None:
+        self.pump_client = pump_client
+
+    def observe(self, sensor: str, raw_value: float) -> Dict[str, Any]:
+        """Feed one reading to the daemon's controller. See ``WateringController.observe``."""
+        try:
+            return self.pump_client.call("observe", sensor=sensor, value=raw_value)
+        except PumpDaemonError as e:
+            logger.warning(f"Reading of sensor {sensor} not checked for watering: {e}")
+            return {"sensor": sensor, "pump_run": None}
+
+    def get_state(self, sensor: str) -> Optional[Dict[str, Any]]:
+        """Get a sensor's state from the daemon. See ``WateringController.get_state``."""
+        try:
+            return self.pump_client.call("watering_state", sensor=sensor)
+        except PumpDaemonError as e:
+            logger.warning(f"Watering state of sensor {sensor} unavailable: {e}")
+            return None
+
+    def rule(self, sensor: str) -> Optional[Dict[str, Any]]:
+        """Get a sensor's cached rule from the daemon. See ``WateringController.rule``."""
+        try:
+            return self.pump_client.call("watering_rule", sensor=sensor)
+        except PumpDaemonError as e:
+            logger.warning(f"Watering rule of sensor {sensor} unavailable: {e}")
+            return None
+
+    def invalidate(self) -> None:
+        """Have the daemon reload rules. See ``WateringController.invalidate``."""
+        try:
+            self.pump_client.call("invalidate_watering")
+        except PumpDaemonError as e:
+            # The daemon's rule cache still expires on its own
+            logger.warning(f"Could not reload watering rules in the pump daemon: {e}")
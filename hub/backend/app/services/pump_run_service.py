@@ -0,0 +1,180 @@
+"""Service for pump run history: batched recording and usage aggregates."""
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple, List
+from flask import Flask
+from app.config import Config
+from app.database import db
+from app.models.pump_runs import PumpRun
+from app.services.note_service import NoteService
+
+logger = logging.getLogger(__name__)
+
+
+class PumpRunRecorder:
+    """Buffers finished pump runs and writes them with multi-row INSERTs.
+
+    A flush happens when ``batch_size`` runs are waiting or
+    ``flush_interval_seconds`` after the first buffered run, whichever comes
+    first, and once more at interpreter exit.
+    """
+
+    MAX_BUFFERED_RUNS = 1000
+
+    def __init__(
+        self,
+        app: Flask,
+        batch_size: int = 25,
+        flush_interval_seconds: float = 10.0,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            app: Flask app whose database the runs are written to.
+            batch_size: Buffered runs that trigger an immediate flush.
+            flush_interval_seconds: Longest time a run waits in the buffer.
+        """
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def record(self, run: Dict[str, Any]) -> None:
+        """Queue a finished run (a ``PumpService`` run dictionary) for writing."""
+        if run.get("started_at") is None:
+            return  # never reached the pump
+
+        started_at = run["started_at"]
+        ended_at = run.get("finished_at")
+        row = {
+            "run_id": run["id"],
+            "pump_id": run["pump_id"],
+            "trigger_source": run["trigger_source"],
+            "state": run["state"],
+            "error": run.get("error"),
+            "requested_duration_seconds": run["requested_duration_seconds"],
+            "actual_duration_seconds": (ended_at - started_at).total_seconds() if ended_at else None,
+            "started_at": started_at,
+            "ended_at": ended_at,
+        }
+
+        with self._lock:
+            self._buffer.append(row)
+            flush_now = len(self._buffer) >= self.batch_size
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all buffered runs in one statement.
+
+        Returns:
+            int: Number of runs written.
+        """
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not rows:
+            return 0
+
+        with self.app.app_context():
+            try:
+                db.session.execute(db.insert(PumpRun), rows)
+                db.session.commit()
+                logger.info(f"Recorded {len(rows)} pump run(s)")
+                return len(rows)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error recording {len(rows)} pump run(s): {e}", exc_info=True)
+
+        # Keep the rows for the next flush, but never grow without bound
+        with self._lock:
+            self._buffer = (rows + self._buffer)[-self.MAX_BUFFERED_RUNS:]
+        return 0
+
+
+class PumpRunService:
+    """Service class for pump run history queries."""
+
+    DEFAULT_STATS_WINDOW = timedelta(days=30)
+
+    @staticmethod
+    def _water_ml(seconds: Optional[float]) -> Optional[float]:
+        if seconds is None or Config.PUMP_FLOW_ML_PER_SECOND is None:
+            return None
+        return round(seconds * Config.PUMP_FLOW_ML_PER_SECOND, 1)
+
+    @staticmethod
+    def get_stats(
+        from_str: Optional[str] = None,
+        to_str: Optional[str] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Aggregate pump runs per day and per pump, in SQL.
+
+        Args:
+            from_str: ISO datetime window start (default 30 days before the end).
+            to_str: ISO datetime window end (default now).
+
+        Returns:
+            tuple: (stats_dict, error_dict, status_code)
+        """
+        end = NoteService._parse_iso_datetime(to_str) if to_str else datetime.now(timezone.utc)
+        if end is None:
+            return None, {"error": "to must be an ISO datetime string"}, 400
+        start = (
+            NoteService._parse_iso_datetime(from_str)
+            if from_str
+            else end - PumpRunService.DEFAULT_STATS_WINDOW
+        )
+        if start is None:
+            return None, {"error": "from must be an ISO datetime string"}, 400
+        if end < start:
+            return None, {"error": "to must not be before from"}, 400
+
+        in_window = (PumpRun.started_at >= start, PumpRun.started_at < end)
+        run_count = db.func.count(PumpRun.id)
+        failed_count = db.func.count(PumpRun.id).filter(PumpRun.state == "failed")
+        total_seconds = db.func.coalesce(db.func.sum(PumpRun.actual_duration_seconds), 0.0)
+
+        day = db.func.date_trunc("day", PumpRun.started_at).label("day")
+        per_day_rows = (
+            db.session.query(day, run_count, failed_count, total_seconds)
+            .filter(*in_window)
+            .group_by(day)
+            .order_by(day)
+            .all()
+        )
+        per_pump_rows = (
+            db.session.query(PumpRun.pump_id, run_count, failed_count, total_seconds)
+            .filter(*in_window)
+            .group_by(PumpRun.pump_id)
+            .order_by(PumpRun.pump_id)
+            .all()
+        )
+
+        def bucket(runs: int, failed: int, seconds: float) -> Dict[str, Any]:
+            return {
+                "runs": runs,
+                "failed_runs": failed,
+                "seconds": round(seconds, 3),
+                "water_ml": PumpRunService._water_ml(seconds),
+            }
+
+        per_day = [{"day": d.date().isoformat(), **bucket(r, f, s)} for d, r, f, s in per_day_rows]
+        per_pump = [{"pump_id": p, **bucket(r, f, s)} for p, r, f, s in per_pump_rows]
+        total = bucket(
+            sum(row["runs"] for row in per_pump),
+            sum(row["failed_runs"] for row in per_pump),
+            sum(row["seconds"] for row in per_pump),
+        )
+        return {"from": start, "to": end, "per_day": per_day, "per_pump": per_pump, "total": total}, None, 200
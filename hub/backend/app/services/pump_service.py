@@ -1,29 +1,312 @@
 """Service for pump control-related business logic."""
 import logging
-from typing import Dict, Any
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+from app.config import Config
+from app.controllers.actuators import RelayActuator
 from app.controllers.pump_controller import PumpController
+from app.controllers.scheduler import ActuatorScheduler, RunState
+
+if TYPE_CHECKING:
+    from app.services.pump_run_service import PumpRunRecorder
 
 logger = logging.getLogger(__name__)
 
 
+class PumpRunState:
+    """States of a pump run: queued -> running -> done/failed."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    ACTIVE = (QUEUED, RUNNING)
+
+
 class PumpService:
-    """Service class for pump operations."""
+    """Service class for pump operations.
+
+    Pump runs are timed by an ``ActuatorScheduler`` instead of sleeping on
+    the request thread. Callers get a run id back immediately and can poll
+    its state. The same scheduler drives any other actuators (lights, fans)
+    registered with it.
+    """
+
+    MAX_TRACKED_RUNS = 100
+    MAX_SCHEDULE_SECONDS = 7 * 24 * 3600
     
-    def __init__(self) -> None:
-        """Initialize the pump service with a pump controller."""
+    def __init__(
+        self,
+        recorder: Optional["PumpRunRecorder"] = None,
+        pump_id: Optional[str] = None,
+        scheduler: Optional[ActuatorScheduler] = None,
+    ) -> None:
+        """Initialize the pump service with a pump controller.
+
+        Args:
+            recorder: Optional sink that persists finished runs.
+            pump_id: Identifier stored with each run (default ``Config.PUMP_ID``).
+            scheduler: Scheduler to register the pump with (default: a new one).
+        """
         self.pump_controller = PumpController()
+        self.recorder = recorder
+        self.pump_id = pump_id or Config.PUMP_ID
+        # The scheduler holds the pump for one run at a time: there is one physical pump
+        self.scheduler = scheduler or ActuatorScheduler()
+        self.scheduler.add_actuator(self.pump_id, self.pump_controller)
+        for kind, pin in (("light", Config.LIGHT_PIN), ("fan", Config.FAN_PIN)):
+            if pin is not None and kind not in self.scheduler.actuators:
+                self.scheduler.add_actuator(kind, RelayActuator(self.pump_controller.gpio, pin, kind=kind))
+        self.scheduler.start()
+        self._lock = threading.Lock()
+        self._runs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._active_run_id: Optional[str] = None
+        self._run_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_run_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call ``listener`` with a copy of a pump run on every state change."""
+        with self._lock:
+            self._run_listeners.append(listener)
+
+    def remove_run_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        with self._lock:
+            if listener in self._run_listeners:
+                self._run_listeners.remove(listener)
     
-    def activate_pump(self) -> Dict[str, Any]:
-        """Activate the pump.
+    def activate_pump(self, trigger_source: str = "manual") -> Dict[str, Any]:
+        """Queue a pump run.
+
+        Repeated presses while a run is queued or running are coalesced into
+        that run rather than stacking up more watering.
+
+        Args:
+            trigger_source: What asked for the run, stored in the run history.
         
         Returns:
-            dict: Response message.
+            dict: Response message with the run and whether it was coalesced.
         """
+        with self._lock:
+            if self._active_run_id is not None:
+                run = self._runs[self._active_run_id]
+                logger.info(f"Pump run {run['id']} already {run['state']}, coalescing")
+                return {"message": "roger roger", "run": dict(run), "coalesced": True}
+
+            run = self._new_run(trigger_source, self.pump_controller.duration_seconds)
+            self._active_run_id = run["id"]
+            queued = dict(run)
+        self._notify_run(queued)
+
         try:
-            self.pump_controller.on()
-            logger.info("Pump activated")
-            return {"message": "roger roger"}
+            self.scheduler.schedule_run(
+                self.pump_id,
+                self.pump_controller.duration_seconds,
+                on_start=lambda scheduled: self._mark_running(run["id"], scheduled),
+                on_finish=lambda scheduled: self._finish_scheduled_run(run["id"], scheduled),
+            )
         except Exception as e:
-            logger.error(f"Error activating pump: {e}", exc_info=True)
+            logger.error(f"Error queueing pump run: {e}", exc_info=True)
+            self._finish_run(run["id"], PumpRunState.FAILED, str(e))
             raise
+        return {"message": "roger roger", "run": queued, "coalesced": False}
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get the state of a pump run.
+
+        Args:
+            run_id: The ID returned by ``activate_pump``.
+
+        Returns:
+            dict: Run dictionary if tracked, None otherwise.
+        """
+        with self._lock:
+            run = self._runs.get(run_id)
+            return dict(run) if run else None
+
+    def schedule_run(
+        self,
+        device: Optional[str],
+        duration_seconds: Any,
+        delay_seconds: Any = 0,
+        repeat_every_seconds: Any = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Schedule a timed run of any registered actuator.
+
+        Each start of a pump schedule is a pump run like ``activate_pump``'s,
+        with ``trigger_source`` "schedule": it can be fetched with ``get_run``,
+        is sent to run listeners and recorded, and presses while it runs are
+        coalesced into it. The response's ``pump_run`` is the next one.
+
+        Args:
+            device: Actuator name, e.g. the pump id, "light" or "fan".
+            duration_seconds: How long the device stays on.
+            delay_seconds: Seconds until the (first) run starts.
+            repeat_every_seconds: Optional period between run starts.
+
+        Returns:
+            tuple: (scheduled_run_dict, error_dict, status_code)
+        """
+        if not device or device not in self.scheduler.actuators:
+            return None, {"error": f"unknown actuator {device!r}"}, 404
+
+        values: Dict[str, Optional[float]] = {}
+        for name, value, required in (
+            ("duration_seconds", duration_seconds, True),
+            ("delay_seconds", delay_seconds, False),
+            ("repeat_every_seconds", repeat_every_seconds, False),
+        ):
+            if value is None and not required:
+                values[name] = None
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return None, {"error": f"{name} must be a number"}, 400
+            if not 0 <= value <= self.MAX_SCHEDULE_SECONDS:
+                return None, {"error": f"{name} must be between 0 and {self.MAX_SCHEDULE_SECONDS}"}, 400
+            values[name] = float(value)
+
+        if device == self.pump_id:
+            return self._schedule_pump_runs(
+                values["duration_seconds"], values["delay_seconds"] or 0.0, values["repeat_every_seconds"]
+            )
+        try:
+            scheduled = self.scheduler.schedule_run(
+                device,
+                values["duration_seconds"],
+                delay_seconds=values["delay_seconds"] or 0.0,
+                repeat_every_seconds=values["repeat_every_seconds"],
+            )
+        except ValueError as e:
+            return None, {"error": str(e)}, 400
+        return scheduled.to_dict(), None, 201
+
+    def cancel_scheduled_run(self, run_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Cancel a scheduled, waiting or running actuator run.
+
+        Returns:
+            tuple: (cancelled_run_dict, error_dict, status_code)
+        """
+        cancelled = self.scheduler.cancel(run_id)
+        if cancelled is None:
+            return None, {"error": "scheduled run not found"}, 404
+        return cancelled, None, 200
+
+    def list_scheduled_runs(self, device: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """List actuators and their pending or running runs.
+
+        Returns:
+            tuple: (dict with actuators and runs, error_dict, status_code)
+        """
+        actuators: List[Dict[str, Any]] = [
+            {"name": name, "kind": actuator.kind} for name, actuator in sorted(self.scheduler.actuators.items())
+        ]
+        return {"actuators": actuators, "runs": self.scheduler.list_runs(device)}, None, 200
+
+    def _schedule_pump_runs(
+        self,
+        duration_seconds: float,
+        delay_seconds: float,
+        repeat_every_seconds: Optional[float],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        with self._lock:
+            run = self._new_run("schedule", duration_seconds)
+            queued = dict(run)
+        self._notify_run(queued)
+        # The pump run of the schedule's next start; a new one is queued after every repeat
+        current = [run["id"]]
+
+        def _on_finish(scheduled: Dict[str, Any]) -> None:
+            self._finish_scheduled_run(current[0], scheduled)
+            if scheduled["repeat_every_seconds"] is None:
+                return
+            with self._lock:
+                next_run = self._new_run("schedule", duration_seconds)
+                current[0] = next_run["id"]
+                next_queued = dict(next_run)
+            self._notify_run(next_queued)
+
+        try:
+            scheduled = self.scheduler.schedule_run(
+                self.pump_id,
+                duration_seconds,
+                delay_seconds=delay_seconds,
+                repeat_every_seconds=repeat_every_seconds,
+                on_start=lambda started: self._mark_running(current[0], started),
+                on_finish=_on_finish,
+            )
+        except ValueError as e:
+            self._finish_run(run["id"], PumpRunState.FAILED, str(e))
+            return None, {"error": str(e)}, 400
+        return {**scheduled.to_dict(), "pump_run": queued}, None, 201
+
+    def _new_run(self, trigger_source: str, duration_seconds: float) -> Dict[str, Any]:
+        # Caller holds the lock
+        run = {
+            "id": uuid.uuid4().hex,
+            "pump_id": self.pump_id,
+            "trigger_source": trigger_source,
+            "requested_duration_seconds": duration_seconds,
+            "state": PumpRunState.QUEUED,
+            "requested_at": datetime.now(timezone.utc),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+        self._runs[run["id"]] = run
+        self._trim_runs()
+        return run
+
+    def _mark_running(self, run_id: str, scheduled: Dict[str, Any]) -> None:
+        with self._lock:
+            run = self._runs[run_id]
+            run["state"] = PumpRunState.RUNNING
+            run["started_at"] = scheduled["started_at"]
+            # A scheduled run holds the pump now, so presses coalesce into it
+            if self._active_run_id is None:
+                self._active_run_id = run_id
+            running = dict(run)
+        self._notify_run(running)
+
+    def _finish_scheduled_run(self, run_id: str, scheduled: Dict[str, Any]) -> None:
+        if scheduled["state"] == RunState.DONE:
+            logger.info("Pump activated")
+            self._finish_run(run_id, PumpRunState.DONE)
+        else:
+            error = scheduled["error"] or scheduled["state"]
+            logger.error(f"Pump run {run_id} {scheduled['state']}: {error}")
+            self._finish_run(run_id, PumpRunState.FAILED, error)
+
+    def _finish_run(self, run_id: str, state: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            run = self._runs[run_id]
+            run["state"] = state
+            run["finished_at"] = datetime.now(timezone.utc)
+            run["error"] = error
+            if self._active_run_id == run_id:
+                self._active_run_id = None
+            finished = dict(run)
+        if self.recorder is not None:
+            self.recorder.record(finished)
+        self._notify_run(finished)
+
+    def _notify_run(self, run: Dict[str, Any]) -> None:
+        # Called without the lock held, so listeners may call back into the service
+        with self._lock:
+            listeners = list(self._run_listeners)
+        for listener in listeners:
+            try:
+                listener(dict(run))
+            except Exception as e:
+                logger.error(f"Error in pump run listener: {e}", exc_info=True)
 
+    def _trim_runs(self) -> None:
+        # Caller holds the lock. Oldest finished runs go first; queued and
+        # running ones (an activation, or a schedule's next start) never do.
+        overflow = len(self._runs) - self.MAX_TRACKED_RUNS
+        if overflow <= 0:
+            return
+        finished = [run_id for run_id, run in self._runs.items() if run["state"] not in PumpRunState.ACTIVE]
+        for run_id in finished[:overflow]:
+            del self._runs[run_id]
@@ -0,0 +1,133 @@
+"""Readings stored by the ingest listener, announced to the web processes.
+
+The listener's ``SensorReadingWriter`` sends the rows it writes on
+``READINGS_CHANNEL`` with ``pg_notify``, in the same transaction, so they
+are delivered once committed. Each web process LISTENs and feeds them to its
+latest readings, health monitor and event stream, as if they had been posted
+to ``/api/data``. Notifications sent while a web process is not listening
+(before its first request, or while reconnecting) are lost; its latest
+readings then come from the database.
+"""
+import json
+import logging
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from flask import Flask
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+READINGS_CHANNEL = "sensor_readings"
+# Postgres rejects payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+ReadingsCallback = Callable[[List[Dict[str, Any]]], None]
+
+
+def encode_notifications(rows: Iterable[Dict[str, Any]]) -> List[str]:
+    """Pack rows as JSON ``[[sensor, ts, value], ...]`` payloads that each fit in one notification."""
+    payloads: List[str] = []
+    items: List[str] = []
+    size = 2
+    for row in rows:
+        # ASCII-escaped, so characters are bytes
+        item = json.dumps([row["sensor"], row["recorded_at"].timestamp(), row["value"]], separators=(",", ":"))
+        if items and size + len(item) + 1 > MAX_PAYLOAD_BYTES:
+            payloads.append(f"[{','.join(items)}]")
+            items, size = [], 2
+        items.append(item)
+        size += len(item) + 1
+    if items:
+        payloads.append(f"[{','.join(items)}]")
+    return payloads
+
+
+def decode_notification(payload: str) -> List[Dict[str, Any]]:
+    """Unpack one payload into ``{"sensor", "value", "recorded_at"}`` rows."""
+    return [
+        {"sensor": sensor, "value": value, "recorded_at": datetime.fromtimestamp(ts, timezone.utc)}
+        for sensor, ts, value in json.loads(payload)
+    ]
+
+
+def notify_readings(rows: List[Dict[str, Any]]) -> None:
+    """Announce written rows on ``READINGS_CHANNEL`` in one statement. The caller commits."""
+    payloads = encode_notifications(rows)
+    if not payloads:
+        return
+    db.session.execute(
+        db.select(db.func.pg_notify(READINGS_CHANNEL, db.func.unnest(db.bindparam("payloads", type_=db.ARRAY(db.Text))))),
+        {"payloads": payloads},
+    )
+
+
+class ReadingNotificationListener:
+    """LISTENs on ``READINGS_CHANNEL`` on a background thread and hands the rows to a callback."""
+
+    # Seconds without a notification before the connection is checked
+    IDLE_CHECK_SECONDS = 30.0
+    RECONNECT_SECONDS = 5.0
+
+    def __init__(self, on_readings: ReadingsCallback) -> None:
+        self.on_readings = on_readings
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, app: Flask) -> None:
+        """Start listening once per process."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, args=(app,), name="reading-notifications", daemon=True)
+            self._thread.start()
+
+    def _run(self, app: Flask) -> None:
+        connected = True
+        while True:
+            try:
+                self._listen(app)
+            except Exception as e:
+                if connected:
+                    logger.warning(f"Lost {READINGS_CHANNEL} notifications ({e}), reconnecting")
+                connected = False
+            time.sleep(self.RECONNECT_SECONDS)
+
+    def _listen(self, app: Flask) -> None:
+        with app.app_context():
+            connection = db.engine.raw_connection()
+        # Kept out of the pool: it is switched to autocommit and blocks for good
+        connection.detach()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {READINGS_CHANNEL}")
+                logger.info(f"Listening for {READINGS_CHANNEL} notifications")
+                while True:
+                    if not select.select([dbapi_connection], [], [], self.IDLE_CHECK_SECONDS)[0]:
+                        # Raises if the server went away without closing the socket
+                        cursor.execute("SELECT 1")
+                    else:
+                        dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        self._deliver(dbapi_connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+    def _deliver(self, payload: str) -> None:
+        try:
+            rows = decode_notification(payload)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring malformed {READINGS_CHANNEL} notification: {e}")
+            return
+        try:
+            self.on_readings(rows)
+        except Exception as e:
+            logger.error(f"Error handling forwarded readings: {e}", exc_info=True)
@@ -0,0 +1,103 @@
+"""Duplicate detection for readings that carry device sequence numbers.
+
+Devices retry posts on flaky Wi-Fi, so the same readings can arrive twice.
+A device numbers its readings ``seq`` = 0, 1, 2, ... per ``boot`` (any id
+that changes when it restarts). Per device the tracker keeps the highest
+sequence number seen and a bitmap of the ``window`` numbers below it, like
+IPsec's anti-replay window, so each reading is checked in O(1) before it is
+written instead of failing a whole batch on a unique constraint.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _DeviceWindow:
+    __slots__ = ("boot", "high", "seen")
+
+    def __init__(self, boot: int, seq: int) -> None:
+        self.boot = boot
+        self.high = seq
+        # Bit i set: seq ``high - i`` has been seen
+        self.seen = 1
+
+
+class ReadingSequenceTracker:
+    """Drops readings whose ``(device, boot, seq)`` was already accepted.
+
+    Rows without a ``seq`` key pass through. A reading more than ``window``
+    numbers behind the device's newest one is treated as already seen.
+    State lives in memory and covers the ``max_devices`` most recently
+    active devices, so after a restart one retried batch may be stored twice.
+    """
+
+    WINDOW = 4096
+    MAX_DEVICES = 10000
+
+    def __init__(self, window: int = WINDOW, max_devices: int = MAX_DEVICES) -> None:
+        self.window = window
+        self.max_devices = max_devices
+        self._mask = (1 << window) - 1
+        self._lock = threading.Lock()
+        self._devices: "OrderedDict[str, _DeviceWindow]" = OrderedDict()
+        self._stats = {"accepted": 0, "duplicates": 0, "boots": 0}
+
+    def filter_new(self, rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Mark the rows' sequence numbers as seen and drop the ones seen before.
+
+        Returns:
+            tuple: (new rows in their original order, number of duplicates)
+        """
+        fresh = []
+        with self._lock:
+            for row in rows:
+                if "seq" not in row or self._claim(row["device"], row["boot"], row["seq"]):
+                    fresh.append(row)
+            duplicates = len(rows) - len(fresh)
+            self._stats["accepted"] += len(fresh)
+            self._stats["duplicates"] += duplicates
+        return fresh, duplicates
+
+    def release(self, rows: List[Dict[str, Any]]) -> None:
+        """Forget rows that could not be stored, so the device's retry is accepted."""
+        with self._lock:
+            for row in rows:
+                if "seq" not in row:
+                    continue
+                state = self._devices.get(row["device"])
+                if state is None or state.boot != row["boot"]:
+                    continue
+                offset = state.high - row["seq"]
+                if 0 <= offset < self.window:
+                    state.seen &= ~(1 << offset)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since start, plus the number of tracked devices."""
+        with self._lock:
+            return {**self._stats, "devices": len(self._devices)}
+
+    def _claim(self, device: str, boot: int, seq: int) -> bool:
+        # Caller holds the lock
+        state = self._devices.get(device)
+        if state is None or state.boot != boot:
+            self._devices[device] = _DeviceWindow(boot, seq)
+            self._devices.move_to_end(device)
+            self._stats["boots"] += 1
+            if len(self._devices) > self.max_devices:
+                self._devices.popitem(last=False)
+            return True
+
+        self._devices.move_to_end(device)
+        if seq > state.high:
+            shift = seq - state.high
+            state.seen = ((state.seen << shift) | 1) & self._mask if shift < self.window else 1
+            state.high = seq
+            return True
+        offset = state.high - seq
+        if offset >= self.window or state.seen >> offset & 1:
+            return False
+        state.seen |= 1 << offset
+        return True
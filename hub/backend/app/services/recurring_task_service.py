@@ -0,0 +1,361 @@
+"""Service for recurring care task business logic."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.database import db
+from app.models.notes import Note
+from app.models.plants import Plants
+from app.models.recurring_tasks import RecurringTask
+from app.services.note_service import NoteService
+from app.services.plant_service import PlantService
+
+logger = logging.getLogger(__name__)
+
+
+class RecurringTaskService:
+    """Service class for recurring task operations.
+
+    Tasks are stored as a single definition row. Occurrences are expanded
+    on demand for the requested window, and only completed occurrences are
+    written to ``notes``, so storage grows with real activity rather than
+    with the schedule.
+    """
+
+    FREQUENCIES = {
+        "HOURLY": timedelta(hours=1),
+        "DAILY": timedelta(days=1),
+        "WEEKLY": timedelta(weeks=1),
+    }
+    RRULE_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL"}
+    DEFAULT_WINDOW = timedelta(days=7)
+    MAX_WINDOW = timedelta(days=366)
+    MAX_OCCURRENCES = 10000
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # DateTime columns are naive and hold UTC wall time
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    @staticmethod
+    def parse_rrule(value: Any) -> Optional[Dict[str, Any]]:
+        """Parse the supported RRULE subset.
+
+        Supports ``FREQ`` of HOURLY, DAILY or WEEKLY with optional
+        ``INTERVAL`` and either ``COUNT`` or ``UNTIL``, e.g.
+        ``FREQ=DAILY;INTERVAL=7``. Fixed-length steps let any window be
+        expanded without walking the series from its start.
+
+        Args:
+            value: RRULE string, optionally prefixed with ``RRULE:``.
+
+        Returns:
+            dict: {"step": timedelta, "count": int or None, "until": datetime or None},
+                  or None if the rule is invalid or unsupported.
+        """
+        if not isinstance(value, str):
+            return None
+        text = value.strip().upper()
+        if text.startswith("RRULE:"):
+            text = text[len("RRULE:"):]
+
+        parts: Dict[str, str] = {}
+        for part in filter(None, text.split(";")):
+            key, sep, part_value = part.partition("=")
+            if not sep or key in parts or key not in RecurringTaskService.RRULE_PARTS:
+                return None
+            parts[key] = part_value
+
+        frequency = RecurringTaskService.FREQUENCIES.get(parts.get("FREQ", ""))
+        if frequency is None:
+            return None
+
+        try:
+            interval = int(parts.get("INTERVAL", "1"))
+            count = int(parts["COUNT"]) if "COUNT" in parts else None
+        except ValueError:
+            return None
+        if interval < 1 or (count is not None and count < 1):
+            return None
+
+        until: Optional[datetime] = None
+        if "UNTIL" in parts:
+            for fmt in ("%Y%m%dT%H%M%SZ", "%Y%m%d"):
+                try:
+                    until = datetime.strptime(parts["UNTIL"], fmt).replace(tzinfo=timezone.utc)
+                    break
+                except ValueError:
+                    continue
+            if until is None:
+                return None
+        if count is not None and until is not None:
+            return None
+
+        return {"step": frequency * interval, "count": count, "until": until}
+
+    @staticmethod
+    def _index_bounds(
+        rule: Dict[str, Any], starts_at: datetime, window_start: datetime, window_end: datetime
+    ) -> Tuple[int, int]:
+        """Return the inclusive range of occurrence indexes inside the window."""
+        step = rule["step"]
+        first = max(0, -((starts_at - window_start) // step))
+        last = (window_end - starts_at) // step
+        if rule["count"] is not None:
+            last = min(last, rule["count"] - 1)
+        if rule["until"] is not None:
+            last = min(last, (rule["until"] - starts_at) // step)
+        return first, last
+
+    @staticmethod
+    def expand(
+        task: RecurringTask, window_start: datetime, window_end: datetime
+    ) -> List[datetime]:
+        """Expand a task into its occurrence times within [window_start, window_end]."""
+        rule = RecurringTaskService.parse_rrule(task.rrule)
+        if rule is None:
+            return []
+        starts_at = RecurringTaskService._as_utc(task.starts_at)
+        first, last = RecurringTaskService._index_bounds(rule, starts_at, window_start, window_end)
+        return [starts_at + rule["step"] * index for index in range(first, last + 1)]
+
+    @staticmethod
+    def is_occurrence(task: RecurringTask, when: datetime) -> bool:
+        """Check whether ``when`` is one of the task's occurrence times."""
+        return bool(RecurringTaskService.expand(task, when, when))
+
+    @staticmethod
+    def create_task(
+        plant_id: int,
+        content: Any,
+        rrule: Any,
+        starts_at_str: Optional[str] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Create a recurring task for a plant.
+
+        Args:
+            plant_id: The ID of the plant.
+            content: Task description, e.g. "Water".
+            rrule: Recurrence rule, see ``parse_rrule``.
+            starts_at_str: Optional ISO datetime of the first occurrence (default now).
+
+        Returns:
+            tuple: (task_dict, error_dict, status_code)
+        """
+        if not isinstance(content, str) or not content.strip():
+            return None, {"error": "content is required"}, 400
+
+        if RecurringTaskService.parse_rrule(rrule) is None:
+            return None, {
+                "error": "rrule must be FREQ=HOURLY|DAILY|WEEKLY with optional INTERVAL and COUNT or UNTIL"
+            }, 400
+
+        starts_at = datetime.now(timezone.utc).replace(microsecond=0)
+        if starts_at_str:
+            starts_at = NoteService._parse_iso_datetime(starts_at_str)
+            if starts_at is None:
+                return None, {"error": "starts_at must be an ISO datetime string"}, 400
+
+        tasks = RecurringTask.__table__
+        try:
+            row = PlantService.execute_for_plant(
+                plant_id,
+                db.insert(tasks)
+                .from_select(
+                    ["plant_id", "content", "rrule", "starts_at"],
+                    db.select(
+                        Plants.id,
+                        db.literal(content.strip(), RecurringTask.content.type),
+                        db.literal(rrule.strip().upper(), RecurringTask.rrule.type),
+                        db.literal(starts_at, RecurringTask.starts_at.type),
+                    ).where(Plants.id == plant_id),
+                )
+                .returning(*tasks.c),
+                RecurringTask,
+            )
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+
+            task_dict = row[1].to_dict()
+            db.session.commit()
+            return task_dict, None, 201
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error creating recurring task for plant {plant_id}: {e}", exc_info=True)
+            return None, {"error": "Failed to create recurring task"}, 500
+
+    @staticmethod
+    def list_tasks(
+        plant_id: int,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], int]:
+        """List the recurring task definitions of a plant."""
+        rows = (
+            db.session.query(Plants.id, RecurringTask)
+            .outerjoin(RecurringTask, RecurringTask.plant_id == Plants.id)
+            .filter(Plants.id == plant_id)
+            .order_by(RecurringTask.created_at.asc())
+            .all()
+        )
+        if not rows:
+            return None, {"error": "plant not found"}, 404
+        return [task.to_dict() for _, task in rows if task is not None], None, 200
+
+    @staticmethod
+    def delete_task(
+        plant_id: int, task_id: int
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Delete a recurring task. Notes of completed occurrences are kept."""
+        tasks = RecurringTask.__table__
+        try:
+            row = PlantService.execute_for_plant(
+                plant_id,
+                db.delete(tasks)
+                .where(tasks.c.id == task_id, tasks.c.plant_id == plant_id)
+                .returning(*tasks.c),
+                RecurringTask,
+            )
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+            if row[1] is None:
+                return None, {"error": "task not found"}, 404
+
+            db.session.commit()
+            return {"message": "Recurring task deleted successfully"}, None, 200
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error deleting recurring task {task_id} for plant {plant_id}: {e}", exc_info=True)
+            return None, {"error": "Failed to delete recurring task"}, 500
+
+    @staticmethod
+    def list_occurrences(
+        window_from: Optional[str] = None,
+        window_to: Optional[str] = None,
+        plant_id: Optional[int] = None,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], int]:
+        """Expand recurring tasks into occurrences for a window.
+
+        Args:
+            window_from: ISO datetime window start (default now).
+            window_to: ISO datetime window end (default seven days after the start).
+            plant_id: Optional plant to restrict the tasks to.
+
+        Returns:
+            tuple: (list of occurrence dictionaries sorted by due date, error_dict, status_code)
+        """
+        start = NoteService._parse_iso_datetime(window_from) if window_from else datetime.now(timezone.utc)
+        if start is None:
+            return None, {"error": "from must be an ISO datetime string"}, 400
+        end = NoteService._parse_iso_datetime(window_to) if window_to else start + RecurringTaskService.DEFAULT_WINDOW
+        if end is None:
+            return None, {"error": "to must be an ISO datetime string"}, 400
+        if end < start:
+            return None, {"error": "to must not be before from"}, 400
+        if end - start > RecurringTaskService.MAX_WINDOW:
+            return None, {"error": "window must be at most 366 days"}, 400
+
+        tasks_q = RecurringTask.query.filter(RecurringTask.starts_at <= end)
+        if plant_id is not None:
+            tasks_q = tasks_q.filter(RecurringTask.plant_id == plant_id)
+        tasks = tasks_q.all()
+
+        occurrences: List[Tuple[RecurringTask, datetime]] = []
+        for task in tasks:
+            occurrences.extend((task, due) for due in RecurringTaskService.expand(task, start, end))
+            if len(occurrences) > RecurringTaskService.MAX_OCCURRENCES:
+                return None, {"error": "too many occurrences in window, narrow it"}, 400
+
+        completed: Dict[Tuple[int, datetime], Note] = {}
+        if occurrences:
+            notes = Note.query.filter(
+                Note.recurring_task_id.in_([task.id for task in tasks]),
+                Note.due_date >= start,
+                Note.due_date <= end,
+            ).all()
+            completed = {
+                (note.recurring_task_id, RecurringTaskService._as_utc(note.due_date)): note
+                for note in notes
+            }
+
+        items: List[Dict[str, Any]] = []
+        for task, due in occurrences:
+            note = completed.get((task.id, due))
+            items.append(
+                {
+                    "task_id": task.id,
+                    "plant_id": task.plant_id,
+                    "content": task.content,
+                    "due_date": due,
+                    "completed_at": note.completed_at if note else None,
+                    "note_id": note.id if note else None,
+                }
+            )
+        items.sort(key=lambda i: i["due_date"])
+        return items, None, 200
+
+    @staticmethod
+    def complete_occurrence(
+        plant_id: int, task_id: int, due_date_str: Optional[str]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Materialize one occurrence as a completed note.
+
+        Un-completing is deleting that note through the notes API.
+
+        Args:
+            plant_id: The ID of the plant.
+            task_id: The ID of the recurring task.
+            due_date_str: ISO datetime of the occurrence being completed.
+
+        Returns:
+            tuple: (note_dict, error_dict, status_code)
+        """
+        due_date = NoteService._parse_iso_datetime(due_date_str)
+        if due_date is None:
+            return None, {"error": "due_date must be an ISO datetime string"}, 400
+
+        row = (
+            db.session.query(Plants.id, RecurringTask)
+            .outerjoin(
+                RecurringTask,
+                db.and_(RecurringTask.plant_id == Plants.id, RecurringTask.id == task_id),
+            )
+            .filter(Plants.id == plant_id)
+            .first()
+        )
+        if row is None:
+            return None, {"error": "plant not found"}, 404
+        task = row[1]
+        if task is None:
+            return None, {"error": "task not found"}, 404
+        if not RecurringTaskService.is_occurrence(task, due_date):
+            return None, {"error": "due_date is not an occurrence of this task"}, 400
+
+        try:
+            note = db.session.scalar(
+                pg_insert(Note)
+                .values(
+                    plant_id=plant_id,
+                    recurring_task_id=task.id,
+                    content=task.content,
+                    due_date=due_date,
+                    completed_at=datetime.now(timezone.utc),
+                )
+                .on_conflict_do_nothing(constraint="uq_notes_recurring_task_id_due_date")
+                .returning(Note)
+            )
+            if note is None:
+                return None, {"error": "occurrence already completed"}, 409
+
+            note_dict = note.to_dict()
+            db.session.commit()
+            return note_dict, None, 201
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error completing task {task_id} for plant {plant_id}: {e}", exc_info=True)
+            return None, {"error": "Failed to complete occurrence"}, 500
@@ -0,0 +1,53 @@
+"""How often a sensor should report, decided by the server from what it has seen.
+
+Most of the time soil moisture barely moves, and a reading every five
+seconds is wasted. Ingestion responses carry ``next_report_seconds`` so the
+firmware samples quickly only while it matters: during a watering cycle,
+close to the watering threshold, or while the readings are moving.
+"""
+from typing import Any, Dict, Optional
+
+
+class ReportIntervalPolicy:
+    """Maps a sensor's rolling statistics and watering state to a report interval."""
+
+    MIN_SECONDS = 5
+    MAX_SECONDS = 300
+    # Rolling std (raw units) of a probe in still soil; more means the value is moving
+    NOISE_STD = 3.0
+    # Moisture margin above ``low_percent``: at or below NEAR report as fast as
+    # possible, at or above FAR as slowly as possible, linear in between
+    NEAR_PERCENT = 5.0
+    FAR_PERCENT = 25.0
+
+    @staticmethod
+    def next_report_seconds(
+        std: Optional[float],
+        state: Optional[Dict[str, Any]],
+        rule: Optional[Dict[str, Any]],
+    ) -> int:
+        """Seconds until the sensor's next reading.
+
+        Args:
+            std: Rolling standard deviation of the raw readings, None while
+                there are too few to tell.
+            state: The watering controller's state for the sensor.
+            rule: The sensor's watering rule, if it has one.
+
+        Returns:
+            int: Between ``MIN_SECONDS`` and ``MAX_SECONDS``.
+        """
+        policy = ReportIntervalPolicy
+        if std is None:
+            return policy.MIN_SECONDS
+        # Halve the interval for every doubling of the std above the noise floor
+        interval = policy.MAX_SECONDS * policy.NOISE_STD / max(std, policy.NOISE_STD)
+
+        percent = state.get("filtered_percent") if state else None
+        if rule is not None and rule["enabled"] and percent is not None:
+            if state["watering"]:
+                return policy.MIN_SECONDS
+            margin = percent - rule["low_percent"]
+            fraction = min(max((margin - policy.NEAR_PERCENT) / (policy.FAR_PERCENT - policy.NEAR_PERCENT), 0.0), 1.0)
+            interval = min(interval, policy.MIN_SECONDS + (policy.MAX_SECONDS - policy.MIN_SECONDS) * fraction)
+        return int(max(policy.MIN_SECONDS, round(interval)))
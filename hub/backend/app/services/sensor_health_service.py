@@ -0,0 +1,229 @@
+"""Per-sensor health: stale, out-of-range, flat-lined and spiking sensors.
+
+A dead probe or a board that lost Wi-Fi otherwise goes unnoticed. The
+monitor keeps a few numbers per sensor, updated in O(1) per reading: when it
+was last heard from, a rolling mean and variance, and how long the value has
+not moved. A background sweep catches sensors that went silent.
+"""
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+HealthListener = Callable[[Dict[str, Any]], None]
+
+
+class SensorHealth:
+    """Running statistics of one sensor.
+
+    Mean and variance use Welford's update with a weight of ``1 / n`` for
+    the first readings and a fixed ``alpha`` after that, so they start exact
+    and then follow the last ``HALF_LIFE`` readings or so.
+    """
+
+    __slots__ = ("sensor", "status", "last_seen", "value", "readings", "mean", "variance", "flat_readings", "spikes", "last_spike_at")
+
+    def __init__(self, sensor: str) -> None:
+        self.sensor = sensor
+        self.status = "ok"
+        self.last_seen = 0.0
+        self.value = 0.0
+        self.readings = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.flat_readings = 0
+        self.spikes = 0
+        self.last_spike_at: Optional[float] = None
+
+    def update(self, value: float, alpha: float, min_std: float) -> float:
+        """Fold in one reading. Returns its distance from the previous mean in standard deviations."""
+        if self.readings and value == self.value:
+            self.flat_readings += 1
+        else:
+            self.flat_readings = 1
+        self.value = value
+        self.readings += 1
+
+        delta = value - self.mean
+        std = max(math.sqrt(self.variance), min_std)
+        score = abs(delta) / std if self.readings > 1 else 0.0
+        weight = max(alpha, 1.0 / self.readings)
+        self.mean += weight * delta
+        self.variance = (1.0 - weight) * (self.variance + weight * delta * delta)
+        return score
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "sensor": self.sensor,
+            "status": self.status,
+            "last_seen": datetime.fromtimestamp(self.last_seen, timezone.utc),
+            "seconds_since_seen": round(now - self.last_seen, 1),
+            "value": self.value,
+            "mean": round(self.mean, 2),
+            "std": round(math.sqrt(self.variance), 2),
+            "readings": self.readings,
+            "flat_readings": self.flat_readings,
+            "spikes": self.spikes,
+            "last_spike_at": (
+                datetime.fromtimestamp(self.last_spike_at, timezone.utc) if self.last_spike_at is not None else None
+            ),
+        }
+
+
+class SensorHealthMonitor:
+    """Tracks the health of every sensor this process receives readings for.
+
+    Statuses, most severe first:
+
+    * ``stale``: nothing heard for ``SENSOR_STALE_SECONDS``.
+    * ``out_of_range``: the last raw value is at an ADC rail, which a probe
+      in soil never reads (disconnected or shorted).
+    * ``flatline``: the last ``FLATLINE_READINGS`` values were identical;
+      a working probe always has some noise.
+    * ``ok``
+
+    Listeners get the sensor's health dict with an ``event`` key on every
+    status change, and on spikes: readings more than ``SPIKE_SIGMAS``
+    standard deviations from the rolling mean.
+    """
+
+    HALF_LIFE = 60
+    MIN_STD = 3.0
+    SPIKE_SIGMAS = 6.0
+    # Readings before spikes are flagged, so the first estimates can settle
+    WARMUP_READINGS = 30
+    FLATLINE_READINGS = 360
+    MAX_RAW_VALUE = 1023
+    RAIL_MARGIN = 8
+    CHECK_SECONDS = 15.0
+
+    def __init__(self, stale_seconds: Optional[float] = None) -> None:
+        self.stale_seconds = Config.SENSOR_STALE_SECONDS if stale_seconds is None else stale_seconds
+        self.alpha = 1.0 - 0.5 ** (1.0 / self.HALF_LIFE)
+        self._lock = threading.Lock()
+        self._sensors: Dict[str, SensorHealth] = {}
+        self._listeners: List[HealthListener] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: HealthListener) -> None:
+        """Call ``listener`` with a sensor's health on status changes and spikes."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: HealthListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def record(self, sensor: str, value: float, now: Optional[float] = None) -> None:
+        """Fold in one reading received at ``now`` (Unix seconds, default now)."""
+        self.record_many([{"sensor": sensor, "value": value}], now)
+
+    def record_many(self, rows: Iterable[Dict[str, Any]], now: Optional[float] = None) -> None:
+        """Fold in ``{"sensor", "value"}`` rows received together, in time order if they have ``recorded_at``."""
+        now = time.time() if now is None else now
+        rows = list(rows)
+        if rows and "recorded_at" in rows[0]:
+            rows.sort(key=lambda row: row["recorded_at"])
+
+        events = []
+        with self._lock:
+            for row in rows:
+                health = self._sensors.get(row["sensor"])
+                if health is None:
+                    health = self._sensors[row["sensor"]] = SensorHealth(row["sensor"])
+                health.last_seen = now
+                score = health.update(float(row["value"]), self.alpha, self.MIN_STD)
+                if score > self.SPIKE_SIGMAS and health.readings > self.WARMUP_READINGS:
+                    health.spikes += 1
+                    health.last_spike_at = now
+                    events.append({"event": "spike", **health.to_dict(now)})
+                events.extend(self._update_status(health, now))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sensor-health", daemon=True)
+                self._thread.start()
+        self._notify(events)
+
+    def check(self, now: Optional[float] = None) -> None:
+        """Re-evaluate every sensor's status, e.g. to notice one that went silent."""
+        now = time.time() if now is None else now
+        events = []
+        with self._lock:
+            for health in self._sensors.values():
+                events.extend(self._update_status(health, now))
+        self._notify(events)
+
+    def rolling_std(self, sensor: str) -> Optional[float]:
+        """The sensor's rolling standard deviation, or None before ``WARMUP_READINGS``."""
+        with self._lock:
+            health = self._sensors.get(sensor)
+            if health is None or health.readings < self.WARMUP_READINGS:
+                return None
+            return math.sqrt(health.variance)
+
+    def get_health(self, sensors: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Current health per sensor.
+
+        Args:
+            sensors: Restrict to these sensors (default all).
+
+        Returns:
+            tuple: (list of health dictionaries sorted by sensor, error_dict, status_code)
+        """
+        now = time.time()
+        self.check(now)
+        wanted = set(sensors) if sensors else None
+        with self._lock:
+            result = [
+                self._sensors[sensor].to_dict(now)
+                for sensor in sorted(self._sensors)
+                if wanted is None or sensor in wanted
+            ]
+        return result, None, 200
+
+    def _status(self, health: SensorHealth, now: float) -> str:
+        if now - health.last_seen > self.stale_seconds:
+            return "stale"
+        if health.value <= self.RAIL_MARGIN or health.value >= self.MAX_RAW_VALUE - self.RAIL_MARGIN:
+            return "out_of_range"
+        if health.flat_readings >= self.FLATLINE_READINGS:
+            return "flatline"
+        return "ok"
+
+    def _update_status(self, health: SensorHealth, now: float) -> List[Dict[str, Any]]:
+        # Caller holds the lock
+        status = self._status(health, now)
+        if status == health.status:
+            return []
+        previous, health.status = health.status, status
+        logger.log(
+            logging.INFO if status == "ok" else logging.WARNING,
+            f"Sensor {health.sensor} is {status} (was {previous})",
+        )
+        return [{"event": status, "previous_status": previous, **health.to_dict(now)}]
+
+    def _notify(self, events: List[Dict[str, Any]]) -> None:
+        # Called without the lock held, so listeners may call back into the monitor
+        if not events:
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for event in events:
+            for listener in listeners:
+                try:
+                    listener(dict(event))
+                except Exception as e:
+                    logger.error(f"Error in sensor health listener: {e}", exc_info=True)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.CHECK_SECONDS)
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Error checking sensor health: {e}", exc_info=True)
@@ -0,0 +1,126 @@
+"""Service for the monthly partitions of ``sensor_readings``."""
+import logging
+import re
+import threading
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, List, Optional, Set, Tuple
+from app.config import Config
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+
+class SensorPartitionService:
+    """Creates monthly partitions on demand and drops expired ones.
+
+    Old data is removed by dropping whole partitions, which is instant and
+    leaves nothing for VACUUM, instead of DELETE-ing rows.
+    """
+
+    PARENT_TABLE = "sensor_readings"
+    PARTITION_NAME = re.compile(r"^sensor_readings_p(\d{4})_(\d{2})$")
+    # Serializes partition DDL across processes (web workers, ingest listener)
+    ADVISORY_LOCK_KEY = 0x5E750001
+    # Partitions this process has created or seen; saves a catalog lookup per batch
+    _known: Set[date] = set()
+    _known_lock = threading.Lock()
+
+    @staticmethod
+    def month_start(value: datetime) -> date:
+        return date(value.year, value.month, 1)
+
+    @staticmethod
+    def _add_months(month: date, months: int) -> date:
+        index = month.year * 12 + month.month - 1 + months
+        return date(index // 12, index % 12 + 1, 1)
+
+    @staticmethod
+    def partition_name(month: date) -> str:
+        return f"{SensorPartitionService.PARENT_TABLE}_p{month.year:04d}_{month.month:02d}"
+
+    @staticmethod
+    def ensure_partitions(timestamps: Iterable[datetime]) -> None:
+        """Make sure a partition exists for the month of every timestamp.
+
+        The DDL commits in its own transaction, so a partition survives even
+        if the caller's insert is rolled back. A no-op once the months are known.
+        """
+        months = {SensorPartitionService.month_start(ts) for ts in timestamps}
+        with SensorPartitionService._known_lock:
+            missing = sorted(months - SensorPartitionService._known)
+        if not missing:
+            return
+
+        with db.engine.begin() as connection:
+            connection.execute(
+                db.text("SELECT pg_advisory_xact_lock(:key)"), {"key": SensorPartitionService.ADVISORY_LOCK_KEY}
+            )
+            for month in missing:
+                upper = SensorPartitionService._add_months(month, 1)
+                # Bounds are literals: DDL cannot take bind parameters
+                connection.execute(db.text(
+                    f"CREATE TABLE IF NOT EXISTS {SensorPartitionService.partition_name(month)} "
+                    f"PARTITION OF {SensorPartitionService.PARENT_TABLE} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                ))
+        with SensorPartitionService._known_lock:
+            SensorPartitionService._known.update(missing)
+
+    @staticmethod
+    def list_partitions(connection: Any = None) -> List[date]:
+        """Months that currently have a partition, oldest first."""
+        names = (connection or db.session).scalars(db.text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = :parent"
+        ), {"parent": SensorPartitionService.PARENT_TABLE})
+        months = []
+        for name in names:
+            match = SensorPartitionService.PARTITION_NAME.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    @staticmethod
+    def maintain(now: Optional[datetime] = None) -> List[str]:
+        """Create this and next month's partitions and drop expired ones.
+
+        Partitions whose whole month lies before the retention window
+        (``SENSOR_READING_RETENTION_MONTHS``, 0 keeps everything) are dropped.
+
+        Returns:
+            list: Names of the dropped partitions.
+        """
+        now = now or datetime.now(timezone.utc)
+        current = SensorPartitionService.month_start(now)
+        dropped: List[Tuple[date, str]] = []
+        try:
+            SensorPartitionService.ensure_partitions([
+                datetime(current.year, current.month, 1),
+                datetime.combine(SensorPartitionService._add_months(current, 1), datetime.min.time()),
+            ])
+
+            retention = Config.SENSOR_READING_RETENTION_MONTHS
+            if retention > 0:
+                oldest_kept = SensorPartitionService._add_months(current, -retention)
+                with db.engine.begin() as connection:
+                    connection.execute(
+                        db.text("SELECT pg_advisory_xact_lock(:key)"), {"key": SensorPartitionService.ADVISORY_LOCK_KEY}
+                    )
+                    for month in SensorPartitionService.list_partitions(connection):
+                        if month >= oldest_kept:
+                            break
+                        name = SensorPartitionService.partition_name(month)
+                        connection.execute(db.text(f"DROP TABLE IF EXISTS {name}"))
+                        dropped.append((month, name))
+                with SensorPartitionService._known_lock:
+                    SensorPartitionService._known.difference_update(month for month, _ in dropped)
+        except Exception as e:
+            logger.error(f"Error maintaining sensor reading partitions: {e}", exc_info=True)
+            return []
+
+        names = [name for _, name in dropped]
+        if names:
+            logger.info(f"Dropped expired sensor reading partitions: {', '.join(names)}")
+        return names
@@ -0,0 +1,465 @@
+"""Service for sensor readings: buffered and batched ingestion.
+
+Batches come in two encodings, both carrying client timestamps so devices
+can buffer through Wi-Fi outages and backfill later:
+
+* JSON: an array of ``[sensor, ts, value]`` triples, or an object
+  ``{"device": ..., "boot": ..., "seq": ..., "readings": [triples]}``.
+* Binary (``application/octet-stream``), little-endian::
+
+      u8  version (1, or 2 with the sequence header)
+      [version 2: u8 device name length, UTF-8 device name, u32 boot, u32 seq]
+      u8  sensor count S
+      S x (u8 name length, UTF-8 name)
+      N x (u8 sensor index, i32 ts, u16 value)    # 7 bytes per reading
+
+``ts`` is Unix time in seconds; zero or negative values are offsets from
+the moment the batch is received, for devices without a real-time clock
+(e.g. ``-(millis() - taken_at) / 1000``).
+
+With a sequence header the readings are numbered ``seq``, ``seq + 1``, ...
+in batch order, so a retried batch is recognised and dropped (see
+``reading_sequence_service.py``).
+"""
+import atexit
+import logging
+import math
+import struct
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from flask import Flask
+from app.database import db
+from app.models.sensor_readings import SensorReading
+from app.services.reading_notification_service import notify_readings
+from app.services.sensor_partition_service import SensorPartitionService
+from app.services.sensor_rollup_service import SensorRollupService
+
+logger = logging.getLogger(__name__)
+
+
+def insert_readings(rows: List[Dict[str, Any]]) -> None:
+    """INSERT readings in one statement, whatever the batch size.
+
+    Columns are sent as three arrays and expanded with ``unnest``, so the
+    statement text (and Postgres' cached plan) is the same for every batch,
+    unlike a multi-row VALUES list whose size varies. The inserted rows are
+    folded into the rollups by the same statement. Missing monthly
+    partitions are created first. The caller commits.
+    """
+    SensorPartitionService.ensure_partitions(row["recorded_at"] for row in rows)
+    readings = SensorReading.__table__
+    inserted = (
+        db.insert(readings)
+        .from_select(
+            ["sensor", "value", "recorded_at"],
+            db.select(
+                db.func.unnest(db.bindparam("sensors", type_=db.ARRAY(db.String))),
+                db.func.unnest(db.bindparam("values", type_=db.ARRAY(db.Float))),
+                db.func.unnest(db.bindparam("recorded_ats", type_=db.ARRAY(db.DateTime))),
+            ),
+        )
+        .returning(readings.c.sensor, readings.c.value, readings.c.recorded_at)
+        .cte("inserted")
+    )
+    db.session.execute(
+        SensorRollupService.upsert_statement(inserted),
+        {
+            "sensors": [row["sensor"] for row in rows],
+            "values": [float(row["value"]) for row in rows],
+            "recorded_ats": [row["recorded_at"] for row in rows],
+        },
+    )
+
+
+class SensorReadingWriter:
+    """Buffers readings in memory and writes them in batched INSERTs.
+
+    ``add`` only appends to the buffer, so ingestion never waits on the
+    database. A background thread flushes when ``batch_size`` readings are
+    waiting or every ``flush_interval_seconds``, whichever comes first, and
+    once more at interpreter exit. If the database is down the buffer is
+    kept, up to ``max_buffered`` readings; beyond that the oldest are dropped.
+    The same thread runs partition maintenance (see ``SensorPartitionService``)
+    at start and then hourly.
+    """
+
+    PARTITION_MAINTENANCE_SECONDS = 3600.0
+
+    def __init__(
+        self,
+        app: Flask,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 2.0,
+        max_buffered: int = 50000,
+        notify: bool = False,
+    ) -> None:
+        """Initialize the writer. The flush thread starts with the first reading.
+
+        Args:
+            app: Flask app whose database the readings are written to.
+            batch_size: Buffered readings that trigger a flush.
+            flush_interval_seconds: Longest time a reading waits in the buffer.
+            max_buffered: Readings kept in memory while writes are failing.
+            notify: Announce written readings to the web processes (see
+                ``reading_notification_service.py``).
+        """
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffered = max_buffered
+        self.notify = notify
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._stats = {"accepted": 0, "written": 0, "dropped": 0, "failed_flushes": 0}
+        atexit.register(self.stop)
+
+    def add(self, sensor: str, value: float, recorded_at: Optional[datetime] = None) -> None:
+        """Queue one reading. ``recorded_at`` defaults to now."""
+        self.add_many([{
+            "sensor": sensor,
+            "value": value,
+            "recorded_at": recorded_at or datetime.now(timezone.utc),
+        }])
+
+    def add_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Queue readings given as ``{"sensor", "value", "recorded_at"}`` dicts."""
+        with self._lock:
+            self._buffer.extend(rows)
+            self._stats["accepted"] += len(rows)
+            self._trim()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sensor-reading-writer", daemon=True)
+                self._thread.start()
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.notify()
+
+    def flush(self) -> int:
+        """Write all buffered readings now.
+
+        Returns:
+            int: Number of readings written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            with self.app.app_context():
+                try:
+                    insert_readings(rows)
+                    if self.notify:
+                        notify_readings(rows)
+                    db.session.commit()
+                    with self._lock:
+                        self._stats["written"] += len(rows)
+                    logger.debug(f"Wrote {len(rows)} sensor reading(s)")
+                    return len(rows)
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Error writing {len(rows)} sensor reading(s): {e}", exc_info=True)
+
+            # Keep the rows for the next flush, but never grow without bound
+            with self._lock:
+                self._buffer = rows + self._buffer
+                self._stats["failed_flushes"] += 1
+                self._trim()
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since start, plus the current buffer size."""
+        with self._lock:
+            return {**self._stats, "buffered": len(self._buffer)}
+
+    def stop(self) -> None:
+        """Stop the flush thread and write what is left."""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        failing = False
+        next_maintenance = 0.0
+        while True:
+            if time.monotonic() >= next_maintenance:
+                with self.app.app_context():
+                    SensorPartitionService.maintain()
+                next_maintenance = time.monotonic() + self.PARTITION_MAINTENANCE_SECONDS
+            with self._lock:
+                if failing:
+                    # Back off instead of retrying a full buffer in a tight loop
+                    self._wakeup.wait(self.flush_interval_seconds)
+                else:
+                    self._wakeup.wait_for(
+                        lambda: self._stopping or len(self._buffer) >= self.batch_size,
+                        timeout=self.flush_interval_seconds,
+                    )
+                if self._stopping:
+                    return
+                failed_flushes = self._stats["failed_flushes"]
+            self.flush()
+            with self._lock:
+                failing = self._stats["failed_flushes"] > failed_flushes
+
+    def _trim(self) -> None:
+        # Caller holds the lock. Oldest readings go first.
+        overflow = len(self._buffer) - self.max_buffered
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self._stats["dropped"] += overflow
+            logger.warning(f"Sensor reading buffer full, dropped {overflow} oldest reading(s)")
+
+
+class SensorReadingService:
+    """Service class for sensor reading batches."""
+
+    MAX_RAW_VALUE = 1023
+    MAX_SENSOR_LENGTH = 64
+    MAX_BATCH_READINGS = 5000
+    MAX_CLOCK_SKEW = timedelta(minutes=5)
+    MAX_BACKFILL = timedelta(days=30)
+    # Backfilled readings older than this never drive the watering controller
+    FRESH_READING_AGE = timedelta(seconds=60)
+
+    MAX_SEQUENCE = 2**32 - 1
+
+    BINARY_VERSIONS = (1, 2)
+    _BINARY_SEQUENCE = struct.Struct("<II")
+    _BINARY_RECORD = struct.Struct("<BiH")
+    # Largest possible binary batch: header, 255 max-length names, full record list
+    MAX_BINARY_BYTES = (
+        2 + (1 + MAX_SENSOR_LENGTH + _BINARY_SEQUENCE.size)
+        + 255 * (1 + MAX_SENSOR_LENGTH)
+        + MAX_BATCH_READINGS * _BINARY_RECORD.size
+    )
+
+    @staticmethod
+    def validate_reading(sensor: Any, value: Any) -> Optional[str]:
+        """Check one reading's sensor name and raw value. Returns an error message or None."""
+        if not isinstance(sensor, str) or not sensor.strip():
+            return "sensor is required"
+        if len(sensor.strip()) > SensorReadingService.MAX_SENSOR_LENGTH:
+            return f"sensor must be at most {SensorReadingService.MAX_SENSOR_LENGTH} characters"
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or not 0 <= value <= SensorReadingService.MAX_RAW_VALUE
+        ):
+            return f"value must be a number between 0 and {SensorReadingService.MAX_RAW_VALUE}"
+        return None
+
+    @staticmethod
+    def validate_sequence(device: Any, boot: Any, seq: Any) -> Optional[str]:
+        """Check a reading's device name, boot id and sequence number. Returns an error message or None."""
+        if not isinstance(device, str) or not device.strip():
+            return "device is required with seq"
+        if len(device.strip()) > SensorReadingService.MAX_SENSOR_LENGTH:
+            return f"device must be at most {SensorReadingService.MAX_SENSOR_LENGTH} characters"
+        for name, number in (("boot", boot), ("seq", seq)):
+            if isinstance(number, bool) or not isinstance(number, int) or not 0 <= number <= SensorReadingService.MAX_SEQUENCE:
+                return f"{name} must be an integer between 0 and {SensorReadingService.MAX_SEQUENCE}"
+        return None
+
+    @staticmethod
+    def parse_sequence(data: Dict[str, Any], default_device: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Read the optional ``device``/``boot``/``seq`` fields of a reading or batch.
+
+        Args:
+            data: JSON object with the fields.
+            default_device: Device used when ``device`` is omitted.
+
+        Returns:
+            tuple: (``{"device", "boot", "seq"}`` or None without ``seq``, error_message)
+        """
+        if data.get("seq") is None:
+            return None, None
+        device = data.get("device", default_device)
+        boot = data.get("boot", 0)
+        error = SensorReadingService.validate_sequence(device, boot, data["seq"])
+        if error:
+            return None, error
+        return {"device": device.strip(), "boot": boot, "seq": data["seq"]}, None
+
+    @staticmethod
+    def _recorded_at(ts: Any, received_at: datetime) -> Optional[datetime]:
+        if isinstance(ts, bool) or not isinstance(ts, (int, float)) or not math.isfinite(ts):
+            return None
+        try:
+            if ts <= 0:
+                recorded_at = received_at + timedelta(seconds=ts)
+            else:
+                recorded_at = datetime.fromtimestamp(ts, timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return None
+        if not received_at - SensorReadingService.MAX_BACKFILL <= recorded_at <= received_at + SensorReadingService.MAX_CLOCK_SKEW:
+            return None
+        return recorded_at
+
+    @staticmethod
+    def _ts_error(index: int) -> str:
+        return (
+            f"reading {index}: ts must be a Unix time within the last "
+            f"{SensorReadingService.MAX_BACKFILL.days} days and not in the future"
+        )
+
+    @staticmethod
+    def parse_json_batch(data: Any, received_at: datetime) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """Decode a JSON array of ``[sensor, ts, value]`` triples, bare or in a sequence envelope.
+
+        Returns:
+            tuple: (rows, error_message)
+        """
+        sequence = None
+        if isinstance(data, dict):
+            sequence, message = SensorReadingService.parse_sequence(data)
+            if message:
+                return None, message
+            data = data.get("readings")
+        if not isinstance(data, list) or not data:
+            return None, "body must be a non-empty array of [sensor, ts, value]"
+        if len(data) > SensorReadingService.MAX_BATCH_READINGS:
+            return None, f"at most {SensorReadingService.MAX_BATCH_READINGS} readings per batch"
+
+        rows = []
+        for index, item in enumerate(data):
+            if not isinstance(item, list) or len(item) != 3:
+                return None, f"reading {index}: must be [sensor, ts, value]"
+            sensor, ts, value = item
+            error = SensorReadingService.validate_reading(sensor, value)
+            if error:
+                return None, f"reading {index}: {error}"
+            recorded_at = SensorReadingService._recorded_at(ts, received_at)
+            if recorded_at is None:
+                return None, SensorReadingService._ts_error(index)
+            rows.append({"sensor": sensor.strip(), "value": value, "recorded_at": recorded_at})
+        if sequence:
+            SensorReadingService._number(rows, sequence)
+        return rows, None
+
+    @staticmethod
+    def _number(rows: List[Dict[str, Any]], sequence: Dict[str, Any]) -> None:
+        for index, row in enumerate(rows):
+            row.update(device=sequence["device"], boot=sequence["boot"], seq=sequence["seq"] + index)
+
+    @staticmethod
+    def parse_binary_batch(body: bytes, received_at: datetime) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """Decode a packed binary batch (see the module docstring).
+
+        Returns:
+            tuple: (rows, error_message)
+        """
+        if len(body) < 2 or body[0] not in SensorReadingService.BINARY_VERSIONS:
+            versions = " or ".join(str(version) for version in SensorReadingService.BINARY_VERSIONS)
+            return None, f"binary batch must start with version byte {versions}"
+
+        offset = 1
+        sequence = None
+        if body[0] == 2:
+            length = body[offset]
+            name = body[offset + 1:offset + 1 + length]
+            offset += 1 + length
+            if len(name) != length or offset + SensorReadingService._BINARY_SEQUENCE.size >= len(body):
+                return None, "truncated sequence header"
+            boot, seq = SensorReadingService._BINARY_SEQUENCE.unpack_from(body, offset)
+            offset += SensorReadingService._BINARY_SEQUENCE.size
+            try:
+                device = name.decode("utf-8")
+            except UnicodeDecodeError:
+                return None, "device name must be UTF-8"
+            error = SensorReadingService.validate_sequence(device, boot, seq)
+            if error:
+                return None, error
+            sequence = {"device": device.strip(), "boot": boot, "seq": seq}
+
+        sensors: List[str] = []
+        sensor_count = body[offset]
+        offset += 1
+        for _ in range(sensor_count):
+            if offset >= len(body):
+                return None, "truncated sensor table"
+            length = body[offset]
+            name = body[offset + 1:offset + 1 + length]
+            offset += 1 + length
+            try:
+                sensor = name.decode("utf-8")
+            except UnicodeDecodeError:
+                return None, "sensor names must be UTF-8"
+            error = SensorReadingService.validate_reading(sensor, 0) if len(name) == length else "truncated sensor table"
+            if error:
+                return None, error
+            sensors.append(sensor.strip())
+
+        records = memoryview(body)[offset:]
+        record_size = SensorReadingService._BINARY_RECORD.size
+        if not records or len(records) % record_size:
+            return None, f"readings must be a non-empty sequence of {record_size}-byte records"
+        if len(records) // record_size > SensorReadingService.MAX_BATCH_READINGS:
+            return None, f"at most {SensorReadingService.MAX_BATCH_READINGS} readings per batch"
+
+        rows = []
+        for index, (sensor_index, ts, value) in enumerate(SensorReadingService._BINARY_RECORD.iter_unpack(records)):
+            if sensor_index >= len(sensors):
+                return None, f"reading {index}: unknown sensor index {sensor_index}"
+            if value > SensorReadingService.MAX_RAW_VALUE:
+                return None, f"reading {index}: value must be between 0 and {SensorReadingService.MAX_RAW_VALUE}"
+            recorded_at = SensorReadingService._recorded_at(ts, received_at)
+            if recorded_at is None:
+                return None, SensorReadingService._ts_error(index)
+            rows.append({"sensor": sensors[sensor_index], "value": value, "recorded_at": recorded_at})
+        if sequence:
+            SensorReadingService._number(rows, sequence)
+        return rows, None
+
+    @staticmethod
+    def latest_per_sensor(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Newest row of each sensor in a batch."""
+        latest: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            current = latest.get(row["sensor"])
+            if current is None or row["recorded_at"] >= current["recorded_at"]:
+                latest[row["sensor"]] = row
+        return list(latest.values())
+
+    @staticmethod
+    def fresh_latest(rows: List[Dict[str, Any]], received_at: datetime) -> List[Tuple[str, float]]:
+        """Newest reading per sensor, if it is recent enough to act on."""
+        return [
+            (row["sensor"], row["value"])
+            for row in SensorReadingService.latest_per_sensor(rows)
+            if received_at - row["recorded_at"] <= SensorReadingService.FRESH_READING_AGE
+        ]
+
+    @staticmethod
+    def insert_batch(rows: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Write a validated batch with a single INSERT.
+
+        Unlike single readings, batches are written before responding, so a
+        device may drop its local buffer once it gets a 201.
+
+        Returns:
+            tuple: (summary_dict, error_dict, status_code)
+        """
+        try:
+            insert_readings(rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error writing batch of {len(rows)} sensor reading(s): {e}", exc_info=True)
+            return None, {"error": "Failed to store readings"}, 500
+
+        recorded = [row["recorded_at"] for row in rows]
+        return {
+            "accepted": len(rows),
+            "first_recorded_at": min(recorded),
+            "last_recorded_at": max(recorded),
+        }, None, 201
@@ -0,0 +1,205 @@
+"""Service for the sensor registry: which plant a sensor is in, and its calibration."""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from app.config import Config
+from app.database import db
+from app.models.sensors import Sensor
+
+logger = logging.getLogger(__name__)
+
+
+class SensorCalibration:
+    """Piecewise-linear curve from raw ``analogRead`` values to 0..100 percent.
+
+    Raw values outside the curve are clamped to its end points. Conversion
+    takes and returns whole NumPy arrays.
+    """
+
+    MAX_POINTS = 16
+
+    def __init__(self, points: Sequence[Sequence[float]]) -> None:
+        ordered = sorted(points)
+        self._raw = np.array([point[0] for point in ordered], dtype=np.float64)
+        self._percent = np.array([point[1] for point in ordered], dtype=np.float64)
+
+    @classmethod
+    def default(cls) -> "SensorCalibration":
+        """The straight line between ``MOISTURE_RAW_WET`` (100%) and ``MOISTURE_RAW_DRY`` (0%)."""
+        return cls([[Config.MOISTURE_RAW_WET, 100.0], [Config.MOISTURE_RAW_DRY, 0.0]])
+
+    @staticmethod
+    def validate(points: Any) -> Optional[str]:
+        """Check a ``[[raw, percent], ...]`` list. Returns an error message or None."""
+        if not isinstance(points, list) or not 2 <= len(points) <= SensorCalibration.MAX_POINTS:
+            return f"calibration must be a list of 2 to {SensorCalibration.MAX_POINTS} [raw, percent] points"
+        raws = set()
+        for point in points:
+            if (
+                not isinstance(point, list)
+                or len(point) != 2
+                or any(isinstance(value, bool) or not isinstance(value, (int, float)) for value in point)
+            ):
+                return "calibration points must be [raw, percent] number pairs"
+            raw, percent = point
+            if not 0 <= raw <= 1023 or not 0 <= percent <= 100:
+                return "calibration raw values must be 0..1023 and percents 0..100"
+            raws.add(raw)
+        if len(raws) != len(points):
+            return "calibration raw values must be distinct"
+        return None
+
+    def to_percent(self, raw: Any) -> np.ndarray:
+        """Convert raw values (array or scalar) to percent."""
+        return np.interp(raw, self._raw, self._percent)
+
+
+class SensorRegistryService:
+    """Service class for registered sensors."""
+
+    MAX_NAME_LENGTH = 64
+    MAX_KIND_LENGTH = 32
+    # Names taken by /api/sensors/<...> routes
+    RESERVED_NAMES = ("latest", "health")
+    CALIBRATION_CACHE_SECONDS = 60.0
+    # Units reading endpoints can return values in
+    UNITS = ("raw", "percent")
+
+    _cache_lock = threading.Lock()
+    _calibrations: Dict[str, SensorCalibration] = {}
+    _calibrations_loaded_at: Optional[float] = None
+
+    @staticmethod
+    def list_sensors(plant_id: Optional[int] = None) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], int]:
+        """List registered sensors, optionally only those of one plant.
+
+        Returns:
+            tuple: (list of sensor dictionaries sorted by name, error_dict, status_code)
+        """
+        stmt = db.select(Sensor).order_by(Sensor.name)
+        if plant_id is not None:
+            stmt = stmt.where(Sensor.plant_id == plant_id)
+        return [sensor.to_dict() for sensor in db.session.scalars(stmt)], None, 200
+
+    @staticmethod
+    def get_sensor(name: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Get a registered sensor by name.
+
+        Returns:
+            tuple: (sensor_dict, error_dict, status_code)
+        """
+        sensor = db.session.scalar(db.select(Sensor).where(Sensor.name == name))
+        if sensor is None:
+            return None, {"error": "sensor not found"}, 404
+        return sensor.to_dict(), None, 200
+
+    @staticmethod
+    def put_sensor(name: str, data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Register a sensor or replace its registration.
+
+        Args:
+            name: Sensor name as reported by the firmware.
+            data: Optional ``plant_id`` (null to unassign), ``kind``
+                (default "moisture") and ``calibration`` (``[[raw, percent], ...]``,
+                null for the default curve).
+
+        Returns:
+            tuple: (sensor_dict, error_dict, status_code)
+        """
+        name = name.strip()
+        if not name or len(name) > SensorRegistryService.MAX_NAME_LENGTH:
+            return None, {"error": f"name must be 1 to {SensorRegistryService.MAX_NAME_LENGTH} characters"}, 400
+        if name in SensorRegistryService.RESERVED_NAMES:
+            return None, {"error": f"{name!r} is a reserved name"}, 400
+
+        plant_id = data.get("plant_id")
+        if plant_id is not None and (isinstance(plant_id, bool) or not isinstance(plant_id, int)):
+            return None, {"error": "plant_id must be an integer or null"}, 400
+        kind = data.get("kind", "moisture")
+        if not isinstance(kind, str) or not kind.strip() or len(kind.strip()) > SensorRegistryService.MAX_KIND_LENGTH:
+            return None, {"error": f"kind must be 1 to {SensorRegistryService.MAX_KIND_LENGTH} characters"}, 400
+        calibration = data.get("calibration")
+        if calibration is not None:
+            message = SensorCalibration.validate(calibration)
+            if message:
+                return None, {"error": message}, 400
+            calibration = [[float(raw), float(percent)] for raw, percent in sorted(calibration)]
+
+        values = {"plant_id": plant_id, "kind": kind.strip(), "calibration": calibration}
+        statement = pg_insert(Sensor.__table__).values(name=name, **values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Sensor.__table__.c.name],
+            set_={column: statement.excluded[column] for column in values},
+        ).returning(*Sensor.__table__.c)
+        try:
+            row = db.session.execute(statement).one()
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return None, {"error": "plant not found"}, 404
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error saving sensor {name}: {e}", exc_info=True)
+            return None, {"error": "Failed to save sensor"}, 500
+
+        SensorRegistryService.invalidate()
+        return Sensor(**row._mapping).to_dict(), None, 200
+
+    @staticmethod
+    def delete_sensor(name: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Remove a sensor from the registry. Its readings are kept.
+
+        Returns:
+            tuple: (message_dict, error_dict, status_code)
+        """
+        try:
+            deleted = db.session.execute(
+                db.delete(Sensor.__table__).where(Sensor.__table__.c.name == name).returning(Sensor.__table__.c.id)
+            ).first()
+            if deleted is None:
+                return None, {"error": "sensor not found"}, 404
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error deleting sensor {name}: {e}", exc_info=True)
+            return None, {"error": "Failed to delete sensor"}, 500
+
+        SensorRegistryService.invalidate()
+        return {"message": "sensor deleted"}, None, 200
+
+    @staticmethod
+    def calibration(name: str) -> SensorCalibration:
+        """The sensor's calibration curve, or the default one.
+
+        Curves of all registered sensors are cached for
+        ``CALIBRATION_CACHE_SECONDS``; the registry is small.
+        """
+        service = SensorRegistryService
+        with service._cache_lock:
+            loaded_at = service._calibrations_loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= service.CALIBRATION_CACHE_SECONDS:
+            try:
+                rows = db.session.execute(
+                    db.select(Sensor.name, Sensor.calibration).where(Sensor.calibration.is_not(None))
+                ).all()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error loading sensor calibrations: {e}", exc_info=True)
+                rows = None
+            with service._cache_lock:
+                if rows is not None:
+                    service._calibrations = {row.name: SensorCalibration(row.calibration) for row in rows}
+                # On failure keep the old curves and retry after the next interval
+                service._calibrations_loaded_at = time.monotonic()
+        with service._cache_lock:
+            return service._calibrations.get(name) or SensorCalibration.default()
+
+    @staticmethod
+    def invalidate() -> None:
+        """Reload calibrations on next use, e.g. after a registration changed."""
+        with SensorRegistryService._cache_lock:
+            SensorRegistryService._calibrations_loaded_at = None
@@ -0,0 +1,223 @@
+"""Service for sensor reading rollups: per-minute, per-hour and per-day aggregates.
+
+A month of 5-second readings is half a million rows per sensor; charts read
+the rollups instead. Each inserted batch is folded into all three rollups in
+the same statement (see ``insert_readings``), so they are never behind the
+raw table and survive its retention.
+"""
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.database import db
+from app.models.sensor_reading_rollups import SensorReadingRollup
+from app.models.sensor_readings import SensorReading
+from app.services.note_service import NoteService
+from app.services.sensor_registry_service import SensorRegistryService
+
+logger = logging.getLogger(__name__)
+
+
+class SensorRollupService:
+    """Service class for sensor reading rollups."""
+
+    # Bucket sizes kept in sensor_reading_rollups, finest first
+    RESOLUTIONS = (60, 3600, 86400)
+    RESOLUTION_LABELS = {60: "1m", 3600: "1h", 86400: "1d"}
+    # Buckets are aligned to this midnight, so daily buckets start at 00:00 UTC
+    BUCKET_ORIGIN = datetime(2000, 1, 1)
+    DEFAULT_WINDOW = timedelta(days=1)
+    MAX_WINDOW = timedelta(days=3660)
+    DEFAULT_POINTS = 500
+    MAX_POINTS = 5000
+
+    @staticmethod
+    def _bucket(resolution_seconds: Any, timestamp: Any) -> Any:
+        return db.func.date_bin(
+            resolution_seconds * db.literal_column("INTERVAL '1 second'", db.Interval),
+            timestamp,
+            db.literal(SensorRollupService.BUCKET_ORIGIN, db.DateTime),
+        )
+
+    @staticmethod
+    def upsert_statement(source: Any) -> Any:
+        """INSERT ... ON CONFLICT folding readings into every rollup.
+
+        Args:
+            source: Selectable (e.g. the CTE of an INSERT ... RETURNING) with
+                ``sensor``, ``value`` and ``recorded_at`` columns.
+        """
+        rollups = SensorReadingRollup.__table__
+        resolutions = db.values(
+            db.column("seconds", db.Integer), name="rollup_resolutions"
+        ).data([(seconds,) for seconds in SensorRollupService.RESOLUTIONS])
+        bucket = SensorRollupService._bucket(resolutions.c.seconds, source.c.recorded_at)
+
+        statement = pg_insert(rollups).from_select(
+            ["sensor", "resolution_seconds", "bucket_start", "min_value", "max_value", "value_sum", "value_count"],
+            db.select(
+                source.c.sensor,
+                resolutions.c.seconds,
+                bucket,
+                db.func.min(source.c.value),
+                db.func.max(source.c.value),
+                db.func.sum(source.c.value),
+                db.func.count(),
+            )
+            .select_from(source.join(resolutions, db.true()))
+            .group_by(source.c.sensor, resolutions.c.seconds, bucket)
+            # Concurrent batches then lock shared rollup rows in the same order
+            .order_by(source.c.sensor, resolutions.c.seconds, bucket),
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[rollups.c.sensor, rollups.c.resolution_seconds, rollups.c.bucket_start],
+            set_={
+                "min_value": db.func.least(rollups.c.min_value, statement.excluded.min_value),
+                "max_value": db.func.greatest(rollups.c.max_value, statement.excluded.max_value),
+                "value_sum": rollups.c.value_sum + statement.excluded.value_sum,
+                "value_count": rollups.c.value_count + statement.excluded.value_count,
+            },
+        )
+
+    @staticmethod
+    def pick_resolution(span: timedelta, resolution_seconds: Optional[int], points: int) -> Tuple[int, Optional[int]]:
+        """Choose the bucket size of a series and the table it is read from.
+
+        Without an explicit resolution, the window is split into ``points``
+        buckets. The source is the coarsest rollup no wider than a bucket
+        (``None`` means the raw readings), and the bucket size is rounded
+        up to a multiple of it so rollup buckets never straddle two.
+
+        Returns:
+            tuple: (bucket_seconds, source_resolution_seconds)
+        """
+        if resolution_seconds is None:
+            resolution_seconds = max(1, math.ceil(span.total_seconds() / points))
+        source = max((seconds for seconds in SensorRollupService.RESOLUTIONS if seconds <= resolution_seconds), default=None)
+        if source is not None:
+            resolution_seconds = math.ceil(resolution_seconds / source) * source
+        return resolution_seconds, source
+
+    @staticmethod
+    def parse_window(
+        window_from: Optional[str], window_to: Optional[str], max_window: timedelta
+    ) -> Tuple[Optional[datetime], Optional[datetime], Optional[Dict[str, Any]]]:
+        """Parse ISO ``from``/``to`` bounds; the default is the day up to now.
+
+        Returns:
+            tuple: (start, end, error_dict)
+        """
+        end = NoteService._parse_iso_datetime(window_to) if window_to else datetime.now(timezone.utc)
+        if end is None:
+            return None, None, {"error": "to must be an ISO datetime string"}
+        start = NoteService._parse_iso_datetime(window_from) if window_from else end - SensorRollupService.DEFAULT_WINDOW
+        if start is None:
+            return None, None, {"error": "from must be an ISO datetime string"}
+        if end <= start:
+            return None, None, {"error": "to must be after from"}
+        if end - start > max_window:
+            return None, None, {"error": f"window must be at most {max_window.days} days"}
+        return start, end, None
+
+    @staticmethod
+    def get_series(
+        sensor: str,
+        window_from: Optional[str] = None,
+        window_to: Optional[str] = None,
+        resolution_seconds: Optional[int] = None,
+        points: Optional[int] = None,
+        unit: str = "raw",
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Min/max/avg/count of a sensor's readings per bucket over a window.
+
+        Args:
+            sensor: Sensor name.
+            window_from: ISO datetime window start (default one day before the end).
+            window_to: ISO datetime window end (default now).
+            resolution_seconds: Bucket size; derived from ``points`` when omitted.
+            points: Number of buckets to aim for (default 500).
+            unit: "raw" or "percent" (converted with the sensor's calibration;
+                the percent ``avg`` is the converted raw average).
+
+        Returns:
+            tuple: (series_dict, error_dict, status_code)
+        """
+        start, end, error = SensorRollupService.parse_window(window_from, window_to, SensorRollupService.MAX_WINDOW)
+        if error:
+            return None, error, 400
+
+        points = SensorRollupService.DEFAULT_POINTS if points is None else points
+        if not 1 <= points <= SensorRollupService.MAX_POINTS:
+            return None, {"error": f"points must be between 1 and {SensorRollupService.MAX_POINTS}"}, 400
+        if unit not in SensorRegistryService.UNITS:
+            return None, {"error": f"unit must be one of {', '.join(SensorRegistryService.UNITS)}"}, 400
+        if resolution_seconds is not None:
+            if resolution_seconds < 1:
+                return None, {"error": "resolution must be a positive number of seconds"}, 400
+            if (end - start).total_seconds() / resolution_seconds > SensorRollupService.MAX_POINTS:
+                return None, {"error": f"resolution too fine: at most {SensorRollupService.MAX_POINTS} buckets per window"}, 400
+
+        resolution_seconds, source = SensorRollupService.pick_resolution(end - start, resolution_seconds, points)
+        if source is None:
+            readings = SensorReading.__table__
+            bucket = SensorRollupService._bucket(resolution_seconds, readings.c.recorded_at).label("bucket")
+            stmt = db.select(
+                bucket,
+                db.func.min(readings.c.value),
+                db.func.max(readings.c.value),
+                db.func.sum(readings.c.value),
+                db.func.count(),
+            ).where(
+                readings.c.sensor == sensor,
+                readings.c.recorded_at >= start,
+                readings.c.recorded_at < end,
+            )
+        else:
+            rollups = SensorReadingRollup.__table__
+            bucket = SensorRollupService._bucket(resolution_seconds, rollups.c.bucket_start).label("bucket")
+            stmt = db.select(
+                bucket,
+                db.func.min(rollups.c.min_value),
+                db.func.max(rollups.c.max_value),
+                db.func.sum(rollups.c.value_sum),
+                db.func.sum(rollups.c.value_count),
+            ).where(
+                rollups.c.sensor == sensor,
+                rollups.c.resolution_seconds == source,
+                # Include the bucket that contains the window start
+                rollups.c.bucket_start > start - timedelta(seconds=source),
+                rollups.c.bucket_start < end,
+            )
+
+        try:
+            rows = db.session.execute(stmt.group_by(bucket).order_by(bucket)).all()
+        except Exception as e:
+            logger.error(f"Error reading series for sensor {sensor}: {e}", exc_info=True)
+            return None, {"error": "Failed to read sensor series"}, 500
+
+        lows = np.array([row[1] for row in rows], dtype=np.float64)
+        highs = np.array([row[2] for row in rows], dtype=np.float64)
+        counts = np.array([row[4] for row in rows], dtype=np.int64)
+        averages = np.array([row[3] for row in rows], dtype=np.float64) / np.maximum(counts, 1)
+        if unit == "percent":
+            curve = SensorRegistryService.calibration(sensor)
+            lows, highs = np.round(curve.to_percent(lows), 2), np.round(curve.to_percent(highs), 2)
+            # Drier soil reads higher, so the curve may swap min and max
+            lows, highs = np.minimum(lows, highs), np.maximum(lows, highs)
+            averages = np.round(curve.to_percent(averages), 2)
+        return {
+            "sensor": sensor,
+            "from": start,
+            "to": end,
+            "unit": unit,
+            "resolution_seconds": resolution_seconds,
+            "source": SensorRollupService.RESOLUTION_LABELS.get(source, "raw"),
+            "buckets": [
+                {"start": row[0], "min": low, "max": high, "avg": average, "count": count}
+                for row, low, high, average, count in zip(
+                    rows, lows.tolist(), highs.tolist(), averages.tolist(), counts.tolist()
+                )
+            ],
+        }, None, 200
@@ -0,0 +1,140 @@
+"""Service for raw sensor reading series, downsampled for charts."""
+import logging
+from datetime import timedelta
+from itertools import chain
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from app.database import db
+from app.models.sensor_readings import SensorReading
+from app.services.sensor_registry_service import SensorRegistryService
+from app.services.sensor_rollup_service import SensorRollupService
+
+logger = logging.getLogger(__name__)
+
+
+def lttb(ts: np.ndarray, values: np.ndarray, points: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``points`` samples that keep the shape.
+
+    The first and last samples are kept; the rest are split into
+    ``points - 2`` equal buckets, and from each bucket the sample forming the
+    largest triangle with the previously kept sample and the next bucket's
+    average is kept. Bucket bounds and averages are computed for all buckets
+    at once; only the pick itself walks the buckets, since each depends on the
+    previous one.
+
+    Args:
+        ts: Sample times, ascending.
+        values: Sample values.
+        points: Number of samples to keep (at least 3).
+
+    Returns:
+        ndarray: Ascending indices into ``ts``/``values``.
+    """
+    count = len(ts)
+    if points >= count:
+        return np.arange(count)
+
+    # Relative times keep the triangle areas well within float precision
+    x = ts - ts[0]
+    y = values
+    edges = np.arange(points - 1) * (count - 2) // (points - 2) + 1
+    sizes = np.diff(edges)
+    # Average of each bucket; the last bucket's "next" is the final sample
+    avg_x = np.append(np.add.reduceat(x[:-1], edges[:-1])[1:] / sizes[1:], x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], edges[:-1])[1:] / sizes[1:], y[-1])
+
+    picked = np.empty(points, dtype=np.intp)
+    picked[0], picked[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - avg_x[bucket]) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y[bucket] - py))
+        previous = lo + int(np.argmax(areas))
+        picked[bucket + 1] = previous
+    return picked
+
+
+class SensorSeriesService:
+    """Service class for downsampled raw reading series."""
+
+    DEFAULT_POINTS = 500
+    MAX_POINTS = 5000
+    # About 540k rows per sensor at one reading per 5 s; wider ranges use rollups
+    MAX_WINDOW = timedelta(days=31)
+    # Rows per round-trip of the server-side cursor
+    FETCH_ROWS = 20000
+
+    @staticmethod
+    def get_readings(
+        sensor: str,
+        window_from: Optional[str] = None,
+        window_to: Optional[str] = None,
+        points: Optional[int] = None,
+        unit: str = "raw",
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """A sensor's readings over a window, downsampled to at most ``points``.
+
+        The rows are streamed through a server-side cursor straight into
+        NumPy arrays, so memory is bounded by the arrays, not by row objects.
+
+        Args:
+            sensor: Sensor name.
+            window_from: ISO datetime window start (default one day before the end).
+            window_to: ISO datetime window end (default now).
+            points: Samples to return (default 500).
+            unit: "raw" or "percent" (converted with the sensor's calibration).
+
+        Returns:
+            tuple: (columnar dict with parallel ``ts`` (Unix seconds) and
+            ``value`` lists, error_dict, status_code)
+        """
+        start, end, error = SensorRollupService.parse_window(window_from, window_to, SensorSeriesService.MAX_WINDOW)
+        if error:
+            return None, error, 400
+        points = SensorSeriesService.DEFAULT_POINTS if points is None else points
+        if not 3 <= points <= SensorSeriesService.MAX_POINTS:
+            return None, {"error": f"points must be between 3 and {SensorSeriesService.MAX_POINTS}"}, 400
+        if unit not in SensorRegistryService.UNITS:
+            return None, {"error": f"unit must be one of {', '.join(SensorRegistryService.UNITS)}"}, 400
+
+        readings = SensorReading.__table__
+        stmt = (
+            db.select(
+                db.cast(db.func.extract("epoch", readings.c.recorded_at), db.Float),
+                readings.c.value,
+            )
+            .where(
+                readings.c.sensor == sensor,
+                readings.c.recorded_at >= start,
+                readings.c.recorded_at < end,
+            )
+            .order_by(readings.c.recorded_at)
+            .execution_options(yield_per=SensorSeriesService.FETCH_ROWS)
+        )
+        try:
+            result = db.session.execute(stmt)
+            # fromiter over the flattened rows is far faster than np.array on Row objects
+            chunks = [
+                np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=2 * len(rows)).reshape(-1, 2)
+                for rows in result.partitions()
+            ]
+        except Exception as e:
+            logger.error(f"Error reading readings for sensor {sensor}: {e}", exc_info=True)
+            return None, {"error": "Failed to read sensor readings"}, 500
+
+        series = np.concatenate(chunks) if chunks else np.empty((0, 2))
+        ts, values = series[:, 0], series[:, 1]
+        picked = lttb(ts, values, points)
+        values = values[picked]
+        if unit == "percent":
+            values = np.round(SensorRegistryService.calibration(sensor).to_percent(values), 2)
+        return {
+            "sensor": sensor,
+            "from": start,
+            "to": end,
+            "unit": unit,
+            "total": len(ts),
+            "ts": np.round(ts[picked], 3).tolist(),
+            "value": values.tolist(),
+        }, None, 200
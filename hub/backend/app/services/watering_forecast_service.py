@@ -0,0 +1,180 @@
+"""Service for watering forecasts: when each plant's soil will reach its threshold.
+
+Soil dries roughly exponentially between waterings. For every plant with a
+watering rule, the moisture since the last watering (15-minute averages of
+the 1-minute rollups, in percent) is fitted with ``percent = level *
+exp(-rate * t)``, and the fit is solved for the rule's ``low_percent``.
+
+Fitting runs on a background thread, only for sensors with new rollups, so
+plant payloads just read the cached ``next_water_at``.
+"""
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+import numpy as np
+from flask import Flask, current_app
+from app.database import db
+from app.models.sensor_reading_rollups import SensorReadingRollup
+from app.models.watering_rules import WateringRule
+from app.services.sensor_registry_service import SensorRegistryService
+from app.services.sensor_rollup_service import SensorRollupService
+
+logger = logging.getLogger(__name__)
+
+
+class WateringForecastService:
+    """Caches ``next_water_at`` per plant, refreshed by a background thread."""
+
+    FIT_WINDOW = timedelta(days=3)
+    BUCKET_SECONDS = 900
+    # Two hours of 15-minute buckets
+    MIN_POINTS = 8
+    # A rise this large between buckets means the plant was watered
+    REWET_PERCENT = 5.0
+    # Floor for the log fit; sensors read 0% well before the soil is bone dry
+    MIN_PERCENT = 0.5
+    MAX_HORIZON = timedelta(days=30)
+    REFRESH_SECONDS = 60.0
+
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    # sensor -> newest 1-minute bucket the fit has seen, and the fit itself
+    _seen: Dict[str, datetime] = {}
+    _fits: Dict[str, Optional[Tuple[float, float, float]]] = {}
+    _forecasts: Dict[int, Optional[datetime]] = {}
+
+    @staticmethod
+    def next_water_at(plant_id: int) -> Optional[datetime]:
+        """The cached forecast for a plant (None without a rule or a drying trend).
+
+        Never fits: the first call only starts the refresh thread.
+        """
+        service = WateringForecastService
+        if service._thread is None:
+            service.start(current_app._get_current_object())
+        with service._lock:
+            return service._forecasts.get(plant_id)
+
+    @staticmethod
+    def start(app: Flask) -> None:
+        """Start the refresh thread once per process."""
+        service = WateringForecastService
+        with service._lock:
+            if service._thread is not None:
+                return
+            service._thread = threading.Thread(target=service._run, args=(app,), name="watering-forecast", daemon=True)
+            service._thread.start()
+
+    @staticmethod
+    def refresh(now: Optional[datetime] = None) -> int:
+        """Refit the sensors with new rollups and recompute every plant's forecast.
+
+        Returns:
+            int: Number of sensors refitted.
+        """
+        service = WateringForecastService
+        now = now or datetime.now(timezone.utc)
+        rules = db.session.execute(db.select(WateringRule.plant_id, WateringRule.sensor, WateringRule.low_percent)).all()
+        sensors = {rule.sensor for rule in rules}
+
+        rollups = SensorReadingRollup.__table__
+        window = (rollups.c.resolution_seconds == 60, rollups.c.bucket_start >= now - service.FIT_WINDOW)
+        newest: Dict[str, datetime] = {}
+        if sensors:
+            newest = dict(db.session.execute(
+                db.select(rollups.c.sensor, db.func.max(rollups.c.bucket_start))
+                .where(rollups.c.sensor.in_(sensors), *window)
+                .group_by(rollups.c.sensor)
+            ).all())
+        with service._lock:
+            changed = {sensor for sensor in sensors if newest.get(sensor) != service._seen.get(sensor)}
+
+        fits: Dict[str, Optional[Tuple[float, float, float]]] = {sensor: None for sensor in changed}
+        if changed:
+            bucket = SensorRollupService._bucket(service.BUCKET_SECONDS, rollups.c.bucket_start).label("bucket")
+            rows = db.session.execute(
+                db.select(
+                    rollups.c.sensor,
+                    db.cast(db.func.extract("epoch", bucket), db.Float),
+                    db.func.sum(rollups.c.value_sum) / db.func.sum(rollups.c.value_count),
+                )
+                .where(rollups.c.sensor.in_(changed), *window)
+                .group_by(rollups.c.sensor, bucket)
+                .order_by(rollups.c.sensor, bucket)
+            ).all()
+            series: Dict[str, list] = {}
+            for sensor, ts, value in rows:
+                series.setdefault(sensor, []).append((ts, value))
+            for sensor, points in series.items():
+                data = np.array(points, dtype=np.float64)
+                percent = SensorRegistryService.calibration(sensor).to_percent(data[:, 1])
+                fits[sensor] = service.fit_drying_curve(data[:, 0], percent)
+
+        with service._lock:
+            for sensor in changed:
+                service._seen[sensor] = newest.get(sensor)
+                service._fits[sensor] = fits[sensor]
+            for sensor in set(service._fits) - sensors:
+                del service._fits[sensor]
+                service._seen.pop(sensor, None)
+            service._forecasts = {
+                rule.plant_id: service._crossing(service._fits.get(rule.sensor), rule.low_percent, now)
+                for rule in rules
+            }
+        return len(changed)
+
+    @staticmethod
+    def fit_drying_curve(ts: np.ndarray, percent: np.ndarray) -> Optional[Tuple[float, float, float]]:
+        """Fit ``percent = level * exp(-rate * (t - t_end))`` to the current drying segment.
+
+        The segment starts after the last rise of more than ``REWET_PERCENT``
+        between consecutive points (a watering). The fit is linear least squares
+        on ``log(percent)``, weighted by ``percent`` to undo the log's stretching
+        of small values.
+
+        Args:
+            ts: Unix seconds, ascending.
+            percent: Moisture at ``ts``.
+
+        Returns:
+            tuple: (t_end, level, rate per second), or None if there is too little
+            data or the soil is not drying.
+        """
+        rises = np.flatnonzero(np.diff(percent) > WateringForecastService.REWET_PERCENT)
+        # Skip the first point after a watering: the water is still soaking in
+        start = rises[-1] + 2 if len(rises) else 0
+        ts, percent = ts[start:], np.maximum(percent[start:], WateringForecastService.MIN_PERCENT)
+        if len(ts) < WateringForecastService.MIN_POINTS:
+            return None
+
+        t_end = float(ts[-1])
+        slope, intercept = np.polyfit(ts - t_end, np.log(percent), 1, w=percent)
+        if not slope < 0:
+            return None
+        return t_end, math.exp(intercept), -slope
+
+    @staticmethod
+    def _crossing(fit: Optional[Tuple[float, float, float]], low_percent: float, now: datetime) -> Optional[datetime]:
+        if fit is None or low_percent <= 0:
+            return None
+        t_end, level, rate = fit
+        at = t_end + (math.log(level / low_percent) / rate if level > low_percent else 0.0)
+        # A nearly flat curve crosses in centuries; report no forecast instead
+        if at > (now + WateringForecastService.MAX_HORIZON).timestamp():
+            return None
+        return datetime.fromtimestamp(at, timezone.utc)
+
+    @staticmethod
+    def _run(app: Flask) -> None:
+        while True:
+            with app.app_context():
+                try:
+                    refitted = WateringForecastService.refresh()
+                    logger.debug(f"Refitted drying curves of {refitted} sensor(s)")
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Error refreshing watering forecasts: {e}", exc_info=True)
+            time.sleep(WateringForecastService.REFRESH_SECONDS)
@@ -0,0 +1,330 @@
+"""Closed-loop watering: moisture readings in, pump runs out."""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.models.plants import Plants
+from app.models.watering_rules import WateringRule
+from app.services.plant_service import PlantService
+from app.services.sensor_registry_service import SensorCalibration, SensorRegistryService
+
+logger = logging.getLogger(__name__)
+
+
+def moisture_percent(raw: float, calibration: Optional[SensorCalibration] = None) -> float:
+    """Convert a raw ``analogRead`` value to 0 (dry) .. 100 (wet) percent.
+
+    Uses the sensor's calibration curve when given, else the default line
+    between ``MOISTURE_RAW_DRY`` and ``MOISTURE_RAW_WET``.
+    """
+    return float((calibration or SensorCalibration.default()).to_percent(raw))
+
+
+class WateringRuleService:
+    """Service class for per-plant watering rules."""
+
+    MAX_SENSOR_LENGTH = 64
+    DEFAULT_COOLDOWN_SECONDS = 1800
+
+    @staticmethod
+    def find_rule(sensor: str) -> Optional[Dict[str, Any]]:
+        """Get the rule bound to a sensor name, or None."""
+        rule = db.session.scalar(db.select(WateringRule).where(WateringRule.sensor == sensor))
+        return rule.to_dict() if rule else None
+
+    @staticmethod
+    def get_rule(plant_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Get a plant's watering rule.
+
+        Returns:
+            tuple: (rule_dict, error_dict, status_code)
+        """
+        row = PlantService.execute_for_plant(
+            plant_id,
+            db.select(WateringRule).where(WateringRule.plant_id == plant_id),
+            WateringRule,
+        )
+        if row is None:
+            return None, {"error": "plant not found"}, 404
+        if row[1] is None:
+            return None, {"error": "watering rule not found"}, 404
+        return row[1].to_dict(), None, 200
+
+    @staticmethod
+    def put_rule(plant_id: int, data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Create or replace a plant's watering rule.
+
+        Args:
+            plant_id: The ID of the plant.
+            data: ``sensor``, ``low_percent``, ``high_percent`` and optionally
+                ``cooldown_seconds`` and ``enabled``.
+
+        Returns:
+            tuple: (rule_dict, error_dict, status_code)
+        """
+        sensor = data.get("sensor")
+        if not isinstance(sensor, str) or not sensor.strip():
+            return None, {"error": "sensor is required"}, 400
+        sensor = sensor.strip()
+        if len(sensor) > WateringRuleService.MAX_SENSOR_LENGTH:
+            return None, {"error": f"sensor must be at most {WateringRuleService.MAX_SENSOR_LENGTH} characters"}, 400
+
+        thresholds = {}
+        for name in ("low_percent", "high_percent"):
+            value = data.get(name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 100:
+                return None, {"error": f"{name} must be a number between 0 and 100"}, 400
+            thresholds[name] = float(value)
+        if thresholds["low_percent"] >= thresholds["high_percent"]:
+            return None, {"error": "low_percent must be below high_percent"}, 400
+
+        cooldown_seconds = data.get("cooldown_seconds", WateringRuleService.DEFAULT_COOLDOWN_SECONDS)
+        if isinstance(cooldown_seconds, bool) or not isinstance(cooldown_seconds, int) or cooldown_seconds < 0:
+            return None, {"error": "cooldown_seconds must be a non-negative integer"}, 400
+        enabled = data.get("enabled", True)
+        if not isinstance(enabled, bool):
+            return None, {"error": "enabled must be a boolean"}, 400
+
+        rules = WateringRule.__table__
+        values = {
+            "sensor": sensor,
+            "low_percent": thresholds["low_percent"],
+            "high_percent": thresholds["high_percent"],
+            "cooldown_seconds": cooldown_seconds,
+            "enabled": enabled,
+        }
+        statement = pg_insert(rules).from_select(
+            ["plant_id", *values],
+            db.select(
+                Plants.id,
+                *(db.literal(value, rules.c[name].type) for name, value in values.items()),
+            ).where(Plants.id == plant_id),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[rules.c.plant_id],
+            set_={name: statement.excluded[name] for name in values},
+        ).returning(*rules.c)
+        try:
+            row = PlantService.execute_for_plant(plant_id, statement, WateringRule)
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+
+            rule_dict = row[1].to_dict()
+            db.session.commit()
+            return rule_dict, None, 200
+        except IntegrityError:
+            db.session.rollback()
+            return None, {"error": f"sensor {sensor!r} is already bound to another plant"}, 409
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error saving watering rule for plant {plant_id}: {e}", exc_info=True)
+            return None, {"error": "Failed to save watering rule"}, 500
+
+    @staticmethod
+    def delete_rule(plant_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], int]:
+        """Delete a plant's watering rule.
+
+        Returns:
+            tuple: (message_dict, error_dict, status_code)
+        """
+        rules = WateringRule.__table__
+        try:
+            row = PlantService.execute_for_plant(
+                plant_id,
+                db.delete(rules).where(rules.c.plant_id == plant_id).returning(*rules.c),
+                WateringRule,
+            )
+            if row is None:
+                return None, {"error": "plant not found"}, 404
+            if row[1] is None:
+                return None, {"error": "watering rule not found"}, 404
+
+            db.session.commit()
+            return {"message": "watering rule deleted"}, None, 200
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error deleting watering rule for plant {plant_id}: {e}", exc_info=True)
+            return None, {"error": "Failed to delete watering rule"}, 500
+
+
+class SensorState:
+    """Rolling state of one moisture sensor, updated once per reading."""
+
+    __slots__ = (
+        "filtered_percent", "samples", "last_seen", "last_reading_at",
+        "watering", "runs_this_cycle", "last_run", "last_run_at", "halted",
+    )
+
+    def __init__(self) -> None:
+        self.filtered_percent: Optional[float] = None
+        self.samples = 0
+        self.last_seen: Optional[float] = None
+        self.last_reading_at: Optional[datetime] = None
+        self.watering = False
+        self.runs_this_cycle = 0
+        self.last_run: Optional[float] = None
+        self.last_run_at: Optional[datetime] = None
+        self.halted = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filtered_percent": None if self.filtered_percent is None else round(self.filtered_percent, 2),
+            "samples": self.samples,
+            "last_reading_at": self.last_reading_at,
+            "watering": self.watering,
+            "runs_this_cycle": self.runs_this_cycle,
+            "last_run_at": self.last_run_at,
+            "halted": self.halted,
+        }
+
+
+class WateringController:
+    """Waters plants from their moisture readings, with hysteresis and cool-down.
+
+    All state lives in memory and is updated incrementally from each reading:
+    an exponentially weighted moving average smooths the sensor, a plant
+    starts a watering cycle at ``low_percent`` and ends it at
+    ``high_percent``, and within a cycle the pump runs at most once per
+    ``cooldown_seconds``. A cycle that needs more than ``MAX_RUNS_PER_CYCLE``
+    runs is halted (dry tank or a sensor out of the soil) until the plant
+    reads wet again or its rule changes. History is never re-queried.
+    """
+
+    FILTER_TIME_CONSTANT_SECONDS = 60.0
+    MIN_SAMPLES = 3
+    MAX_RUNS_PER_CYCLE = 6
+    RULE_CACHE_SECONDS = 60.0
+
+    def __init__(
+        self,
+        pump_service: Any,
+        rule_loader: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            pump_service: ``PumpService`` or ``PumpClient`` used to start runs.
+            rule_loader: Looks up the rule for a sensor name (default: the database).
+        """
+        self.pump_service = pump_service
+        self.rule_loader = rule_loader or WateringRuleService.find_rule
+        self._lock = threading.Lock()
+        self._states: Dict[str, SensorState] = {}
+        self._rules: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+
+    def observe(self, sensor: str, raw_value: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Feed one reading and water if the plant's rule calls for it.
+
+        Args:
+            sensor: Sensor name as reported by the firmware.
+            raw_value: Raw ``analogRead`` value.
+            now: Monotonic timestamp of the reading (default: now).
+
+        Returns:
+            dict: The sensor's state after the reading, plus the pump run if one was started.
+        """
+        now = time.monotonic() if now is None else now
+        rule = self._rule(sensor, now)
+        percent = moisture_percent(raw_value, SensorRegistryService.calibration(sensor))
+
+        with self._lock:
+            state = self._states.setdefault(sensor, SensorState())
+            self._filter(state, percent, now)
+            water = rule is not None and self._evaluate(sensor, state, rule, now)
+            if water:
+                previous_run = state.last_run, state.last_run_at
+                state.last_run, state.last_run_at = now, datetime.now(timezone.utc)
+                state.runs_this_cycle += 1
+
+        run = None
+        if water:
+            try:
+                run = self.pump_service.activate_pump(trigger_source="moisture")["run"]
+                logger.info(f"Watering for sensor {sensor} at {state.filtered_percent:.1f}%")
+            except Exception as e:
+                logger.error(f"Error starting pump for sensor {sensor}: {e}", exc_info=True)
+                with self._lock:
+                    # Retry on the next reading instead of waiting out the cool-down
+                    state.last_run, state.last_run_at = previous_run
+                    state.runs_this_cycle -= 1
+
+        with self._lock:
+            result = {"sensor": sensor, "moisture_percent": round(percent, 2), **state.to_dict()}
+        result["pump_run"] = run
+        return result
+
+    def get_state(self, sensor: str) -> Optional[Dict[str, Any]]:
+        """Get a sensor's rolling state, or None before its first reading."""
+        with self._lock:
+            state = self._states.get(sensor)
+            return state.to_dict() if state else None
+
+    def rule(self, sensor: str) -> Optional[Dict[str, Any]]:
+        """The sensor's watering rule (cached), or None."""
+        return self._rule(sensor, time.monotonic())
+
+    def invalidate(self) -> None:
+        """Drop cached rules and lift halted cycles, e.g. after a rule changed."""
+        with self._lock:
+            self._rules.clear()
+            for state in self._states.values():
+                state.halted = False
+                state.runs_this_cycle = 0
+
+    def _rule(self, sensor: str, now: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._rules.get(sensor)
+        if cached is not None and now - cached[1] < self.RULE_CACHE_SECONDS:
+            return cached[0]
+        rule = self.rule_loader(sensor)
+        with self._lock:
+            self._rules[sensor] = (rule, now)
+        return rule
+
+    def _filter(self, state: SensorState, percent: float, now: float) -> None:
+        # Time-aware EWMA: readings may arrive irregularly, so the weight of a
+        # new sample depends on how long ago the previous one was
+        if state.filtered_percent is None:
+            state.filtered_percent = percent
+        else:
+            alpha = 1.0 - math.exp(-max(now - state.last_seen, 0.0) / self.FILTER_TIME_CONSTANT_SECONDS)
+            state.filtered_percent += alpha * (percent - state.filtered_percent)
+        state.samples += 1
+        state.last_seen = now
+        state.last_reading_at = datetime.now(timezone.utc)
+
+    def _evaluate(self, sensor: str, state: SensorState, rule: Dict[str, Any], now: float) -> bool:
+        """Update the watering cycle; caller holds the lock. Returns True to water now."""
+        if not rule["enabled"]:
+            state.watering = False
+            return False
+        if state.samples < self.MIN_SAMPLES:
+            return False
+
+        if state.watering and state.filtered_percent >= rule["high_percent"]:
+            logger.info(f"Sensor {sensor} reached {state.filtered_percent:.1f}%, watering cycle done")
+            state.watering = state.halted = False
+            state.runs_this_cycle = 0
+        elif not state.watering and state.filtered_percent <= rule["low_percent"]:
+            state.watering = True
+            state.runs_this_cycle = 0
+
+        if not state.watering or state.halted:
+            return False
+        if state.runs_this_cycle >= self.MAX_RUNS_PER_CYCLE:
+            logger.warning(
+                f"Sensor {sensor} still at {state.filtered_percent:.1f}% after "
+                f"{state.runs_this_cycle} pump runs; halting automatic watering"
+            )
+            state.halted = True
+            return False
+        return state.last_run is None or now - state.last_run >= rule["cooldown_seconds"]
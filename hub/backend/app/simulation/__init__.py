@@ -0,0 +1,22 @@
+"""Hardware-in-the-loop simulation of plants, pumps and moisture sensors.
+
+Lets the watering path (sensor reading -> pump command -> GPIO -> soil)
+run and be benchmarked off the Pi. See ``python -m app.simulation --help``,
+and ``python -m app.simulation.benchmark --help`` for ingestion load tests.
+"""
+from app.simulation.soil import SoilMoistureModel
+from app.simulation.plant import SimulatedPlant
+from app.simulation.feeder import SensorFeeder, http_sink
+from app.simulation.fleet import FleetDevice, FleetRunner, HttpTransport, MqttTransport, UdpTransport
+
+__all__ = [
+    "SoilMoistureModel",
+    "SimulatedPlant",
+    "SensorFeeder",
+    "http_sink",
+    "FleetDevice",
+    "FleetRunner",
+    "HttpTransport",
+    "UdpTransport",
+    "MqttTransport",
+]
@@ -0,0 +1,148 @@
+"""Benchmark the simulated watering path at scale.
+
+Each tick every plant dries by one reporting interval and reports a reading;
+plants reading drier than the threshold get a pump run on a shared executor.
+Reports reading throughput and the latency from pump request to the pump
+pin going high.
+
+This measures the simulation's own thresholding and executor driving each
+plant's ``PumpController``. It does not measure ``WateringController``,
+``PumpService``'s scheduler or the pump daemon, so it is not the latency of
+the production watering path. For ingestion load against a running hub, see
+``app/simulation/benchmark.py``. Example::
+
+    python -m app.simulation --plants 2000 --ticks 24 --time-scale 60
+"""
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.simulation.feeder import SensorFeeder, http_sink
+from app.simulation.plant import SimulatedPlant
+from app.simulation.soil import SoilMoistureModel
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _positive(kind: type) -> Callable[[str], Any]:
+    def parse(text: str) -> Any:
+        try:
+            value = kind(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid {kind.__name__} value: {text!r}")
+        if not value > 0:
+            raise argparse.ArgumentTypeError(f"must be positive: {text!r}")
+        return value
+    return parse
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--plants", type=_positive(int), default=1000, help="number of simulated plants")
+    parser.add_argument("--ticks", type=_positive(int), default=12, help="reporting intervals to simulate")
+    parser.add_argument("--interval", type=_positive(float), default=5.0, help="simulated seconds per reading")
+    parser.add_argument("--time-scale", type=_positive(float), default=60.0, help="simulated seconds per wall second")
+    parser.add_argument("--dry-threshold", type=int, default=700, help="raw reading that triggers watering")
+    parser.add_argument("--pump-seconds", type=_positive(float), default=5.0, help="simulated length of a pump run")
+    parser.add_argument("--workers", type=_positive(int), default=16, help="pump executor threads")
+    parser.add_argument("--url", help="also POST readings to this ingestion URL")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    rng = random.Random(args.seed)
+    plants = [
+        SimulatedPlant(
+            f"plant-{i}",
+            SoilMoistureModel(
+                moisture=rng.uniform(0.1, 0.9),
+                drying_rate_per_hour=rng.uniform(0.5, 5.0),
+                rng=random.Random(rng.random()),
+            ),
+            pump_duration_seconds=args.pump_seconds,
+            time_scale=args.time_scale,
+        )
+        for i in range(args.plants)
+    ]
+    by_sensor = {plant.sensor: plant for plant in plants}
+
+    lock = threading.Lock()
+    requested_at: Dict[str, float] = {}
+    latencies: List[float] = []
+
+    def on_pump_started(plant: SimulatedPlant, started_at: float) -> None:
+        with lock:
+            requested = requested_at.get(plant.sensor)
+        if requested is not None:
+            latencies.append(started_at - requested)
+
+    def run_pump(plant: SimulatedPlant) -> None:
+        try:
+            plant.pump.on()
+        finally:
+            with lock:
+                requested_at.pop(plant.sensor, None)
+
+    for plant in plants:
+        plant.pump_started_listeners.append(on_pump_started)
+
+    feeder = SensorFeeder(plants, http_sink(args.url) if args.url else None, args.interval)
+    executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="sim-pump")
+    period = args.interval / args.time_scale
+    tick_seconds = 0.0
+    pump_runs = 0
+
+    started = time.perf_counter()
+    next_tick = time.monotonic()
+    for _ in range(args.ticks):
+        tick_start = time.perf_counter()
+        for reading in feeder.tick():
+            if reading["value"] < args.dry_threshold:
+                continue
+            plant = by_sensor[reading["sensor"]]
+            with lock:
+                if plant.sensor in requested_at:
+                    continue
+                requested_at[plant.sensor] = time.perf_counter()
+            executor.submit(run_pump, plant)
+            pump_runs += 1
+        tick_seconds += time.perf_counter() - tick_start
+
+        next_tick += period
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    executor.shutdown(wait=True)
+    wall_seconds = time.perf_counter() - started
+    mean_moisture = sum(plant.soil.moisture for plant in plants) / len(plants)
+
+    print(f"plants:            {args.plants}")
+    print(f"simulated time:    {args.ticks * args.interval:.0f} s in {wall_seconds:.2f} s wall")
+    print(f"readings:          {feeder.readings_sent}")
+    print(f"reading rate:      {feeder.readings_sent / tick_seconds:,.0f} /s (tick CPU time)")
+    print(f"pump runs:         {pump_runs}")
+    print(f"pump latency p50:  {_percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"pump latency p99:  {_percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"mean moisture:     {mean_moisture:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
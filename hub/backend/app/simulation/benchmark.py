@@ -0,0 +1,160 @@
+"""Benchmark sensor ingestion with a simulated fleet or a replayed recording.
+
+Drives a running hub with ``FleetRunner`` over HTTP, UDP or MQTT, waits for
+the readings to be written, then reports sustained throughput, request
+latency and database write amplification. Examples::
+
+    python -m app.simulation.benchmark --devices 2000 --interval 5 --batch 12 --duration 120
+    python -m app.simulation.benchmark --protocol udp --encoding binary --devices 500
+    python -m app.simulation.benchmark --replay readings.csv --speed 600
+
+Latency is the HTTP round trip, from sending a request to its response;
+UDP and MQTT are fire-and-forget, so only throughput is reported for them.
+Write amplification is the WAL Postgres wrote during the run divided by the
+logical size of the stored readings (sensor name, 8-byte timestamp, 8-byte
+value each), so it includes indexes, rollups and page overhead. WAL is
+server-wide: run against an otherwise idle database.
+"""
+import argparse
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import Config
+from app.simulation.fleet import FleetRunner, HttpTransport, MqttTransport, UdpTransport, read_recording
+
+# Tables whose growth counts as storage written by ingestion
+_STORAGE_SQL = text(
+    "SELECT coalesce(sum(pg_total_relation_size(relid)), 0) FROM pg_partition_tree('sensor_readings')"
+    " UNION ALL SELECT pg_total_relation_size('sensor_reading_rollups')"
+)
+_STORED_SQL = text("SELECT count(*), coalesce(sum(octet_length(sensor)), 0) FROM sensor_readings WHERE sensor LIKE :pattern")
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost/api", help="API base URL of the hub (it serves on port 80)")
+    parser.add_argument("--protocol", choices=("http", "udp", "mqtt"), default="http", help="transport to send readings over")
+    parser.add_argument("--encoding", choices=("json", "binary"), default="json", help="payload format of batches")
+    parser.add_argument("--host", default="localhost", help="UDP listener or MQTT broker host")
+    parser.add_argument("--port", type=int, help="UDP or MQTT port (default from the config)")
+    parser.add_argument("--devices", type=int, default=100, help="number of simulated devices")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between a device's readings")
+    parser.add_argument("--jitter", type=float, default=0.1, help="random spread of the interval, as a fraction")
+    parser.add_argument("--batch", type=int, default=1, help="readings per request")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight at once")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to run the fleet")
+    parser.add_argument("--adaptive", action="store_true", help="follow the server's next_report_seconds")
+    parser.add_argument("--replay", metavar="CSV", help="replay a sensor,ts,value recording instead of simulating devices")
+    parser.add_argument("--speed", type=float, default=60.0, help="replay speed-up")
+    parser.add_argument("--prefix", help="sensor name prefix (default unique per run)")
+    parser.add_argument(
+        "--database-url",
+        default=Config.SQLALCHEMY_DATABASE_URI,
+        help="database to measure stored readings and WAL in; empty to skip",
+    )
+    parser.add_argument("--drain-seconds", type=float, default=30.0, help="longest wait for buffered readings to be written")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    return parser.parse_args(argv)
+
+
+def _transport(args: argparse.Namespace) -> Any:
+    if args.protocol == "udp":
+        return UdpTransport(args.host, args.port or Config.INGEST_UDP_PORT, args.encoding)
+    if args.protocol == "mqtt":
+        return MqttTransport(args.host, args.port or Config.MQTT_PORT, Config.MQTT_TOPIC_PREFIX, args.encoding)
+    return HttpTransport(args.url, args.encoding)
+
+
+def _snapshot(engine: Optional[Engine], pattern: str) -> Optional[Dict[str, int]]:
+    if engine is None:
+        return None
+    with engine.connect() as connection:
+        wal = connection.execute(text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')")).scalar()
+        storage = sum(connection.execute(_STORAGE_SQL).scalars())
+        stored, name_bytes = connection.execute(_STORED_SQL, {"pattern": pattern}).one()
+    return {"wal": int(wal), "storage": int(storage), "stored": int(stored), "name_bytes": int(name_bytes)}
+
+
+def _drain(args: argparse.Namespace, transport: Any, engine: Optional[Engine], pattern: str, sent: int) -> None:
+    """Wait until the hub has written what it accepted, or ``--drain-seconds`` pass."""
+    deadline = time.monotonic() + args.drain_seconds
+    previous = None
+    while time.monotonic() < deadline:
+        if isinstance(transport, HttpTransport):
+            stats = transport.stats()
+            if stats is not None and stats.get("buffered") == 0:
+                return
+        elif engine is not None:
+            # No ingest counters over UDP/MQTT: wait for the row count to settle
+            stored = _snapshot(engine, pattern)["stored"]
+            if stored >= sent or stored == previous:
+                return
+            previous = stored
+        time.sleep(1.0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    prefix = args.prefix or f"bench{int(time.time())}"
+    pattern = prefix.replace("_", r"\_").replace("%", r"\%") + "-%"
+    engine, before = None, None
+    if args.database_url:
+        try:
+            engine = create_engine(args.database_url)
+            before = _snapshot(engine, pattern)
+        except SQLAlchemyError as e:
+            print(f"database unavailable, skipping storage metrics: {e}", file=sys.stderr)
+            engine = None
+
+    transport = _transport(args)
+    runner = FleetRunner(transport, batch_size=args.batch, concurrency=args.concurrency, adaptive=args.adaptive)
+    started = time.perf_counter()
+    try:
+        if args.replay:
+            stats = runner.replay(read_recording(args.replay), args.speed, prefix)
+        else:
+            stats = runner.run_devices(args.devices, args.duration, args.interval, args.jitter, prefix, args.seed)
+        send_seconds = time.perf_counter() - started
+        _drain(args, transport, engine, pattern, stats.readings_sent)
+    finally:
+        transport.close()
+    total_seconds = time.perf_counter() - started
+    after = _snapshot(engine, pattern)
+
+    source = f"replay of {args.replay} at {args.speed:g}x" if args.replay else f"{args.devices} devices every {args.interval:g} s"
+    print(f"fleet:             {source}, {args.protocol}/{args.encoding}, batch {args.batch}")
+    print(f"run time:          {send_seconds:.1f} s sending + {total_seconds - send_seconds:.1f} s draining")
+    print(f"requests:          {stats.requests} ({stats.errors} failed)")
+    print(f"readings sent:     {stats.readings_sent} ({stats.readings_failed} failed)")
+    print(f"offered rate:      {stats.readings_sent / send_seconds:,.0f} readings/s")
+    p50, p99 = stats.latency_percentile(50), stats.latency_percentile(99)
+    if p50 is not None:
+        print(f"ingest latency:    p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms")
+    else:
+        print("ingest latency:    n/a (no acknowledgements over this transport)")
+
+    if before is None or after is None:
+        return 0 if stats.errors == 0 else 1
+    stored = after["stored"] - before["stored"]
+    print(f"readings stored:   {stored}")
+    print(f"sustained rate:    {stored / total_seconds:,.0f} readings/s")
+    if stored:
+        logical = (after["name_bytes"] - before["name_bytes"]) + 16 * stored
+        wal = after["wal"] - before["wal"]
+        storage = after["storage"] - before["storage"]
+        print(f"WAL written:       {wal / 1e6:.2f} MB ({wal / stored:.0f} bytes/reading)")
+        print(f"storage growth:    {storage / 1e6:.2f} MB ({storage / stored:.0f} bytes/reading)")
+        print(f"write amplif.:     {wal / logical:.1f}x WAL, {storage / logical:.1f}x storage ({logical / stored:.0f} logical bytes/reading)")
+    return 0 if stats.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Sensor feeder: turns simulated plants into firmware-style readings."""
+import json
+import logging
+import time
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.simulation.plant import SimulatedPlant
+
+logger = logging.getLogger(__name__)
+
+Reading = Dict[str, Any]
+Sink = Callable[[List[Reading]], None]
+
+
+def http_sink(url: str, timeout: float = 5.0) -> Sink:
+    """Build a sink that POSTs each reading like ``wifi.cpp``'s ``post()`` does."""
+
+    def send(readings: List[Reading]) -> None:
+        for reading in readings:
+            request = urllib.request.Request(
+                url,
+                data=json.dumps(reading).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+            except OSError as e:
+                logger.warning(f"Failed to post reading for {reading['sensor']}: {e}")
+
+    return send
+
+
+class SensorFeeder:
+    """Advances every plant's soil by one reporting interval and emits readings."""
+
+    def __init__(
+        self,
+        plants: Sequence[SimulatedPlant],
+        sink: Optional[Sink] = None,
+        interval_seconds: float = 5.0,
+    ) -> None:
+        """Initialize the feeder.
+
+        Args:
+            plants: Plants to read.
+            sink: Receives each tick's readings (e.g. ``http_sink``); optional.
+            interval_seconds: Simulated seconds between readings, as ``delay(5000)``
+                in ``main.cpp``.
+        """
+        self.plants = list(plants)
+        self.sink = sink
+        self.interval_seconds = interval_seconds
+        self.readings_sent = 0
+
+    def tick(self) -> List[Reading]:
+        """Run one reporting interval and return the readings produced."""
+        readings = []
+        for plant in self.plants:
+            plant.soil.advance(self.interval_seconds)
+            readings.append({"sensor": plant.sensor, "value": plant.soil.raw_reading()})
+        if self.sink is not None:
+            self.sink(readings)
+        self.readings_sent += len(readings)
+        return readings
+
+    def run(self, ticks: int, time_scale: float = 1.0) -> None:
+        """Emit ``ticks`` intervals, pacing them at ``time_scale`` x real time."""
+        period = self.interval_seconds / time_scale
+        next_tick = time.monotonic()
+        for _ in range(ticks):
+            self.tick()
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
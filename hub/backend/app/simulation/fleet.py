@@ -0,0 +1,379 @@
+"""Sensor fleet load generator: many firmware-style devices, or a replayed recording.
+
+Each ``FleetDevice`` samples its own ``SoilMoistureModel`` the way
+``MoistureController`` samples its probe, numbers the readings per boot
+(``seq``) and sends them one at a time or in batches, over HTTP, UDP or
+MQTT, as JSON or in the packed binary format of
+``services/sensor_reading_service.py``. See ``app/simulation/benchmark.py``.
+"""
+import asyncio
+import csv
+import heapq
+import json
+import logging
+import random
+import socket
+import struct
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.simulation.soil import SoilMoistureModel
+
+logger = logging.getLogger(__name__)
+
+# (sensor, Unix seconds, raw value)
+Reading = Tuple[str, float, int]
+
+
+def encode_json_batch(device: str, boot: int, seq: int, readings: List[Reading]) -> bytes:
+    """A ``/api/data/batch`` JSON envelope; readings are numbered from ``seq``."""
+    return json.dumps({
+        "device": device,
+        "boot": boot,
+        "seq": seq,
+        "readings": [[sensor, round(ts, 3), value] for sensor, ts, value in readings],
+    }).encode("utf-8")
+
+
+def encode_binary_batch(device: str, boot: int, seq: int, readings: List[Reading]) -> bytes:
+    """A version 2 binary batch (sequence header, sensor table, 7-byte records)."""
+    sensors: Dict[str, int] = {}
+    for sensor, _, _ in readings:
+        sensors.setdefault(sensor, len(sensors))
+    name = device.encode("utf-8")
+    parts = [bytes([2, len(name)]), name, struct.pack("<II", boot, seq), bytes([len(sensors)])]
+    for sensor in sensors:
+        encoded = sensor.encode("utf-8")
+        parts += [bytes([len(encoded)]), encoded]
+    parts += [struct.pack("<BiH", sensors[sensor], int(ts), value) for sensor, ts, value in readings]
+    return b"".join(parts)
+
+
+class SendResult(NamedTuple):
+    ok: bool
+    # Request round trip; None for transports without acknowledgements
+    latency: Optional[float] = None
+    next_report_seconds: Optional[int] = None
+
+
+class HttpTransport:
+    """Posts single readings to ``/data`` and batches to ``/data/batch``."""
+
+    name = "http"
+
+    def __init__(self, base_url: str, encoding: str = "json", timeout: float = 10.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.encoding = encoding
+        self.timeout = timeout
+
+    def send(self, device: str, boot: int, seq: int, readings: List[Reading]) -> SendResult:
+        if len(readings) == 1 and self.encoding == "json":
+            sensor, _, value = readings[0]
+            url = f"{self.base_url}/data"
+            body = json.dumps({"sensor": sensor, "value": value, "device": device, "boot": boot, "seq": seq}).encode("utf-8")
+            content_type = "application/json"
+        elif self.encoding == "json":
+            url, body, content_type = f"{self.base_url}/data/batch", encode_json_batch(device, boot, seq, readings), "application/json"
+        else:
+            url = f"{self.base_url}/data/batch"
+            body, content_type = encode_binary_batch(device, boot, seq, readings), "application/octet-stream"
+
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type}, method="POST")
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                reply = response.read()
+        except (OSError, urllib.error.HTTPError) as e:
+            logger.debug(f"Failed to post readings of {device}: {e}")
+            return SendResult(False)
+        latency = time.perf_counter() - started
+        try:
+            next_report = json.loads(reply).get("next_report_seconds")
+        except (ValueError, AttributeError):
+            next_report = None
+        return SendResult(True, latency, next_report)
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        """The server's ``/data/stats`` counters, or None if unavailable."""
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/data/stats", timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError):
+            return None
+
+    def close(self) -> None:
+        pass
+
+
+class UdpTransport:
+    """Sends one datagram per reading or batch to the ingest listener."""
+
+    name = "udp"
+
+    def __init__(self, host: str, port: int, encoding: str = "json") -> None:
+        self.address = (host, port)
+        self.encoding = encoding
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, device: str, boot: int, seq: int, readings: List[Reading]) -> SendResult:
+        if len(readings) == 1 and self.encoding == "json":
+            sensor, _, value = readings[0]
+            payload = json.dumps({"sensor": sensor, "value": value, "device": device, "boot": boot, "seq": seq}).encode("utf-8")
+        elif self.encoding == "json":
+            payload = encode_json_batch(device, boot, seq, readings)
+        else:
+            payload = encode_binary_batch(device, boot, seq, readings)
+        try:
+            self._socket.sendto(payload, self.address)
+        except OSError as e:
+            logger.debug(f"Failed to send datagram for {device}: {e}")
+            return SendResult(False)
+        return SendResult(True)
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+class MqttTransport:
+    """Publishes bare values to ``<prefix>/sensors/<sensor>`` and batches to ``<prefix>/batch``.
+
+    Bare values carry no sequence number. Requires ``aiomqtt``; the client
+    runs on its own event loop thread.
+    """
+
+    name = "mqtt"
+
+    def __init__(self, host: str, port: int, prefix: str, encoding: str = "json", timeout: float = 10.0) -> None:
+        try:
+            import aiomqtt
+        except ImportError as e:
+            raise RuntimeError("aiomqtt is not installed; pip install aiomqtt or use --protocol http/udp") from e
+
+        self.prefix = prefix
+        self.encoding = encoding
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fleet-mqtt", daemon=True)
+        self._thread.start()
+        self._client = aiomqtt.Client(host, port)
+        asyncio.run_coroutine_threadsafe(self._client.__aenter__(), self._loop).result(timeout)
+
+    def send(self, device: str, boot: int, seq: int, readings: List[Reading]) -> SendResult:
+        if len(readings) == 1 and self.encoding == "json":
+            sensor, _, value = readings[0]
+            topic, payload = f"{self.prefix}/sensors/{sensor}", str(value).encode("ascii")
+        elif self.encoding == "json":
+            topic, payload = f"{self.prefix}/batch", encode_json_batch(device, boot, seq, readings)
+        else:
+            topic, payload = f"{self.prefix}/batch", encode_binary_batch(device, boot, seq, readings)
+        try:
+            asyncio.run_coroutine_threadsafe(self._client.publish(topic, payload), self._loop).result(self.timeout)
+        except Exception as e:
+            logger.debug(f"Failed to publish readings of {device}: {e}")
+            return SendResult(False)
+        return SendResult(True)
+
+    def close(self) -> None:
+        try:
+            asyncio.run_coroutine_threadsafe(self._client.__aexit__(None, None, None), self._loop).result(self.timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class FleetDevice:
+    """One board: a probe in simulated soil, a boot id, a sequence counter and a send buffer."""
+
+    __slots__ = ("name", "soil", "boot", "seq", "buffer", "interval_seconds", "last_sample")
+
+    def __init__(self, name: str, soil: Optional[SoilMoistureModel], boot: int, interval_seconds: float) -> None:
+        self.name = name
+        self.soil = soil
+        self.boot = boot
+        self.seq = 0
+        self.buffer: List[Reading] = []
+        self.interval_seconds = interval_seconds
+        self.last_sample: Optional[float] = None
+
+    def sample(self, now: float) -> None:
+        """Advance the soil to ``now`` and buffer one reading."""
+        if self.last_sample is not None:
+            self.soil.advance(now - self.last_sample)
+        self.last_sample = now
+        self.buffer.append((self.name, now, self.soil.raw_reading()))
+
+    def take_batch(self) -> Tuple[int, List[Reading]]:
+        """Empty the buffer; returns the first sequence number and the readings."""
+        seq, readings = self.seq, self.buffer
+        self.seq += len(readings)
+        self.buffer = []
+        return seq, readings
+
+
+class FleetStats:
+    """Client-side counters of a run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.readings_sent = 0
+        self.readings_failed = 0
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.latencies: List[float] = []
+
+    def record(self, readings: int, result: SendResult) -> None:
+        with self._lock:
+            self.requests += 1
+            if result.ok:
+                self.readings_sent += readings
+            else:
+                self.errors += 1
+                self.readings_failed += readings
+            if result.latency is not None:
+                self.latencies.append(result.latency)
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        """Request latency percentile in seconds, or None without acknowledgements."""
+        with self._lock:
+            return float(np.percentile(self.latencies, pct)) if self.latencies else None
+
+
+class FleetRunner:
+    """Drives devices on a schedule and sends their readings on a thread pool.
+
+    At most ``concurrency`` requests are in flight; when the server falls
+    behind, sampling waits, as a board blocked in ``post()`` would.
+    """
+
+    def __init__(
+        self,
+        transport: Any,
+        batch_size: int = 1,
+        concurrency: int = 32,
+        adaptive: bool = False,
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            transport: ``HttpTransport``, ``UdpTransport`` or ``MqttTransport``.
+            batch_size: Readings a device buffers before sending them together.
+            concurrency: Requests in flight at once.
+            adaptive: Follow the server's ``next_report_seconds`` (HTTP only).
+        """
+        self.transport = transport
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.adaptive = adaptive
+        self.stats = FleetStats()
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fleet-send")
+
+    def run_devices(
+        self,
+        devices: int,
+        duration_seconds: float,
+        interval_seconds: float = 5.0,
+        jitter: float = 0.1,
+        prefix: str = "fleet",
+        seed: int = 0,
+    ) -> FleetStats:
+        """Simulate ``devices`` boards reporting every ``interval_seconds`` (+/- ``jitter``)."""
+        rng = random.Random(seed)
+        fleet = [
+            FleetDevice(
+                f"{prefix}-{i}",
+                SoilMoistureModel(
+                    moisture=rng.uniform(0.2, 0.9),
+                    drying_rate_per_hour=rng.uniform(0.005, 0.05),
+                    rng=random.Random(rng.random()),
+                ),
+                boot=rng.randrange(1, 2**31),
+                interval_seconds=interval_seconds,
+            )
+            for i in range(devices)
+        ]
+        start = time.monotonic()
+        # Boards power up spread over one interval
+        due = [(start + rng.uniform(0, interval_seconds), i) for i in range(devices)]
+        heapq.heapify(due)
+        end = start + duration_seconds
+        while due and due[0][0] < end:
+            at, index = heapq.heappop(due)
+            delay = at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            device = fleet[index]
+            device.sample(time.time())
+            if len(device.buffer) >= self.batch_size:
+                self._submit(device, *device.take_batch())
+            spread = 1.0 + rng.uniform(-jitter, jitter)
+            heapq.heappush(due, (at + device.interval_seconds * spread, index))
+        # Partial batches stay unsent, as on a board that is switched off; flushing
+        # them all at once would end every run with a burst no real fleet sends
+        self._executor.shutdown(wait=True)
+        return self.stats
+
+    def replay(self, readings: Iterable[Tuple[str, float, int]], speed: float = 60.0, prefix: str = "replay") -> FleetStats:
+        """Re-send recorded ``(sensor, ts, value)`` readings, ``speed`` times faster.
+
+        Each recorded sensor becomes a device named ``<prefix>-<sensor>``.
+        Readings are stamped with the time they are sent, since the server
+        only accepts timestamps from the last 30 days.
+        """
+        devices: Dict[str, FleetDevice] = {}
+        start = time.monotonic()
+        first_ts: Optional[float] = None
+        for sensor, ts, value in readings:
+            first_ts = ts if first_ts is None else first_ts
+            delay = start + (ts - first_ts) / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            device = devices.get(sensor)
+            if device is None:
+                device = devices[sensor] = FleetDevice(f"{prefix}-{sensor}", None, boot=random.randrange(1, 2**31), interval_seconds=0.0)
+            device.buffer.append((device.name, time.time(), value))
+            if len(device.buffer) >= self.batch_size:
+                self._submit(device, *device.take_batch())
+        for device in devices.values():
+            if device.buffer:
+                self._submit(device, *device.take_batch())
+        self._executor.shutdown(wait=True)
+        return self.stats
+
+    def _submit(self, device: FleetDevice, seq: int, readings: List[Reading]) -> None:
+        self._slots.acquire()
+        self._executor.submit(self._send, device, seq, readings)
+
+    def _send(self, device: FleetDevice, seq: int, readings: List[Reading]) -> None:
+        try:
+            result = self.transport.send(device.name, device.boot, seq, readings)
+            self.stats.record(len(readings), result)
+            if self.adaptive and result.next_report_seconds:
+                device.interval_seconds = float(result.next_report_seconds)
+        except Exception as e:
+            logger.error(f"Error sending readings of {device.name}: {e}", exc_info=True)
+            self.stats.record(len(readings), SendResult(False))
+        finally:
+            self._slots.release()
+
+
+def read_recording(path: str) -> Iterator[Tuple[str, float, int]]:
+    """Readings of a ``sensor,ts,value`` CSV (``ts`` in Unix seconds or ISO 8601), in time order."""
+    with open(path, newline="") as f:
+        rows = []
+        for row in csv.DictReader(f):
+            ts = row["ts"]
+            try:
+                seconds = float(ts)
+            except ValueError:
+                seconds = datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+            rows.append((row["sensor"], seconds, int(float(row["value"]))))
+    rows.sort(key=lambda row: row[1])
+    return iter(rows)
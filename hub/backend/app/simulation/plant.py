@@ -0,0 +1,64 @@
+"""A simulated plant: soil model wired to a pump on virtual GPIO."""
+import threading
+import time
+from typing import Callable, List, Optional
+
+from app.controllers.gpio import HIGH, SimulatedGPIO
+from app.controllers.pump_controller import PumpController
+from app.simulation.soil import SoilMoistureModel
+
+
+class SimulatedPlant:
+    """Pot of soil whose pump is a real ``PumpController`` on ``SimulatedGPIO``.
+
+    Pin changes are observed, so water is added for exactly as long as the
+    controller kept the pump pin high (scaled by ``time_scale``).
+    """
+
+    def __init__(
+        self,
+        sensor: str,
+        soil: Optional[SoilMoistureModel] = None,
+        pump_duration_seconds: float = 5.0,
+        time_scale: float = 1.0,
+    ) -> None:
+        """Initialize the plant.
+
+        Args:
+            sensor: Sensor name the plant's readings are reported under.
+            soil: Soil model (a default one if omitted).
+            pump_duration_seconds: Simulated length of one pump run.
+            time_scale: Simulated seconds per wall-clock second.
+        """
+        self.sensor = sensor
+        self.soil = soil or SoilMoistureModel()
+        self.time_scale = time_scale
+        self.gpio = SimulatedGPIO()
+        self.pump = PumpController(
+            gpio=self.gpio, duration_seconds=pump_duration_seconds / time_scale
+        )
+        self.pump_started_listeners: List[Callable[["SimulatedPlant", float], None]] = []
+        self._lock = threading.Lock()
+        self._pump_started_at: Optional[float] = None
+        self.gpio.add_listener(self._on_pin_change)
+
+    @property
+    def pumping(self) -> bool:
+        with self._lock:
+            return self._pump_started_at is not None
+
+    def _on_pin_change(self, pin: int, value: int) -> None:
+        if pin != self.pump.backward_pin:
+            return
+        now = time.perf_counter()
+        if value == HIGH:
+            with self._lock:
+                self._pump_started_at = now
+            for listener in self.pump_started_listeners:
+                listener(self, now)
+            return
+
+        with self._lock:
+            started_at, self._pump_started_at = self._pump_started_at, None
+        if started_at is not None:
+            self.soil.water((now - started_at) * self.time_scale)
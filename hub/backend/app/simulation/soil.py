@@ -0,0 +1,65 @@
+"""Soil moisture model that dries over time and responds to watering."""
+import math
+import random
+import threading
+from typing import Optional
+
+# analogRead range of the capacitive probe (see plant_controller moisture_sensor.cpp):
+# dry soil reads high (~800-1023), wet soil low (~100-300)
+RAW_DRY = 950
+RAW_WET = 200
+RAW_MAX = 1023
+
+
+class SoilMoistureModel:
+    """Single-bucket soil water model.
+
+    ``moisture`` is the fraction of field capacity (0 = bone dry, 1 = saturated).
+    It decays exponentially at ``drying_rate_per_hour`` and rises by the pumped
+    volume over ``capacity_ml``; anything above capacity drains away.
+    """
+
+    def __init__(
+        self,
+        moisture: float = 0.6,
+        drying_rate_per_hour: float = 0.02,
+        capacity_ml: float = 500.0,
+        flow_ml_per_second: float = 20.0,
+        noise: float = 4.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Initialize the model.
+
+        Args:
+            moisture: Starting fraction of field capacity.
+            drying_rate_per_hour: Exponential decay rate of the moisture.
+            capacity_ml: Water the pot holds at field capacity.
+            flow_ml_per_second: Pump output.
+            noise: Standard deviation of sensor noise, in raw ADC counts.
+            rng: Random source, for reproducible runs.
+        """
+        self.moisture = moisture
+        self.drying_rate_per_hour = drying_rate_per_hour
+        self.capacity_ml = capacity_ml
+        self.flow_ml_per_second = flow_ml_per_second
+        self.noise = noise
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def advance(self, seconds: float) -> None:
+        """Let the soil dry for ``seconds`` of simulated time."""
+        with self._lock:
+            self.moisture *= math.exp(-self.drying_rate_per_hour * seconds / 3600.0)
+
+    def water(self, pump_seconds: float) -> None:
+        """Add the water delivered by ``pump_seconds`` of pumping."""
+        with self._lock:
+            added = pump_seconds * self.flow_ml_per_second / self.capacity_ml
+            self.moisture = min(1.0, self.moisture + added)
+
+    def raw_reading(self) -> int:
+        """Return what ``analogRead`` on the probe would report right now."""
+        with self._lock:
+            moisture = self.moisture
+        value = RAW_DRY - (RAW_DRY - RAW_WET) * moisture + self.rng.gauss(0.0, self.noise)
+        return int(min(RAW_MAX, max(0, round(value))))
@@ -0,0 +1,39 @@
+"""create sensor_readings
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a9b0c1d2e3f4"
+down_revision = "f8a9b0c1d2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sensor_readings",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("sensor", sa.String(length=64), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_sensor_readings_sensor_recorded_at",
+        "sensor_readings",
+        ["sensor", "recorded_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_sensor_readings_sensor_recorded_at", table_name="sensor_readings")
+    op.drop_table("sensor_readings")
@@ -0,0 +1,115 @@
+"""partition sensor_readings by month
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "b0c1d2e3f4a5"
+down_revision = "a9b0c1d2e3f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres cannot partition an existing table in place: move the old one
+    # aside, create the partitioned table, copy the rows over, drop the old one.
+    op.execute("ALTER TABLE sensor_readings RENAME TO sensor_readings_unpartitioned")
+    op.execute("ALTER INDEX sensor_readings_pkey RENAME TO sensor_readings_unpartitioned_pkey")
+    op.execute(
+        "ALTER INDEX ix_sensor_readings_sensor_recorded_at "
+        "RENAME TO ix_sensor_readings_unpartitioned_sensor_recorded_at"
+    )
+    op.execute("ALTER SEQUENCE sensor_readings_id_seq RENAME TO sensor_readings_unpartitioned_id_seq")
+
+    op.execute(
+        """
+        CREATE TABLE sensor_readings (
+            id BIGSERIAL NOT NULL,
+            recorded_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            sensor VARCHAR(64) NOT NULL,
+            value DOUBLE PRECISION NOT NULL,
+            PRIMARY KEY (id, recorded_at)
+        ) PARTITION BY RANGE (recorded_at)
+        """
+    )
+    op.execute(
+        "CREATE INDEX ix_sensor_readings_sensor_recorded_at ON sensor_readings (sensor, recorded_at)"
+    )
+    op.execute(
+        "CREATE INDEX ix_sensor_readings_recorded_at_brin ON sensor_readings USING brin (recorded_at)"
+    )
+
+    # One partition per month that has data, plus this month and the next
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month DATE;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(
+                        (SELECT min(recorded_at) FROM sensor_readings_unpartitioned),
+                        now() AT TIME ZONE 'UTC'
+                    )),
+                    date_trunc('month', now() AT TIME ZONE 'UTC') + interval '1 month',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE sensor_readings_p%s PARTITION OF sensor_readings '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+        """
+    )
+
+    op.execute(
+        "INSERT INTO sensor_readings (id, recorded_at, sensor, value) "
+        "SELECT id, recorded_at, sensor, value FROM sensor_readings_unpartitioned"
+    )
+    op.execute(
+        "SELECT setval('sensor_readings_id_seq', "
+        "COALESCE((SELECT max(id) FROM sensor_readings), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE sensor_readings_unpartitioned")
+
+
+def downgrade():
+    op.execute("ALTER TABLE sensor_readings RENAME TO sensor_readings_partitioned")
+    op.execute("ALTER INDEX sensor_readings_pkey RENAME TO sensor_readings_partitioned_pkey")
+    op.execute("ALTER INDEX ix_sensor_readings_sensor_recorded_at RENAME TO ix_sensor_readings_partitioned_sensor_recorded_at")
+    op.execute("ALTER SEQUENCE sensor_readings_id_seq RENAME TO sensor_readings_partitioned_id_seq")
+
+    op.execute(
+        """
+        CREATE TABLE sensor_readings (
+            id BIGSERIAL NOT NULL,
+            sensor VARCHAR(64) NOT NULL,
+            value DOUBLE PRECISION NOT NULL,
+            recorded_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT sensor_readings_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX ix_sensor_readings_sensor_recorded_at ON sensor_readings (sensor, recorded_at)"
+    )
+    op.execute(
+        "INSERT INTO sensor_readings (id, sensor, value, recorded_at) "
+        "SELECT id, sensor, value, recorded_at FROM sensor_readings_partitioned"
+    )
+    op.execute(
+        "SELECT setval('sensor_readings_id_seq', "
+        "COALESCE((SELECT max(id) FROM sensor_readings), 0) + 1, false)"
+    )
+    # Drops every partition with it
+    op.execute("DROP TABLE sensor_readings_partitioned")
@@ -0,0 +1,49 @@
+"""create sensor_reading_rollups
+
+Revision ID: c1d2e3f4a5b6
+Revises: b0c1d2e3f4a5
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c1d2e3f4a5b6"
+down_revision = "b0c1d2e3f4a5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sensor_reading_rollups",
+        sa.Column("sensor", sa.String(length=64), nullable=False),
+        sa.Column("resolution_seconds", sa.Integer(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("min_value", sa.Float(), nullable=False),
+        sa.Column("max_value", sa.Float(), nullable=False),
+        sa.Column("value_sum", sa.Float(), nullable=False),
+        sa.Column("value_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("sensor", "resolution_seconds", "bucket_start"),
+    )
+
+    # Readings stored so far; from here on inserts maintain the rollups
+    op.execute(
+        """
+        INSERT INTO sensor_reading_rollups
+            (sensor, resolution_seconds, bucket_start, min_value, max_value, value_sum, value_count)
+        SELECT sensor, seconds,
+               date_bin(seconds * INTERVAL '1 second', recorded_at, TIMESTAMP '2000-01-01') AS bucket,
+               min(value), max(value), sum(value), count(*)
+        FROM sensor_readings
+        CROSS JOIN (VALUES (60), (3600), (86400)) AS rollup_resolutions (seconds)
+        GROUP BY sensor, seconds, bucket
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("sensor_reading_rollups")
@@ -0,0 +1,38 @@
+"""add due notes indexes
+
+Revision ID: c4d5e6f7a8b9
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4d5e6f7a8b9"
+down_revision = "b7c8d9e0f1a2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_notes_due_date_incomplete",
+        "notes",
+        ["due_date"],
+        unique=False,
+        postgresql_where=sa.text("completed_at IS NULL"),
+    )
+    op.create_index(
+        "ix_photo_histories_plant_id_created_at",
+        "photo_histories",
+        ["plant_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_photo_histories_plant_id_created_at", table_name="photo_histories")
+    op.drop_index("ix_notes_due_date_incomplete", table_name="notes")
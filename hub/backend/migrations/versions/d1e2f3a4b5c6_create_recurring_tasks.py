@@ -0,0 +1,69 @@
+"""create recurring_tasks
+
+Revision ID: d1e2f3a4b5c6
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d1e2f3a4b5c6"
+down_revision = "c4d5e6f7a8b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "recurring_tasks",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("plant_id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("rrule", sa.String(length=255), nullable=False),
+        sa.Column("starts_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.ForeignKeyConstraint(
+            ["plant_id"],
+            ["plants.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_recurring_tasks_plant_id"),
+        "recurring_tasks",
+        ["plant_id"],
+        unique=False,
+    )
+
+    op.add_column("notes", sa.Column("recurring_task_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "notes_recurring_task_id_fkey",
+        "notes",
+        "recurring_tasks",
+        ["recurring_task_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_unique_constraint(
+        "uq_notes_recurring_task_id_due_date",
+        "notes",
+        ["recurring_task_id", "due_date"],
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_notes_recurring_task_id_due_date", "notes", type_="unique")
+    op.drop_constraint("notes_recurring_task_id_fkey", "notes", type_="foreignkey")
+    op.drop_column("notes", "recurring_task_id")
+    op.drop_index(op.f("ix_recurring_tasks_plant_id"), table_name="recurring_tasks")
+    op.drop_table("recurring_tasks")
@@ -0,0 +1,47 @@
+"""create sensors
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d2e3f4a5b6c7"
+down_revision = "c1d2e3f4a5b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sensors",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("plant_id", sa.Integer(), nullable=True),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("calibration", sa.JSON(none_as_null=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["plant_id"], ["plants.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index(op.f("ix_sensors_plant_id"), "sensors", ["plant_id"], unique=False)
+
+    # Sensors already driving a watering rule belong to that rule's plant
+    op.execute(
+        """
+        INSERT INTO sensors (name, plant_id, kind, created_at)
+        SELECT sensor, plant_id, 'moisture', now() AT TIME ZONE 'UTC'
+        FROM watering_rules
+        """
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_sensors_plant_id"), table_name="sensors")
+    op.drop_table("sensors")
@@ -0,0 +1,43 @@
+"""create pump_runs
+
+Revision ID: e7f8a9b0c1d2
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e7f8a9b0c1d2"
+down_revision = "d1e2f3a4b5c6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "pump_runs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("run_id", sa.String(length=32), nullable=False),
+        sa.Column("pump_id", sa.String(length=64), nullable=False),
+        sa.Column("trigger_source", sa.String(length=32), nullable=False),
+        sa.Column("state", sa.String(length=16), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("requested_duration_seconds", sa.Float(), nullable=False),
+        sa.Column("actual_duration_seconds", sa.Float(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("ended_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("run_id"),
+    )
+    op.create_index(
+        op.f("ix_pump_runs_started_at"), "pump_runs", ["started_at"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_pump_runs_started_at"), table_name="pump_runs")
+    op.drop_table("pump_runs")
@@ -0,0 +1,39 @@
+"""create watering_rules
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f8a9b0c1d2e3"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "watering_rules",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("plant_id", sa.Integer(), nullable=False),
+        sa.Column("sensor", sa.String(length=64), nullable=False),
+        sa.Column("low_percent", sa.Float(), nullable=False),
+        sa.Column("high_percent", sa.Float(), nullable=False),
+        sa.Column("cooldown_seconds", sa.Integer(), nullable=False),
+        sa.Column("enabled", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["plant_id"], ["plants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("plant_id"),
+        sa.UniqueConstraint("sensor"),
+    )
+
+
+def downgrade():
+    op.drop_table("watering_rules")
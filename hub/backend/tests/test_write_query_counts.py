@@ -0,0 +1,73 @@
+"""Write endpoints build their response from the rows they wrote.
+
+Each write is a single statement (INSERT/UPDATE ... RETURNING, with the plant
+check folded in); nothing is re-selected after commit.
+"""
+import io
+import itertools
+
+import pytest
+from PIL import Image
+
+
+_nicknames = (f"Fern {i}" for i in itertools.count())
+
+
+@pytest.fixture
+def plant_id(client) -> int:
+    # Nicknames are unique
+    response = client.post("/api/plants/", json={"nickname": next(_nicknames), "species": "Nephrolepis"})
+    assert response.status_code == 201
+    return response.get_json()["id"]
+
+
+@pytest.fixture
+def histories_dir(tmp_path, monkeypatch):
+    from app.services.photo_history_service import PhotoHistoryService
+
+    monkeypatch.setattr(PhotoHistoryService, "_get_histories_directory", staticmethod(lambda: str(tmp_path)))
+    return tmp_path
+
+
+def _jpeg() -> io.BytesIO:
+    image = io.BytesIO()
+    Image.new("RGB", (8, 8), "green").save(image, format="JPEG")
+    image.seek(0)
+    return image
+
+
+def test_create_plant(client, query_counter):
+    with query_counter:
+        response = client.post("/api/plants/", json={"nickname": "Monstera", "species": "Monstera deliciosa"})
+    assert response.status_code == 201
+    assert response.get_json()["photo_histories"] == []
+    assert query_counter.count == 1, query_counter.statements
+
+
+def test_create_note(client, query_counter, plant_id):
+    with query_counter:
+        response = client.post(f"/api/plants/{plant_id}/notes", json={"content": "Repot", "due_date": "2030-01-01"})
+    assert response.status_code == 201
+    assert response.get_json()["content"] == "Repot"
+    assert query_counter.count == 1, query_counter.statements
+
+
+def test_update_note(client, query_counter, plant_id):
+    note_id = client.post(f"/api/plants/{plant_id}/notes", json={"content": "Repot"}).get_json()["id"]
+    with query_counter:
+        response = client.patch(f"/api/plants/{plant_id}/notes/{note_id}", json={"content": "Repot in spring"})
+    assert response.status_code == 200
+    assert response.get_json()["content"] == "Repot in spring"
+    assert query_counter.count == 1, query_counter.statements
+
+
+def test_create_photo_history(client, query_counter, plant_id, histories_dir):
+    with query_counter:
+        response = client.post(
+            f"/api/plants/{plant_id}/photo_histories",
+            data={"image": (_jpeg(), "fern.jpg"), "date": "2025-05-01T12:00:00"},
+            content_type="multipart/form-data",
+        )
+    assert response.status_code == 201
+    assert response.get_json()["plant_id"] == plant_id
+    assert query_counter.count == 1, query_counter.statements
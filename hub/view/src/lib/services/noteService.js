@@ -57,6 +57,14 @@ export const NoteService = {
 		);
 	},
 
+	/**
+	 * Incomplete notes due within `within` (e.g. '7d'), overdue included,
+	 * across all plants with plant nickname and cover photo id.
+	 */
+	listDueNotes({ within } = {}) {
+		return requestJson(`/api/notes/due${buildQuery({ within })}`);
+	},
+
 	createNote(plantId, { content, dueDate, photoHistoryId } = {}) {
 		return requestJson(`/api/plants/${plantId}/notes`, {
 			method: 'POST',
@@ -122,6 +130,18 @@ export const NoteService = {
 		return requestJson(`/api/plants/${plantId}/notes/${noteId}`, {
 			method: 'DELETE'
 		});
+	},
+
+	/**
+	 * Apply many create/complete/reschedule/delete operations in one request.
+	 * Each operation is `{ op, plant_id, note_id?, content?, due_date? }`.
+	 */
+	bulkNotes(operations) {
+		return requestJson('/api/notes/bulk', {
+			method: 'POST',
+			headers: { 'Content-Type': 'application/json' },
+			body: JSON.stringify({ operations })
+		});
 	}
 };
 
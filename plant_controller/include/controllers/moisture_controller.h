@@ -11,7 +11,8 @@ private:
 public:
     MoistureController(String sensorName, int sensorPin);
 
-    void run();
+    // Reads and posts once; returns the time until the next reading, in ms
+    unsigned long run();
 };
 
 #endif
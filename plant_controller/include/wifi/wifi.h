@@ -1,7 +1,11 @@
 #ifndef WIFI_H
 #define WIFI_H
 
+// Default time between readings, until the server says otherwise
+const unsigned long DEFAULT_REPORT_INTERVAL_MS = 5000;
+
 void initWifi();
-void post(String sensorName, int value);
+// Returns the server's requested time until the next reading, in ms
+unsigned long post(String sensorName, int value);
 
 #endif
\ No newline at end of file
@@ -7,12 +7,12 @@ MoistureController::MoistureController(String sensorName, int sensorPin) {
     pin = sensorPin;
 }
 
-void MoistureController::run() {
+unsigned long MoistureController::run() {
     int moistLevel = readMoisture(pin);
 
     Serial.print(name);
     Serial.print(" | ");
     Serial.println(moistLevel);
 
-    post(name, moistLevel);
+    return post(name, moistLevel);
 }
\ No newline at end of file
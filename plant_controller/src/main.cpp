@@ -4,6 +4,7 @@
 #include "controllers/moisture_controller.h"
 
 MoistureController moistureSensor("moisture", A0);
+unsigned long reportIntervalMs = DEFAULT_REPORT_INTERVAL_MS;
 
 void setup()
 {
@@ -16,6 +17,6 @@ void setup()
 
 void loop()
 {
-  delay(5000);
-  moistureSensor.run();
+  delay(reportIntervalMs);
+  reportIntervalMs = moistureSensor.run();
 }
\ No newline at end of file
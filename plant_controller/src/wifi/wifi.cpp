@@ -12,6 +12,10 @@ const char* PATH = "/api/data";
 WiFiClient wifi;
 HttpClient client = HttpClient(wifi, SERVER, PORT);
 
+// Readings are numbered per boot so the server can drop retried duplicates
+long bootId = 0;
+unsigned long sequence = 0;
+
 void initWifi()
 {
   Serial.print("Connecting to WiFi...");
@@ -22,9 +26,13 @@ void initWifi()
       Serial.print(".");
   }
   Serial.println("\nConnected to WiFi!");
+
+  // No persistent storage for a boot counter: a random id changes on every boot
+  randomSeed(analogRead(A5) ^ micros());
+  bootId = random(1, 0x7FFFFFFF);
 }
 
-void post(String sensorName, int value)
+unsigned long post(String sensorName, int value)
 {
   Serial.println("Sending HTTP POST request...");
 
@@ -32,6 +40,8 @@ void post(String sensorName, int value)
   StaticJsonDocument<200> doc;
   doc["sensor"] = sensorName;
   doc["value"] = value;
+  doc["boot"] = bootId;
+  doc["seq"] = sequence++;
 
   // build JSON
   String jsonPayload;
@@ -55,4 +65,14 @@ void post(String sensorName, int value)
   Serial.println(statusCode);
   Serial.print("Response Body: ");
   Serial.println(response);
+
+  // The server slows reporting down while the soil is stable
+  StaticJsonDocument<32> filter;
+  filter["next_report_seconds"] = true;
+  StaticJsonDocument<64> reply;
+  if (deserializeJson(reply, response, DeserializationOption::Filter(filter)) || !reply["next_report_seconds"].is<unsigned long>())
+  {
+    return DEFAULT_REPORT_INTERVAL_MS;
+  }
+  return reply["next_report_seconds"].as<unsigned long>() * 1000;
 }
\ No newline at end of file